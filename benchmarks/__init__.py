@@ -0,0 +1,6 @@
+"""
+Benchmarks de performance de Finview
+
+Scripts à lancer depuis la racine du dépôt, par exemple :
+    python -m benchmarks.bench_parallel
+"""
@@ -0,0 +1,137 @@
+"""
+Benchmark de la classification des actifs
+
+Compare l'index compilé (predictions/classification.py) aux anciennes
+boucles de get_asset_return_params / get_asset_category, reproduites
+ci-dessous, sur des noms d'actifs synthétiques, et vérifie que les
+résultats sont identiques pour chaque nom.
+
+Usage:
+    python -m benchmarks.bench_classification --names 100000
+"""
+import argparse
+import random
+import time
+
+from src.finview.predictions.config import HISTORICAL_RETURNS
+from src.finview.predictions.classification import (
+    classify_many,
+    clear_classification_cache,
+    get_classification_index,
+)
+
+TYPES = ['Stock', 'ETF', 'Bond', 'Crypto', 'Fund', 'Other', 'SCPI', 'REIT', 'Direct real estate', None]
+WORDS = ['Global', 'Europe', 'Tech', 'Income', 'Growth', 'Value', 'Dividend', 'Small Cap', 'Paris',
+         'Tokyo', 'Gold', 'Cash', 'Livret', 'Bitcoin', 'Bond', 'Index', 'Fund', 'Trust', 'Holding',
+         'Corporation', 'Immobilier', 'Épargne', 'Action', 'World', 'Santé', 'Nasdaq', 'Or']
+
+
+def _legacy_return_params(asset_name, asset_type=None):
+    """Ancienne implémentation de get_asset_return_params (parcours linéaire)"""
+    if asset_name in HISTORICAL_RETURNS:
+        return HISTORICAL_RETURNS[asset_name]
+
+    asset_name_lower = asset_name.lower()
+    for key, params in HISTORICAL_RETURNS.items():
+        if key.lower() in asset_name_lower:
+            return params
+
+    if asset_type and asset_type in HISTORICAL_RETURNS:
+        return HISTORICAL_RETURNS[asset_type]
+
+    return {'mean': 5.5, 'std': 15.0, 'distribution': 'normal'}
+
+
+def _legacy_category(asset_name, asset_type):
+    """Ancienne implémentation de get_asset_category (chaînes de any())"""
+    name_lower = asset_name.lower()
+    type_lower = (asset_type or '').lower()
+
+    if any(x in name_lower or x in type_lower for x in ['crypto', 'bitcoin', 'ethereum']):
+        return 'Crypto'
+    elif any(x in name_lower or x in type_lower for x in ['action', 'stock', 'tesla', 'apple', 'nvda']):
+        return 'Actions'
+    elif 'etf' in name_lower or 'etf' in type_lower:
+        return 'ETF'
+    elif any(x in name_lower or x in type_lower for x in ['scpi', 'immobilier', 'reit']):
+        return 'SCPI'
+    elif any(x in name_lower or x in type_lower for x in ['obligation', 'bond']):
+        return 'Obligations'
+    elif any(x in name_lower or x in type_lower for x in ['liquidité', 'cash', 'livret', 'épargne']):
+        return 'Liquidités'
+    elif 'or' in name_lower or 'gold' in name_lower:
+        return 'Or'
+    else:
+        return 'Actions'
+
+
+def synthetic_assets(count, unique_ratio=1.0, seed=0):
+    """
+    Noms et types d'actifs synthétiques (mélange de clés connues et de mots libres)
+
+    Args:
+        count: Nombre d'actifs
+        unique_ratio: Part de couples (nom, type) distincts (1.0 = tous différents)
+    """
+    rng = random.Random(seed)
+    keys = list(HISTORICAL_RETURNS)
+    n_unique = max(1, int(count * unique_ratio))
+    pool = []
+    for i in range(n_unique):
+        parts = rng.sample(WORDS, rng.randint(1, 3))
+        if rng.random() < 0.5:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(keys))
+        pool.append((f"{' '.join(parts)} {i}", rng.choice(TYPES)))
+    assets = [pool[i % n_unique] for i in range(count)]
+    rng.shuffle(assets)
+    return [name for name, _ in assets], [asset_type for _, asset_type in assets]
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def run(num_names, unique_ratio):
+    names, types = synthetic_assets(num_names, unique_ratio)
+    print(f"{num_names} asset names ({unique_ratio:.0%} distinct), "
+          f"{len(HISTORICAL_RETURNS)} return keys")
+
+    legacy, legacy_time = _timed(lambda: [
+        (_legacy_return_params(name, asset_type), _legacy_category(name, asset_type))
+        for name, asset_type in zip(names, types)
+    ])
+
+    clear_classification_cache()
+    _, build_time = _timed(get_classification_index)
+    cold, cold_time = _timed(lambda: classify_many(names, types))
+    warm, warm_time = _timed(lambda: classify_many(names, types))
+
+    mismatches = sum(
+        (params != legacy_params) or (category != legacy_category)
+        for (params, category), (legacy_params, legacy_category) in zip(cold, legacy)
+    )
+
+    print(f"{'method':<24} {'time (s)':>10} {'speedup':>8}")
+    print(f"{'legacy loops':<24} {legacy_time:>10.3f} {1:>7.2f}x")
+    print(f"{'index build':<24} {build_time:>10.4f}")
+    print(f"{'compiled index (cold)':<24} {cold_time:>10.3f} {legacy_time / cold_time:>7.2f}x")
+    print(f"{'compiled index (cached)':<24} {warm_time:>10.3f} {legacy_time / warm_time:>7.2f}x")
+    print(f"identical results: {mismatches == 0} ({mismatches} mismatches)")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=100_000)
+    parser.add_argument('--unique-ratio', type=float, default=1.0,
+                        help="Share of distinct (name, type) pairs, e.g. 0.05 for a realistic repeat rate")
+    args = parser.parse_args()
+
+    if run(args.names, args.unique_ratio):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
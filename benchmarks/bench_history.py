@@ -0,0 +1,141 @@
+"""
+Benchmark de la reconstruction de l'historique mensuel (charts/history.py)
+
+Compare, sur un portefeuille synthétique, l'ancienne implémentation en
+boucles (reproduite ci-dessous) à :
+- build_monthly_history (reconstruction vectorisée),
+- l'historique matérialisé du portfolio (models/history.py) : reconstruction
+  complète, lecture, puis ajout de transactions une à une,
+et vérifie que les historiques coïncident.
+
+Usage:
+    python -m benchmarks.bench_history --positions 500 --updates 100 --years 10
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.finview.charts.history import build_monthly_history
+from src.finview.fixture import create_synthetic_portfolio
+from src.finview.operations import update_investment_value
+
+
+def _legacy_total_invested_at_date(portfolio, date):
+    """Ancienne get_total_invested_at_date (DataFrame reconstruit à chaque appel)"""
+    df = pd.DataFrame(portfolio.transaction_history)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df[df["date"] <= pd.to_datetime(date)]
+    return df["amount"].sum()
+
+
+def _legacy_monthly_history(portfolio):
+    """Ancienne get_portfolio_monthly_history (mois × positions × événements)"""
+    df = pd.DataFrame(portfolio.transaction_history)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date")
+
+    start_date = df["date"].iloc[0].replace(day=1)
+    monthly_dates = pd.date_range(start=start_date, end=datetime.now(), freq="MS")
+
+    investment_states = {}
+    for _, transaction in df.iterrows():
+        trans_type = transaction["type"]
+        name = transaction.get("name")
+        if name and trans_type in ["FINANCIAL_INVESTMENT_BUY", "INVESTMENT_UPDATE", "INVESTMENT_SELL"]:
+            investment_states.setdefault(name, []).append({
+                'date': transaction['date'],
+                'type': trans_type,
+                'price': transaction.get('price'),
+                'quantity': transaction.get('quantity')
+            })
+
+    values = []
+    for target_date in monthly_dates:
+        total = 0.0
+        for states in investment_states.values():
+            price = None
+            quantity = 0.0
+            for state in states:
+                if state['date'] > target_date:
+                    break
+                if state['type'] == 'FINANCIAL_INVESTMENT_BUY':
+                    price = state['price']
+                    quantity = state['quantity']
+                elif state['type'] == 'INVESTMENT_UPDATE':
+                    price = state['price']
+                elif state['type'] == 'INVESTMENT_SELL':
+                    quantity -= state['quantity']
+            if price is not None and quantity > 0:
+                total += price * quantity
+        values.append(total)
+
+    invested = [_legacy_total_invested_at_date(portfolio, d) for d in monthly_dates]
+    return pd.DataFrame({"date": monthly_dates, "value": values, "invested": invested})
+
+
+def _same_history(history, reference):
+    return (history["date"].equals(reference["date"])
+            and np.allclose(history["value"], reference["value"], rtol=1e-9, atol=1e-6)
+            and np.allclose(history["invested"], reference["invested"], rtol=1e-9, atol=1e-6))
+
+
+def run(positions, updates, years, skip_legacy=False):
+    start_date = datetime.now() - timedelta(days=365 * years)
+    portfolio = create_synthetic_portfolio(positions, price_updates=updates, start_date=start_date)
+    print(f"{positions} positions, {len(portfolio.transaction_history)} transactions, {years} ans")
+
+    start = time.perf_counter()
+    history = build_monthly_history(portfolio.transaction_history)
+    vectorized_time = time.perf_counter() - start
+    print(f"vectorisée : {vectorized_time * 1000:.1f} ms ({len(history)} mois)")
+
+    start = time.perf_counter()
+    portfolio.history.rebuild(portfolio.transaction_history)
+    materialized = portfolio.get_monthly_history()
+    print(f"matérialisée, reconstruction : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    portfolio.get_monthly_history()
+    print(f"matérialisée, lecture        : {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    # Transactions du jour, postérieures à tout l'historique : ajout incrémental
+    names = list(portfolio.financial_investments)
+    updates_date = datetime.now()
+    start = time.perf_counter()
+    for i in range(1000):
+        update_investment_value(portfolio, names[i % len(names)], 100.0 + i, updates_date)
+    appended = portfolio.get_monthly_history()
+    print(f"matérialisée, 1000 transactions + lecture : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if skip_legacy:
+        return
+
+    start = time.perf_counter()
+    legacy = _legacy_monthly_history(portfolio)
+    legacy_time = time.perf_counter() - start
+    print(f"boucles    : {legacy_time * 1000:.1f} ms ({legacy_time / vectorized_time:.0f}x plus lent)")
+
+    # Les anciennes boucles relisent l'historique après les 1000 transactions ajoutées
+    identical = _same_history(appended, legacy)
+    portfolio.transaction_history[:] = portfolio.transaction_history[:-1000]
+    legacy = _legacy_monthly_history(portfolio)
+    identical = identical and _same_history(history, legacy) and _same_history(materialized, legacy)
+    print(f"résultats identiques : {identical}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--positions', type=int, default=500)
+    parser.add_argument('--updates', type=int, default=100, help="Mises à jour de prix par position")
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--skip-legacy', action='store_true', help="Ne pas chronométrer les anciennes boucles")
+    args = parser.parse_args()
+
+    run(args.positions, args.updates, args.years, args.skip_legacy)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark des mises à jour de prix en masse (Portfolio.investments)
+
+Compare, sur un portefeuille synthétique de 10k positions, l'ancienne
+propriété Portfolio.investments (dict fusionné reconstruit à chaque accès,
+reproduite ci-dessous) à la vue en lecture seule InvestmentsView :
+- mises à jour de prix via Portfolio.update_investment_value (3 accès par appel),
+- parcours répétés de la vue (comme les pages et le PDF),
+et vérifie que les deux portefeuilles finissent identiques.
+
+Usage:
+    python -m benchmarks.bench_investments --positions 10000 --updates 10000
+"""
+import argparse
+import random
+import time
+
+from src.finview.fixture import create_synthetic_portfolio
+from src.finview.models import Portfolio
+
+
+class _LegacyPortfolio(Portfolio):
+    """Portfolio avec l'ancienne propriété investments"""
+
+    @property
+    def investments(self):
+        all_investments = {}
+        all_investments.update(self.financial_investments)
+        all_investments.update(self.real_estate_investments)
+        return all_investments
+
+    def update_investment_value(self, name, new_value):
+        # Ancienne version : trois accès à investments par appel
+        if name in self.investments:
+            old_value = self.investments[name].current_value
+            with self.updating(self.investments[name]):
+                self.investments[name].update_value(new_value)
+            self._log_transaction("INVESTMENT_UPDATE", 0, f"{name}: {old_value:.2f}€ → {new_value:.2f}€")
+            return True
+        return False
+
+
+def _bulk_update(portfolio, updates):
+    start = time.perf_counter()
+    for name, price in updates:
+        portfolio.update_investment_value(name, price)
+    return time.perf_counter() - start
+
+
+def _scan(portfolio, passes):
+    start = time.perf_counter()
+    for _ in range(passes):
+        if portfolio.investments:
+            sum(inv.get_total_value() for inv in portfolio.investments.values())
+    return time.perf_counter() - start
+
+
+def run(positions, updates, passes, seed):
+    data = create_synthetic_portfolio(positions, seed=seed).to_dict()
+    current = Portfolio.from_dict(data)
+    legacy = _LegacyPortfolio.from_dict(data)
+
+    rng = random.Random(seed)
+    names = list(current.investments)
+    price_updates = [(name, round(rng.uniform(1.0, 1000.0), 2)) for name in rng.choices(names, k=updates)]
+    print(f"{len(names)} positions, {updates} mises à jour de prix, {passes} parcours")
+
+    legacy_time = _bulk_update(legacy, price_updates)
+    current_time = _bulk_update(current, price_updates)
+    print(f"mises à jour, dict reconstruit : {legacy_time:.3f} s ({legacy_time / updates * 1e6:.0f} µs/maj)")
+    print(f"mises à jour, vue              : {current_time:.3f} s ({current_time / updates * 1e6:.0f} µs/maj)"
+          f" -> x{legacy_time / current_time:.0f}")
+
+    legacy_time = _scan(legacy, passes)
+    current_time = _scan(current, passes)
+    print(f"parcours, dict reconstruit : {legacy_time * 1000:.1f} ms")
+    print(f"parcours, vue              : {current_time * 1000:.1f} ms")
+
+    identical = (
+        {name: inv.current_value for name, inv in legacy.investments.items()}
+        == {name: inv.current_value for name, inv in current.investments.items()}
+        and legacy.get_net_worth() == current.get_net_worth()
+    )
+    print(f"résultats identiques : {identical}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--positions', type=int, default=10_000)
+    parser.add_argument('--updates', type=int, default=10_000, help="Mises à jour de prix")
+    parser.add_argument('--passes', type=int, default=20, help="Parcours complets de investments")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.positions, args.updates, args.passes, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark mémoire des positions (classes à __slots__ de models.compact)
+
+Charge plusieurs portefeuilles synthétiques depuis leur JSON (comme
+load_portfolio), en classes standard puis en variantes compactes
+(from_dict(data, compact=True)), et mesure avec tracemalloc la mémoire
+retenue par les positions :
+- octets par position (investissements et crédits),
+- total pour l'ensemble des portefeuilles chargés,
+et vérifie que to_dict redonne exactement les données d'origine.
+
+L'historique des transactions et le PositionStore sont exclus de la
+mesure : ils sont identiques dans les deux cas.
+
+Usage:
+    python -m benchmarks.bench_memory --portfolios 100 --positions 500
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from src.finview.fixture import create_synthetic_portfolio
+from src.finview.models import Portfolio
+
+
+def _load(texts, compact):
+    """Mémoire retenue (octets) par les portefeuilles chargés, et ces portefeuilles"""
+    gc.collect()
+    tracemalloc.start()
+    portfolios = [Portfolio.from_dict(json.loads(text), compact=compact) for text in texts]
+    for portfolio in portfolios:
+        portfolio.positions = None
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained, portfolios
+
+
+def run(portfolios, positions, seed):
+    datas = []
+    for index in range(portfolios):
+        data = create_synthetic_portfolio(positions, seed=seed + index).to_dict()
+        data['transaction_history'] = []
+        datas.append(data)
+    count = sum(len(data['financial_investments']) + len(data['real_estate_investments']) + len(data['credits'])
+                for data in datas)
+    texts = [json.dumps(data) for data in datas]
+    baseline, _ = _load([json.dumps({'cash': data['cash']}) for data in datas], compact=False)
+    print(f"{portfolios} portefeuilles, {count} positions")
+
+    results = {}
+    for label, compact in (("standard", False), ("compact", True)):
+        retained, loaded = _load(texts, compact)
+        results[label] = (retained - baseline) / count
+        print(f"{label:9}: {(retained - baseline) / 2**20:7.1f} Mo, {results[label]:.0f} octets/position")
+        identical = all(portfolio.to_dict() == data for portfolio, data in zip(loaded, datas))
+        print(f"           to_dict identique : {identical}")
+        del loaded
+    print(f"gain : {1 - results['compact'] / results['standard']:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--portfolios', type=int, default=100)
+    parser.add_argument('--positions', type=int, default=500, help="Positions par portefeuille")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.portfolios, args.positions, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Suite de benchmarks de simulate_portfolio_future, avec seuils de régression
+
+Grille : portefeuilles synthétiques de 5, 50 et 500 positions
+(fixture.create_synthetic_portfolio) × 1k / 10k / 100k trajectoires ×
+horizons de 10 et 30 ans. Chaque cas tourne dans un sous-processus neuf
+pour que son pic de RSS lui soit propre. On y mesure :
+- le pic d'allocations Python/NumPy (tracemalloc) lors d'une première
+  exécution, qui sert aussi d'échauffement,
+- le temps des --repeat exécutions suivantes (meilleur et médian),
+- le pic de RSS du processus (resource.getrusage).
+
+Les résultats sont écrits en JSON (--output), avec le commit et
+l'environnement. Avec --baseline, chaque cas est comparé au même cas d'un
+fichier précédent : au-delà de --threshold (temps) ou de
+--memory-threshold (RSS) d'augmentation relative, le cas est une régression
+et le script se termine avec le code 1.
+
+Usage:
+    python -m benchmarks.bench_monte_carlo --output bench_before.json
+    python -m benchmarks.bench_monte_carlo --baseline bench_before.json --threshold 0.15
+    python -m benchmarks.bench_monte_carlo --positions 5 50 --simulations 1000 10000 --years 10
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.finview.fixture import create_synthetic_portfolio
+from src.finview.predictions import simulate_portfolio_future
+
+POSITIONS = (5, 50, 500)
+SIMULATIONS = (1_000, 10_000, 100_000)
+YEARS = (10, 30)
+
+
+def case_id(case):
+    return f"positions={case['positions']},simulations={case['num_simulations']},years={case['years']}"
+
+
+def _peak_rss_mb():
+    """Pic de RSS du processus courant en Mo (None si indisponible)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def run_case(case):
+    """
+    Exécute un cas dans le processus courant (appelé dans le sous-processus)
+
+    Returns:
+        dict: Mesures du cas
+    """
+    portfolio = create_synthetic_portfolio(case['positions'], seed=case['portfolio_seed'])
+    options = dict(
+        years=case['years'], num_simulations=case['num_simulations'], seed=case['seed'],
+        use_cache=False, precision=case['precision'], keep_paths=case['keep_paths']
+    )
+
+    tracemalloc.start()
+    simulate_portfolio_future(portfolio, **options)
+    _, peak_allocated = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(case['repeat']):
+        start = time.perf_counter()
+        results = simulate_portfolio_future(portfolio, **options)
+        times.append(time.perf_counter() - start)
+
+    return {
+        **case,
+        'id': case_id(case),
+        'wall_time': min(times),
+        'wall_time_median': statistics.median(times),
+        'peak_allocated_mb': peak_allocated / 1e6,
+        'peak_rss_mb': _peak_rss_mb(),
+        'final_p50': float(results['percentiles']['p50'][-1]),
+    }
+
+
+def _run_in_subprocess(case):
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_monte_carlo', '--run-case', json.dumps(case)],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Échec du cas {case_id(case)}:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata():
+    return {
+        'commit': _git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """
+    Compare les résultats aux mêmes cas d'une référence
+
+    Returns:
+        list: Descriptions des régressions (vide si aucune)
+    """
+    reference = {case['id']: case for case in baseline['results']}
+    regressions = []
+
+    print(f"\nComparaison avec {baseline['metadata'].get('commit') or 'la référence'} "
+          f"(seuils : temps +{threshold:.0%}, RSS +{memory_threshold:.0%})")
+    print(f"{'cas':<45} {'temps':>8} {'RSS':>8}")
+    for case in results:
+        base = reference.get(case['id'])
+        if base is None:
+            print(f"{case['id']:<45} {'(nouveau)':>17}")
+            continue
+
+        time_ratio = case['wall_time'] / base['wall_time']
+        rss_ratio = None
+        if case['peak_rss_mb'] and base.get('peak_rss_mb'):
+            rss_ratio = case['peak_rss_mb'] / base['peak_rss_mb']
+
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append('temps')
+            regressions.append(f"{case['id']}: temps x{time_ratio:.2f}")
+        if rss_ratio is not None and rss_ratio > 1 + memory_threshold:
+            flags.append('RSS')
+            regressions.append(f"{case['id']}: RSS x{rss_ratio:.2f}")
+
+        rss = f"x{rss_ratio:.2f}" if rss_ratio is not None else '-'
+        print(f"{case['id']:<45} {f'x{time_ratio:.2f}':>8} {rss:>8}  {'RÉGRESSION ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+
+def run(positions, simulations, years, repeat, precision, keep_paths, seed):
+    cases = [
+        {'positions': p, 'num_simulations': n, 'years': y, 'repeat': repeat, 'seed': seed,
+         'portfolio_seed': 0, 'precision': precision, 'keep_paths': keep_paths}
+        for p in positions for n in simulations for y in years
+    ]
+
+    print(f"{'cas':<45} {'temps (s)':>10} {'médian (s)':>11} {'alloc (Mo)':>11} {'RSS (Mo)':>9}")
+    results = []
+    for case in cases:
+        result = _run_in_subprocess(case)
+        rss = f"{result['peak_rss_mb']:.0f}" if result['peak_rss_mb'] is not None else '-'
+        print(f"{result['id']:<45} {result['wall_time']:>10.3f} {result['wall_time_median']:>11.3f} "
+              f"{result['peak_allocated_mb']:>11.1f} {rss:>9}", flush=True)
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--positions', type=int, nargs='+', default=list(POSITIONS))
+    parser.add_argument('--simulations', type=int, nargs='+', default=list(SIMULATIONS))
+    parser.add_argument('--years', type=int, nargs='+', default=list(YEARS))
+    parser.add_argument('--repeat', type=int, default=3, help="Exécutions chronométrées par cas")
+    parser.add_argument('--precision', choices=('float64', 'float32'), default='float64')
+    parser.add_argument('--keep-paths', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_monte_carlo.json', help="Fichier JSON des résultats")
+    parser.add_argument('--baseline', help="Fichier JSON d'une exécution précédente à comparer")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Hausse relative du temps tolérée avant régression (0.15 = +15%%)")
+    parser.add_argument('--memory-threshold', type=float, default=None,
+                        help="Hausse relative du pic de RSS tolérée (--threshold par défaut)")
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    results = run(args.positions, args.simulations, args.years, args.repeat,
+                  args.precision, args.keep_paths, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': _metadata(), 'results': results}, f, indent=2)
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        memory_threshold = args.memory_threshold if args.memory_threshold is not None else args.threshold
+        regressions = compare(results, baseline, args.threshold, memory_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) :")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nAucune régression")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark du mode parallèle de simulate_portfolio_future
+
+Mesure le temps d'exécution en fonction du nombre de workers et vérifie que
+le résultat est identique bit à bit quel que soit le nombre de processus.
+
+Usage:
+    python -m benchmarks.bench_parallel --simulations 100000 --years 30
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.finview.fixture import create_demo_portfolio_4
+from src.finview.predictions import simulate_portfolio_future
+
+
+def _worker_counts(max_workers):
+    """1, 2, 4, ... jusqu'à max_workers (inclus)"""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def run(num_simulations, years, chunk_size, max_workers, seed=42):
+    portfolio = create_demo_portfolio_4()
+    reference = None
+    baseline_time = None
+
+    print(f"{num_simulations} simulations x {years} years, chunk_size={chunk_size}")
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8} {'identical':>10}")
+
+    for n_workers in _worker_counts(max_workers):
+        start = time.perf_counter()
+        results = simulate_portfolio_future(
+            portfolio, years=years, num_simulations=num_simulations,
+            seed=seed, chunk_size=chunk_size, n_workers=n_workers, use_cache=False
+        )
+        elapsed = time.perf_counter() - start
+
+        # Mode flux : les trajectoires ne sont pas conservées, on compare les percentiles
+        percentiles = np.array([results['percentiles'][key] for key in sorted(results['percentiles'])])
+        if reference is None:
+            reference = percentiles
+            baseline_time = elapsed
+        identical = np.array_equal(reference, percentiles)
+
+        print(f"{n_workers:>8} {elapsed:>10.2f} {baseline_time / elapsed:>7.2f}x {str(identical):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--simulations', type=int, default=100_000)
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--chunk-size', type=int, default=5_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    run(args.simulations, args.years, args.chunk_size, args.max_workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark du stockage en colonnes des positions (PositionStore)
+
+Compare, sur un portefeuille synthétique de 20k positions, les boucles
+Python sur les objets investissements au PositionStore (tableaux NumPy) :
+- totaux par catégorie (recalcul complet),
+- entrées des graphiques (noms, valeurs, performances),
+- réévaluation de toutes les positions : mise à jour des valeurs seule,
+  puis Portfolio.revalue_investments complet (journal des transactions
+  compris, identique dans les deux cas),
+et vérifie que les deux portefeuilles finissent identiques.
+
+Usage:
+    python -m benchmarks.bench_positions --positions 20000
+"""
+import argparse
+import datetime
+import math
+import random
+import time
+
+from src.finview.fixture import create_synthetic_portfolio
+from src.finview.models import Portfolio
+from src.finview.models.portfolio import PortfolioTotals
+from src.finview.models.positions import position_arrays
+
+
+def _timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(positions, repeat, seed):
+    data = create_synthetic_portfolio(positions, seed=seed).to_dict()
+    objects = Portfolio.from_dict(data)
+    objects.positions = None
+    columns = Portfolio.from_dict(data)
+    columns.enable_position_store()
+    print(f"{len(objects.investments)} positions, {repeat} répétitions")
+
+    objects_time, expected = _timed(lambda: PortfolioTotals.compute(objects), repeat)
+    columns_time, _ = _timed(lambda: (columns.positions.total_value("financial"),
+                                      columns.positions.total_value("real_estate"),
+                                      columns.positions.total_rental_income()), repeat)
+    print(f"totaux, objets     : {objects_time * 1000:.2f} ms")
+    print(f"totaux, colonnes   : {columns_time * 1000:.2f} ms -> x{objects_time / columns_time:.0f}")
+
+    objects_time, _ = _timed(lambda: position_arrays(list(objects.investments.values())), repeat)
+    columns_time, _ = _timed(lambda: columns.get_position_arrays(), repeat)
+    print(f"graphiques, objets   : {objects_time * 1000:.2f} ms")
+    print(f"graphiques, colonnes : {columns_time * 1000:.2f} ms -> x{objects_time / columns_time:.0f}")
+
+    rng = random.Random(seed)
+    updates = {name: round(rng.uniform(1.0, 1000.0), 2) for name in objects.investments}
+    objects_time, _ = _timed(lambda: objects._apply_prices(objects._match_prices(updates)), 1)
+    columns_time, _ = _timed(lambda: columns._apply_prices(columns._match_prices(updates)), 1)
+    print(f"mise à jour des valeurs, objets   : {objects_time * 1000:.1f} ms")
+    print(f"mise à jour des valeurs, colonnes : {columns_time * 1000:.1f} ms -> x{objects_time / columns_time:.1f}")
+
+    # Historique mensuel construit d'avance : seule la réévaluation est mesurée
+    for portfolio in (objects, columns):
+        portfolio.history.sync(portfolio.transaction_history)
+    prices = {name: round(rng.uniform(1.0, 1000.0), 2) for name in objects.investments}
+    date = datetime.datetime(2024, 1, 1)
+    objects_time, _ = _timed(lambda: objects.revalue_investments(prices, date), 1)
+    columns_time, _ = _timed(lambda: columns.revalue_investments(prices, date), 1)
+    print(f"réévaluation complète, objets   : {objects_time * 1000:.1f} ms")
+    print(f"réévaluation complète, colonnes : {columns_time * 1000:.1f} ms -> x{objects_time / columns_time:.1f}")
+
+    expected = PortfolioTotals.compute(objects)
+    identical = (
+        {name: inv.current_value for name, inv in objects.investments.items()}
+        == {name: inv.current_value for name, inv in columns.investments.items()}
+        and all(math.isclose(getattr(objects.totals, bucket), getattr(expected, bucket), rel_tol=1e-9)
+                and math.isclose(getattr(columns.totals, bucket), getattr(expected, bucket), rel_tol=1e-9)
+                for bucket in ("financial", "real_estate", "rental_income"))
+        and objects.transaction_history[-len(prices):] == columns.transaction_history[-len(prices):]
+    )
+    print(f"résultats identiques : {identical}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--positions', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=20, help="Répétitions des mesures de totaux et de graphiques")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.positions, args.repeat, args.seed)
+
+
+if __name__ == '__main__':
+    main()
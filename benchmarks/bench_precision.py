@@ -0,0 +1,122 @@
+"""
+Benchmark du mode float32 de simulate_portfolio_future
+
+1. Précision : les mêmes tirages (float64, arrondis en float32) passent par
+   le calcul des trajectoires en float64 puis en float32 ; l'écart relatif
+   maximal des percentiles par année doit rester sous --tolerance.
+2. Mémoire et temps : simulation complète (keep_paths=True) dans chaque
+   précision, avec le pic mémoire mesuré par tracemalloc (NumPy y déclare
+   ses allocations). L'écart des percentiles finaux entre les deux runs
+   (flux aléatoires différents) doit rester dans l'erreur Monte Carlo.
+
+Le script se termine avec le code 1 si l'un des contrôles échoue.
+
+Usage:
+    python -m benchmarks.bench_precision --simulations 200000 --years 40
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.finview.fixture import create_demo_portfolio_4
+from src.finview.predictions import simulate_portfolio_future
+from src.finview.predictions.monte_carlo import (
+    _collect_composition,
+    _composition_arrays,
+    _compute_percentiles,
+    _draw_random_inputs,
+    _paths_from_draws,
+    _remaining_debt_schedule,
+)
+from src.finview.predictions.rng import make_generator, make_seed_sequence
+
+# Écart toléré entre les runs float64 et float32, en erreurs standards
+MAX_STANDARD_ERRORS = 4
+
+
+def precision_loss(portfolio, num_paths, years, seed=42):
+    """
+    Écart relatif maximal des percentiles float32 / float64 sur les mêmes tirages
+
+    Returns:
+        dict: Écart maximal (toutes années) par clé ('p10' ... 'mean')
+    """
+    composition = _collect_composition(portfolio)
+    total_debt = portfolio.get_total_credits_balance()
+    remaining_debt = _remaining_debt_schedule(total_debt, years)
+    draws = _draw_random_inputs(make_generator(make_seed_sequence(seed)), num_paths, years,
+                                len(composition), True)
+    draws32 = {key: value.astype(np.float32) for key, value in draws.items()}
+
+    reference = _compute_percentiles(_paths_from_draws(
+        _composition_arrays(composition), draws, remaining_debt, True, True)[0])
+    single = _compute_percentiles(_paths_from_draws(
+        _composition_arrays(composition, np.float32), draws32, remaining_debt, True, True)[0])
+    return {key: float(np.max(np.abs(single[key] / reference[key] - 1))) for key in reference}
+
+
+def measure(portfolio, precision, num_simulations, years, seed=42):
+    """Simulation complète : (résultats, durée en s, pic mémoire en Mo)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = simulate_portfolio_future(
+        portfolio, years=years, num_simulations=num_simulations, seed=seed,
+        keep_paths=True, use_cache=False, precision=precision
+    )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, elapsed, peak / 1e6
+
+
+def run(num_simulations, years, tolerance):
+    portfolio = create_demo_portfolio_4()
+    ok = True
+
+    print(f"Précision float32 ({min(num_simulations, 50_000)} trajectoires x {years} ans, mêmes tirages)")
+    loss = precision_loss(portfolio, min(num_simulations, 50_000), years)
+    for key, value in loss.items():
+        print(f"  {key:>5}: écart relatif max {value:.2e}")
+    if max(loss.values()) > tolerance:
+        print(f"ÉCHEC : écart supérieur à la tolérance {tolerance:.0e}")
+        ok = False
+
+    print(f"\n{num_simulations} simulations x {years} ans, keep_paths=True")
+    print(f"{'précision':>10} {'temps (s)':>10} {'pic (Mo)':>10} {'trajectoires (Mo)':>18}")
+    runs = {}
+    for precision in ('float64', 'float32'):
+        results, elapsed, peak = measure(portfolio, precision, num_simulations, years)
+        paths = (results['simulations'].nbytes + results['simulations_nominal'].nbytes) / 1e6
+        print(f"{precision:>10} {elapsed:>10.2f} {peak:>10.1f} {paths:>18.1f}")
+        runs[precision] = results
+
+    print("\nPercentiles finaux (réels) float32 vs float64")
+    for key in ('p10', 'p50', 'p90', 'mean'):
+        reference = runs['float64']['percentiles'][key][-1]
+        single = runs['float32']['percentiles'][key][-1]
+        error = np.hypot(runs['float64']['standard_errors'][key][-1], runs['float32']['standard_errors'][key][-1])
+        z = abs(single - reference) / error
+        print(f"  {key:>5}: {reference:>14,.0f} {single:>14,.0f}  ({z:.1f} erreurs standards)")
+        if z > MAX_STANDARD_ERRORS:
+            print(f"ÉCHEC : écart supérieur à {MAX_STANDARD_ERRORS} erreurs standards")
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--simulations', type=int, default=200_000)
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--tolerance', type=float, default=1e-5,
+                        help="Écart relatif maximal des percentiles sur les mêmes tirages")
+    args = parser.parse_args()
+
+    if not run(args.simulations, args.years, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark de la réévaluation d'un portefeuille par instantané de prix
+
+Compare, sur un portefeuille synthétique, la réévaluation position par
+position (operations.update_investment_value, une transaction formatée et
+une sauvegarde par appel depuis l'interface) à
+Portfolio.apply_price_snapshot (un seul passage, un bloc de transactions
+ajouté au ledger en une fois, une seule sauvegarde), et vérifie que les
+deux portefeuilles finissent identiques (valeurs, totaux, historique mensuel).
+
+Usage:
+    python -m benchmarks.bench_snapshot --positions 5000
+"""
+import argparse
+import datetime
+import math
+import os
+import random
+import tempfile
+import time
+
+from src.finview.fixture import create_synthetic_portfolio
+from src.finview.models import Portfolio
+from src.finview.operations import update_investment_value
+from src.finview.storage import save_portfolio
+
+
+def run(positions, seed):
+    data = create_synthetic_portfolio(positions, seed=seed).to_dict()
+    per_position = Portfolio.from_dict(data)
+    snapshot = Portfolio.from_dict(data)
+    for portfolio in (per_position, snapshot):
+        portfolio.get_monthly_history()
+
+    rng = random.Random(seed)
+    as_of = datetime.datetime.now().replace(microsecond=0)
+    prices = {name: round(rng.uniform(1.0, 1000.0), 2) for name in per_position.investments}
+    print(f"{len(prices)} positions")
+
+    start = time.perf_counter()
+    for name, price in prices.items():
+        update_investment_value(per_position, name, price, as_of)
+    per_position_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    updated = snapshot.apply_price_snapshot(prices, as_of)
+    snapshot_time = time.perf_counter() - start
+
+    print(f"position par position : {per_position_time * 1000:.0f} ms")
+    print(f"instantané            : {snapshot_time * 1000:.0f} ms -> x{per_position_time / snapshot_time:.1f}"
+          f" ({updated} positions mises à jour)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "portfolio.json")
+        start = time.perf_counter()
+        save_portfolio(snapshot, path)
+        save_time = time.perf_counter() - start
+    print(f"sauvegardes : {len(prices)} x {save_time * 1000:.0f} ms position par position, 1 avec l'instantané")
+
+    history = per_position.get_monthly_history(), snapshot.get_monthly_history()
+    identical = (
+        {name: inv.current_value for name, inv in per_position.investments.items()}
+        == {name: inv.current_value for name, inv in snapshot.investments.items()}
+        and math.isclose(per_position.get_net_worth(), snapshot.get_net_worth(), rel_tol=1e-9)
+        and history[0]["date"].equals(history[1]["date"])
+        and all(math.isclose(a, b, rel_tol=1e-9) for column in ("value", "invested")
+                for a, b in zip(history[0][column], history[1][column]))
+    )
+    print(f"résultats identiques : {identical}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--positions', type=int, default=5_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.positions, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,7 +22,13 @@ from .layouts import get_base_layout
 from .history import (
     get_financial_portfolio_value_at_date,
     get_total_invested_at_date,
-    get_portfolio_monthly_history
+    get_portfolio_monthly_history,
+    build_monthly_history
+)
+from .valuation import (
+    DailyValuation,
+    build_daily_valuation,
+    get_portfolio_valuation
 )
 
 # Données de marché
@@ -68,6 +74,10 @@ __all__ = [
     'get_financial_portfolio_value_at_date',
     'get_total_invested_at_date',
     'get_portfolio_monthly_history',
+    'build_monthly_history',
+    'DailyValuation',
+    'build_daily_valuation',
+    'get_portfolio_valuation',
     # Données de marché
     'get_cac40_data',
     'get_dji_data',
@@ -1,14 +1,19 @@
 """
 Graphiques d'analyse et de comparaison du portfolio
 """
+import os
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import yfinance as yf
 import streamlit as st
-from .config import TRANSACTION_COLORS, TRANSACTION_LABELS, AVAILABLE_BENCHMARKS
+from src.finview.market.price_store import DEFAULT_STORE_PATH, PriceStore
+from .config import TRANSACTION_COLORS, TRANSACTION_LABELS, AVAILABLE_BENCHMARKS, VALUATION_FREQUENCIES
 from .layouts import get_base_layout
 from .history import get_portfolio_monthly_history
+from .valuation import get_portfolio_valuation
 
 
 def create_monthly_transactions_chart(df_history):
@@ -93,7 +98,8 @@ def create_monthly_transactions_chart(df_history):
     return fig
 
 
-def create_financial_portfolio_vs_benchmark_chart(portfolio, benchmark_ticker="^FCHI", benchmark_name="CAC40"):
+def create_financial_portfolio_vs_benchmark_chart(portfolio, benchmark_ticker="^FCHI", benchmark_name="CAC40",
+                                                  freq=None, price_store=None):
     """
     Graphique comparant le portfolio (sans immobilier) à un benchmark choisi
     
@@ -101,11 +107,18 @@ def create_financial_portfolio_vs_benchmark_chart(portfolio, benchmark_ticker="^
         portfolio: Instance de Portfolio
         benchmark_ticker: Le ticker Yahoo Finance (ex: "^FCHI", "^DJI", "^GSPC", "BTC-USD")
         benchmark_name: Le nom à afficher (ex: "CAC40", "Dow Jones", "S&P 500", "Bitcoin")
+        freq: Fréquence optionnelle ('D', 'W', 'M'...) : le portfolio est alors
+            lu dans sa valorisation journalière (cours réels si price_store)
+            au lieu de l'historique mensuel
+        price_store: PriceStore optionnel des cours de clôture
         
     Returns:
         go.Figure: Graphique Plotly
     """
-    df = get_portfolio_monthly_history(portfolio)
+    if freq is None:
+        df = get_portfolio_monthly_history(portfolio)
+    else:
+        df = get_portfolio_valuation(portfolio, price_store=price_store).resample(freq)
     if df.empty:
         fig = go.Figure()
         fig.add_annotation(text="No data", x=0.5, y=0.5, showarrow=False)
@@ -138,17 +151,11 @@ def create_financial_portfolio_vs_benchmark_chart(portfolio, benchmark_ticker="^
         print(f"📥 Lignes reçues: {len(benchmark_hist)}")
 
         if len(benchmark_hist) > 0:
-            # Aligner avec les dates du portfolio
-            benchmark_values = []
-            for date in dates:
-                date_pd = pd.to_datetime(date)
-                # Trouver la date la plus proche (avant ou le jour même)
-                mask = benchmark_hist.index <= date_pd
-                if mask.any():
-                    closest_idx = benchmark_hist.index[mask][-1]
-                    benchmark_values.append(benchmark_hist.loc[closest_idx, 'Close'])
-                else:
-                    benchmark_values.append(None)
+            # Aligner avec les dates du portfolio : dernier cours connu
+            # (avant ou le jour même), en une recherche pour toutes les dates
+            closes = benchmark_hist['Close'].to_numpy(dtype=float)
+            positions = benchmark_hist.index.searchsorted(pd.to_datetime(dates), side='right') - 1
+            benchmark_values = np.where(positions >= 0, closes[np.maximum(positions, 0)], np.nan)
 
             benchmark_series = pd.Series(benchmark_values, index=dates)
             # Remplir les valeurs manquantes
@@ -226,21 +233,30 @@ def render_portfolio_comparison(portfolio):
     Args:
         portfolio: Instance de Portfolio
     """
-    # Selectbox pour choisir le benchmark
-    selected_benchmark = st.selectbox(
-        "Choosing a comparison benchmark",
-        options=list(AVAILABLE_BENCHMARKS.keys()),
-        index=0  # CAC 40 par défaut
-    )
-    
+    col_benchmark, col_freq = st.columns([3, 1])
+    with col_benchmark:
+        # Selectbox pour choisir le benchmark
+        selected_benchmark = st.selectbox(
+            "Choosing a comparison benchmark",
+            options=list(AVAILABLE_BENCHMARKS.keys()),
+            index=0  # CAC 40 par défaut
+        )
+    with col_freq:
+        selected_freq = st.selectbox("Frequency", options=list(VALUATION_FREQUENCIES.keys()), index=0)
+
     # Récupérer le ticker correspondant
     ticker = AVAILABLE_BENCHMARKS[selected_benchmark]
-    
-    # Créer et afficher le graphique
+
+    # Cours de clôture réels si le stock de prix local existe (sans le créer)
+    price_store = PriceStore(DEFAULT_STORE_PATH) if os.path.exists(DEFAULT_STORE_PATH) else None
+
+    # Créer et afficher le graphique (valorisation journalière rééchantillonnée)
     fig = create_financial_portfolio_vs_benchmark_chart(
-        portfolio, 
+        portfolio,
         benchmark_ticker=ticker,
-        benchmark_name=selected_benchmark
+        benchmark_name=selected_benchmark,
+        freq=VALUATION_FREQUENCIES[selected_freq],
+        price_store=price_store
     )
     
     st.plotly_chart(fig)
@@ -91,6 +91,13 @@ AVAILABLE_BENCHMARKS = {
     "Crude Oil": "CL=F"
 }
 
+# Fréquences de la valorisation journalière proposées dans la comparaison
+VALUATION_FREQUENCIES = {
+    "Monthly": "M",
+    "Weekly": "W",
+    "Daily": "D",
+}
+
 # Coordonnées GPS pour la carte mondiale
 LOCATION_COORDS = {
     'United States': {'lat': 37.0902, 'lon': -95.7129},
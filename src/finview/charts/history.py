@@ -1,9 +1,13 @@
 """
 Fonctions de calcul de l'historique du portfolio
 """
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+from src.finview.models.history import POSITION_EVENT_TYPES
+from src.finview.models.ledger import TransactionLedger, as_ledger
+
 
 def get_financial_portfolio_value_at_date(portfolio, date):
     """
@@ -17,35 +21,33 @@ def get_financial_portfolio_value_at_date(portfolio, date):
         float: Valeur totale des investissements financiers à cette date
     """
     total = 0.0
-    
+    ledger = as_ledger(portfolio.transaction_history)
+    types = ledger.type_values()
+    prices = ledger.prices
+    quantities = ledger.quantities
+
     for inv in portfolio.financial_investments.values():
         if hasattr(inv, "purchase_date") and inv.purchase_date <= date:
             price_at_date = inv.initial_value
             quantity_at_date = 0.0
-            
-            # Parcourir l'historique des transactions pour cet investissement
-            for transaction in portfolio.transaction_history:
-                trans_date = pd.to_datetime(transaction["date"])
-                
-                if trans_date > date:
-                    continue
-                
-                if transaction.get("name") == inv.name:
-                    trans_type = transaction["type"]
-                    
-                    if trans_type == "FINANCIAL_INVESTMENT_BUY":
-                        price_at_date = transaction.get("price", inv.initial_value)
-                        quantity_at_date = transaction.get("quantity", 0)
-                    
-                    elif trans_type == "INVESTMENT_UPDATE":
-                        price_at_date = transaction.get("price", price_at_date)
-                    
-                    elif trans_type == "INVESTMENT_SELL":
-                        quantity_at_date -= transaction.get("quantity", 0)
-            
+
+            # Transactions de cet investissement jusqu'à la date (index par nom, triées par date)
+            for row in ledger.rows(name=inv.name, end=date):
+                trans_type = types[row]
+
+                if trans_type == "FINANCIAL_INVESTMENT_BUY":
+                    price_at_date = inv.initial_value if np.isnan(prices[row]) else prices[row]
+                    quantity_at_date = np.nan_to_num(quantities[row])
+
+                elif trans_type == "INVESTMENT_UPDATE":
+                    price_at_date = price_at_date if np.isnan(prices[row]) else prices[row]
+
+                elif trans_type == "INVESTMENT_SELL":
+                    quantity_at_date -= np.nan_to_num(quantities[row])
+
             total += price_at_date * quantity_at_date
-    
-    return total
+
+    return float(total)
 
 
 def get_total_invested_at_date(portfolio, date):
@@ -62,87 +64,199 @@ def get_total_invested_at_date(portfolio, date):
     if not hasattr(portfolio, "transaction_history") or len(portfolio.transaction_history) == 0:
         return 0
 
-    df = pd.DataFrame(portfolio.transaction_history)
-    df["date"] = pd.to_datetime(df["date"])
+    # Somme des investissements (positifs) et des retraits (négatifs) jusqu'à la date,
+    # lue dans les montants cumulés du ledger
+    return as_ledger(portfolio.transaction_history).total_amount(end=date)
+
+
+def _parse_dates(dates):
+    """Dates ISO ('YYYY-MM-DD HH:MM:SS') en datetime64[ns], pandas en secours pour les autres formats"""
+    try:
+        return np.array(dates, dtype="datetime64[s]").astype("datetime64[ns]")
+    except ValueError:
+        return pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]")
+
 
-    # On ne prend que les transactions avant la date donnée
-    df = df[df["date"] <= pd.to_datetime(date)]
+def _transaction_arrays(transaction_history):
+    """
+    Colonnes de l'historique des transactions en tableaux NumPy
+
+    Les dates sont converties une seule fois, puis toutes les colonnes sont
+    triées par date (ordre d'origine conservé à date égale). Un
+    TransactionLedger fournit directement ses colonnes et son index par date.
 
-    # Somme des investissements (positifs) et des retraits (négatifs)
-    total_invested = df["amount"].sum()
-    return total_invested
+    Returns:
+        dict: 'date', 'type', 'name', 'price', 'quantity', 'amount'
+    """
+    if isinstance(transaction_history, TransactionLedger):
+        order = transaction_history.date_order()
+        columns = {
+            "date": transaction_history.dates,
+            "type": transaction_history.type_values(),
+            "name": transaction_history.name_values(),
+            "price": transaction_history.prices,
+            "quantity": transaction_history.quantities,
+            "amount": transaction_history.amounts,
+        }
+        return {key: column[order] for key, column in columns.items()}
+
+    dates = _parse_dates([t["date"] for t in transaction_history])
+    order = np.argsort(dates, kind="stable")
+    columns = {
+        "date": dates,
+        "type": np.array([t["type"] for t in transaction_history], dtype=object),
+        "name": np.array([t.get("name") for t in transaction_history], dtype=object),
+        "price": np.array([t.get("price") for t in transaction_history], dtype=float),
+        "quantity": np.array([t.get("quantity") for t in transaction_history], dtype=float),
+        "amount": np.array([t.get("amount") for t in transaction_history], dtype=float),
+    }
+    return {key: column[order] for key, column in columns.items()}
+
+
+def _position_states(transactions):
+    """
+    Prix et quantité détenue de chaque position financière après chacun de ses événements
+
+    Les événements sont regroupés par position (tri stable, l'ordre des dates
+    est conservé). Dans chaque groupe, le prix est propagé depuis le dernier
+    achat ou la dernière mise à jour, et la quantité repart de celle du
+    dernier achat, diminuée des ventes suivantes.
+
+    Returns:
+        dict: Tableaux dans l'ordre des positions : 'date', 'code' (indice
+        dans 'names'), 'first' (premier événement de la position), 'price'
+        (NaN tant qu'aucun prix n'est connu), 'held' ; plus 'names' et
+        'order' (indice de chaque ligne parmi les événements triés par date),
+        ou None s'il n'y a aucun événement
+    """
+    is_event = np.isin(transactions["type"], POSITION_EVENT_TYPES) & pd.notna(transactions["name"])
+    if not is_event.any():
+        return None
+
+    codes, names = pd.factorize(transactions["name"][is_event])
+    by_name = np.argsort(codes, kind="stable")
+    codes = codes[by_name]
+    types = transactions["type"][is_event][by_name]
+    prices = transactions["price"][is_event][by_name]
+    quantities = np.nan_to_num(transactions["quantity"][is_event][by_name])
+
+    is_buy = types == "FINANCIAL_INVESTMENT_BUY"
+    is_sell = types == "INVESTMENT_SELL"
+    first = np.r_[True, codes[1:] != codes[:-1]]
+    index = np.arange(codes.size)
+
+    # Prix : dernier prix connu dans le groupe (les ventes ne le changent pas)
+    prices[is_sell] = np.nan
+    known = np.maximum.accumulate(np.where(first | ~np.isnan(prices), index, 0))
+    prices = prices[known]
+
+    # Quantité : somme cumulée depuis le dernier achat (ou le début du groupe)
+    signed = np.where(is_buy, quantities, np.where(is_sell, -quantities, 0.0))
+    cumulative = np.cumsum(signed)
+    segment_start = np.maximum.accumulate(np.where(first | is_buy, index, 0))
+    held = cumulative - cumulative[segment_start] + signed[segment_start]
+
+    return {
+        "date": transactions["date"][is_event][by_name],
+        "code": codes,
+        "first": first,
+        "price": prices,
+        "held": held,
+        "names": np.asarray(names, dtype=object),
+        "order": by_name,
+    }
+
+
+def _position_value_changes(transactions, exclude=None):
+    """
+    Variation de la valeur des positions financières à chaque événement
+
+    La valeur de la position (prix × quantité si positive, voir
+    _position_states) devient une variation par rapport à l'événement
+    précédent de la même position.
+
+    Args:
+        transactions: Colonnes renvoyées par _transaction_arrays
+        exclude: Masque optionnel des positions (indicées comme 'names') à ignorer
+
+    Returns:
+        tuple: (dates des événements, variations de valeur), triés par date
+    """
+    states = _position_states(transactions)
+    if states is None:
+        return transactions["date"][:0], np.array([])
+
+    prices, held, first = states["price"], states["held"], states["first"]
+    value = np.where(~np.isnan(prices) & (held > 0), np.nan_to_num(prices) * held, 0.0)
+    if exclude is not None:
+        value[exclude[states["code"]]] = 0.0
+    previous = np.r_[0.0, value[:-1]]
+    previous[first] = 0.0
+
+    order = states["order"]
+    dates = np.empty_like(states["date"])
+    dates[order] = states["date"]
+    changes = np.empty_like(value)
+    changes[order] = value - previous
+    return dates, changes
+
+
+def _cumulative_at(event_dates, changes, dates):
+    """Somme des variations dont la date est antérieure ou égale à chaque date"""
+    totals = np.concatenate([[0.0], np.cumsum(changes)])
+    return totals[np.searchsorted(event_dates, dates, side="right")]
 
 
 def get_portfolio_monthly_history(portfolio):
     """
-    Reconstruit l'historique mensuel du portefeuille de manière optimisée
-    
+    Historique mensuel du portefeuille
+
+    Lu dans l'historique matérialisé du portfolio (models/history.py), mis à
+    jour à chaque transaction ; reconstruit par build_monthly_history pour
+    les objets qui n'en ont pas.
+
     Args:
         portfolio: Instance de Portfolio
-        
+
     Returns:
         pd.DataFrame: DataFrame avec colonnes 'date', 'value', 'invested'
     """
     if not hasattr(portfolio, "transaction_history") or len(portfolio.transaction_history) == 0:
         return pd.DataFrame(columns=["date", "value", "invested"])
+    if hasattr(portfolio, "get_monthly_history"):
+        return portfolio.get_monthly_history()
+    return build_monthly_history(portfolio.transaction_history)
+
+
+def build_monthly_history(transaction_history):
+    """
+    Reconstruit l'historique mensuel à partir des transactions, de manière vectorisée
+
+    Les dates sont converties une seule fois ; la valeur des positions et le
+    capital investi sont des sommes cumulées le long des transactions, lues
+    au premier jour de chaque mois par recherche dichotomique (searchsorted).
+
+    Args:
+        transaction_history: Liste des transactions du portfolio
+
+    Returns:
+        pd.DataFrame: DataFrame avec colonnes 'date', 'value', 'invested'
+    """
+    if len(transaction_history) == 0:
+        return pd.DataFrame(columns=["date", "value", "invested"])
 
-    df = pd.DataFrame(portfolio.transaction_history)
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
+    transactions = _transaction_arrays(transaction_history)
 
-    start_date = df["date"].iloc[0].replace(day=1)
+    start_date = pd.Timestamp(transactions["date"][0]).replace(day=1)
     end_date = datetime.now()
     monthly_dates = pd.date_range(start=start_date, end=end_date, freq="MS")
+    grid = monthly_dates.to_numpy()
 
-    # OPTIMISATION : Créer un dictionnaire {nom_investissement: [(date, price, quantity)]}
-    investment_states = {}
-    
-    for _, transaction in df.iterrows():
-        trans_type = transaction["type"]
-        name = transaction.get("name")
-        
-        if name and trans_type in ["FINANCIAL_INVESTMENT_BUY", "INVESTMENT_UPDATE", "INVESTMENT_SELL"]:
-            if name not in investment_states:
-                investment_states[name] = []
-            
-            investment_states[name].append({
-                'date': transaction['date'],
-                'type': trans_type,
-                'price': transaction.get('price'),
-                'quantity': transaction.get('quantity')
-            })
-    
-    # Calculer les valeurs mensuelles
-    values = []
-    for target_date in monthly_dates:
-        total = 0.0
-        
-        for name, states in investment_states.items():
-            price = None
-            quantity = 0.0
-            
-            for state in states:
-                if state['date'] > target_date:
-                    break
-                
-                if state['type'] == 'FINANCIAL_INVESTMENT_BUY':
-                    price = state['price']
-                    quantity = state['quantity']
-                elif state['type'] == 'INVESTMENT_UPDATE':
-                    price = state['price']
-                elif state['type'] == 'INVESTMENT_SELL':
-                    quantity -= state['quantity']
-            
-            if price is not None and quantity > 0:
-                total += price * quantity
-        
-        values.append(total)
-    
-    invested = [get_total_invested_at_date(portfolio, d) for d in monthly_dates]
+    event_dates, value_changes = _position_value_changes(transactions)
 
     history_df = pd.DataFrame({
         "date": monthly_dates,
-        "value": values,
-        "invested": invested
+        "value": _cumulative_at(event_dates, value_changes, grid),
+        "invested": _cumulative_at(transactions["date"], np.nan_to_num(transactions["amount"]), grid)
     })
     return history_df
@@ -118,10 +118,10 @@ def create_kpi_metrics(portfolio):
     """
     net_worth = portfolio.get_net_worth()
 
-    # Calcul de la variation des investissements
-    financial_investments = getattr(portfolio, "financial_investments", {})
-    total_invested = sum(inv.quantity * inv.initial_value for inv in financial_investments.values())
-    current_value = sum(inv.get_total_value() for inv in financial_investments.values())
+    # Calcul de la variation des investissements (colonnes des positions)
+    positions = portfolio.get_position_arrays("financial")
+    total_invested = float((positions["quantity"] * positions["initial_value"]).sum())
+    current_value = portfolio.get_financial_investments_value()
     investment_change = ((current_value - total_invested) / total_invested * 100) if total_invested > 0 else 0
 
     # Crédits
@@ -128,8 +128,9 @@ def create_financial_investments_chart(portfolio):
         fig.update_layout(**get_base_layout("📊 Financial Investments", 400))
         return fig
     
-    names = list(investments.keys())
-    values = [getattr(inv, 'get_total_value', lambda: 0)() for inv in investments.values()]
+    positions = portfolio.get_position_arrays("financial")
+    names = positions["name"].tolist()
+    values = positions["value"].tolist()
     
     colors = VIBRANT_COLORS * ((len(values) // len(VIBRANT_COLORS)) + 1)
     colors = colors[:len(values)]
@@ -172,18 +173,17 @@ def create_performance_chart(portfolio):
     Returns:
         go.Figure: Graphique Plotly
     """
-    investments = {**getattr(portfolio, "financial_investments", {}),
-                   **getattr(portfolio, "real_estate_investments", {})}
-    if not investments:
+    if not portfolio.financial_investments and not portfolio.real_estate_investments:
         fig = go.Figure()
         fig.add_annotation(text="No investments", x=0.5, y=0.5,
                            font=dict(size=16, color=THEME['text_secondary']), showarrow=False)
         fig.update_layout(**get_base_layout("📈 Investment Performance Per Asset", 400))
         return fig
     
-    names = list(investments.keys())
-    perfs = [getattr(inv, "get_gain_loss_percentage", lambda: 0)() for inv in investments.values()]
-    values = [getattr(inv, 'get_total_value', lambda: 0)() for inv in investments.values()]
+    positions = portfolio.get_position_arrays()
+    names = positions["name"].tolist()
+    perfs = positions["gain_loss_percentage"].tolist()
+    values = positions["value"].tolist()
     
     colors = VIBRANT_COLORS * ((len(values) // len(VIBRANT_COLORS)) + 1)
     colors = colors[:len(values)]
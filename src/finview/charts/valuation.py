@@ -0,0 +1,241 @@
+"""
+Valorisation journalière du portfolio, aux cours réels
+
+La quantité détenue de chaque position financière est reconstruite à partir
+des transactions. Les positions associées à un ticker sont valorisées au
+cours de clôture du jour (PriceStore, dernier cours connu les jours
+fériés), les autres au dernier prix saisi (achat ou INVESTMENT_UPDATE),
+comme l'historique mensuel.
+
+La série journalière est calculée une seule fois, de manière vectorisée
+(positions × jours), puis rééchantillonnée à la demande (jour, semaine,
+mois...) sans recalcul.
+"""
+import hashlib
+import os
+import weakref
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .history import _cumulative_at, _position_states, _position_value_changes, _transaction_arrays
+
+_VALUATION_CACHE = weakref.WeakKeyDictionary()
+
+
+class DailyValuation:
+    """
+    Série journalière de la valeur des positions financières
+
+    Chaque jour est valorisé en fin de journée, avec toutes les transactions
+    datées de ce jour ou avant.
+
+    Attributes:
+        daily: DataFrame indexé par jour, colonnes 'value' (positions
+            financières), 'market_value' (part valorisée aux cours de clôture)
+            et 'invested' (capital investi)
+        tickers: Dict {nom de la position: ticker} des positions valorisées aux cours
+    """
+
+    def __init__(self, daily, tickers):
+        self.daily = daily
+        self.tickers = tickers
+        self._resampled = {}
+
+    def resample(self, freq="M"):
+        """
+        Valeurs en fin de période (dernier jour de chaque période)
+
+        La période en cours s'arrête au dernier jour de la série. Le résultat
+        est gardé en cache pour chaque fréquence.
+
+        Args:
+            freq: Fréquence de période pandas ('D', 'W', 'M', 'Q', 'Y'...)
+
+        Returns:
+            pd.DataFrame: Colonnes 'date', 'value', 'market_value', 'invested'
+        """
+        if freq not in self._resampled:
+            daily = self.daily
+            if len(daily) and freq != "D":
+                periods = daily.index.to_period(freq).asi8
+                daily = daily[np.r_[periods[1:] != periods[:-1], True]]
+            self._resampled[freq] = daily.rename_axis("date").reset_index()
+        return self._resampled[freq].copy()
+
+
+def resolve_position_tickers(names, closes, tickers=None):
+    """
+    Ticker de chaque position (ou None)
+
+    Priorité : ticker explicite, puis nom de la position s'il est lui-même
+    une colonne des cours (les positions sont souvent nommées par leur ticker).
+
+    Returns:
+        list: Ticker (ou None) aligné sur names
+    """
+    tickers = tickers or {}
+    available = set(closes.columns) if closes is not None else set()
+    resolved = []
+    for name in names:
+        candidates = (tickers.get(name), name)
+        resolved.append(next((c for c in candidates if c is not None and c in available), None))
+    return resolved
+
+
+def _daily_states(states, rows, day_ends):
+    """
+    Quantité et prix saisi des positions rows, à la fin de chaque jour
+
+    Seul le dernier événement de chaque (position, jour) est placé dans les
+    matrices, puis propagé aux jours suivants.
+
+    Returns:
+        tuple: Matrices (len(rows), jours) des quantités et des prix (NaN
+        avant le premier événement)
+    """
+    n_days = day_ends.size
+    row_of_code = np.full(states["names"].size, -1)
+    row_of_code[rows] = np.arange(rows.size)
+
+    row = row_of_code[states["code"]]
+    day = np.searchsorted(day_ends, states["date"], side="left")
+    keep = (row >= 0) & (day < n_days)
+    row, day = row[keep], day[keep]
+    held, price = states["held"][keep], states["price"][keep]
+
+    # Événements triés par position puis par date : le dernier de chaque jour l'emporte
+    last = np.r_[(row[1:] != row[:-1]) | (day[1:] != day[:-1]), True]
+    row, day, held, price = row[last], day[last], held[last], price[last]
+
+    has_event = np.zeros((rows.size, n_days), dtype=bool)
+    has_event[row, day] = True
+    held_matrix = np.full((rows.size, n_days), np.nan)
+    held_matrix[row, day] = held
+    price_matrix = np.full((rows.size, n_days), np.nan)
+    price_matrix[row, day] = price
+
+    # Propagation : indice du dernier jour avec événement (0 avant le premier)
+    source = np.maximum.accumulate(np.where(has_event, np.arange(n_days), 0), axis=1)
+    return (np.take_along_axis(held_matrix, source, axis=1),
+            np.take_along_axis(price_matrix, source, axis=1))
+
+
+def _daily_closes(closes, columns, days):
+    """Matrice (len(columns), jours) du dernier cours de clôture connu à chaque jour"""
+    closes = closes[columns].sort_index().ffill()
+    close_dates = pd.DatetimeIndex(closes.index).normalize().to_numpy(dtype="datetime64[ns]")
+    position = np.searchsorted(close_dates, days, side="right") - 1
+    matrix = closes.to_numpy(dtype=float)[np.maximum(position, 0)].T
+    matrix[:, position < 0] = np.nan
+    return matrix
+
+
+def build_daily_valuation(transaction_history, closes=None, tickers=None, end=None):
+    """
+    Valorisation journalière des positions financières
+
+    Les positions sans ticker suivent le dernier prix saisi : leur valeur est
+    une somme cumulée des variations à chaque événement (comme
+    build_monthly_history). Les positions avec ticker sont calculées sur des
+    matrices (positions × jours) : quantité détenue × cours de clôture, ou
+    dernier prix saisi les jours sans cours (avant le début de l'historique).
+
+    Args:
+        transaction_history: Liste des transactions du portfolio
+        closes: DataFrame optionnel des cours de clôture journaliers, une
+            colonne par ticker (PriceStore.load_closes)
+        tickers: Dict optionnel {nom de la position: ticker}
+        end: Dernier jour de la série (aujourd'hui par défaut)
+
+    Returns:
+        DailyValuation: Série journalière, rééchantillonnable
+    """
+    if len(transaction_history) == 0:
+        daily = pd.DataFrame(columns=["value", "market_value", "invested"], dtype=float,
+                             index=pd.DatetimeIndex([]))
+        return DailyValuation(daily, {})
+
+    transactions = _transaction_arrays(transaction_history)
+    days = pd.date_range(start=pd.Timestamp(transactions["date"][0]).normalize(),
+                         end=pd.Timestamp(end or datetime.now()).normalize(), freq="D")
+    grid = days.to_numpy()
+    day_ends = grid + np.timedelta64(1, "D") - np.timedelta64(1, "ns")
+
+    states = _position_states(transactions)
+    names = states["names"] if states is not None else np.array([], dtype=object)
+    position_tickers = resolve_position_tickers(names, closes, tickers)
+    mapped = np.array([ticker is not None for ticker in position_tickers], dtype=bool)
+
+    # Positions au dernier prix saisi : variations cumulées
+    event_dates, value_changes = _position_value_changes(transactions, exclude=mapped)
+    value = _cumulative_at(event_dates, value_changes, day_ends)
+
+    # Positions aux cours : matrices positions × jours
+    market_value = np.zeros(grid.size)
+    rows = np.flatnonzero(mapped)
+    if rows.size:
+        held, entered_price = _daily_states(states, rows, day_ends)
+        price = _daily_closes(closes, [position_tickers[i] for i in rows], grid)
+        price = np.where(np.isnan(price), entered_price, price)
+        valid = ~np.isnan(price) & (held > 0)
+        market_value = np.where(valid, held * price, 0.0).sum(axis=0)
+
+    daily = pd.DataFrame({
+        "value": value + market_value,
+        "market_value": market_value,
+        "invested": _cumulative_at(transactions["date"], np.nan_to_num(transactions["amount"]), day_ends)
+    }, index=days)
+    return DailyValuation(daily, {names[i]: position_tickers[i] for i in rows})
+
+
+def _closes_fingerprint(closes):
+    """Empreinte du contenu des cours : bornes de l'index, colonnes et hash des valeurs"""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(closes, index=True).values).hexdigest()
+    bounds = (closes.index[0], closes.index[-1]) if len(closes) else ()
+    return bounds + (len(closes), tuple(closes.columns), digest)
+
+
+def get_portfolio_valuation(portfolio, closes=None, tickers=None, price_store=None):
+    """
+    Valorisation journalière du portefeuille, gardée en cache
+
+    La série est recalculée seulement si des transactions ont été ajoutées
+    ou modifiées (révision du TransactionLedger), si les cours ou les tickers
+    changent, ou le lendemain. Les cours sont comparés sur leur contenu (un
+    DataFrame modifié en place ou recréé à la même adresse est détecté) et
+    l'historique par identité, l'entrée du cache le gardant en vie.
+
+    Args:
+        portfolio: Instance de Portfolio
+        closes: DataFrame optionnel des cours de clôture (une colonne par ticker)
+        tickers: Dict optionnel {nom de la position: ticker}
+        price_store: PriceStore optionnel, lu si closes n'est pas fourni
+            (seulement pour les tickers des positions)
+
+    Returns:
+        DailyValuation: Série journalière, rééchantillonnable
+    """
+    history = getattr(portfolio, "transaction_history", [])
+    if closes is not None:
+        source = _closes_fingerprint(closes)
+    elif price_store is not None:
+        source = (price_store.path, os.path.getmtime(price_store.path))
+    else:
+        source = None
+
+    key = (len(history), getattr(history, "revision", None), datetime.now().date(), source,
+           tuple(sorted((tickers or {}).items())))
+    cached = _VALUATION_CACHE.get(portfolio)
+    if cached is not None and cached[0] is history and cached[1] == key:
+        return cached[2]
+
+    if closes is None and price_store is not None:
+        wanted = {t.get("name") for t in history} | set((tickers or {}).values())
+        symbols = sorted(set(price_store.symbols()) & wanted)
+        closes = price_store.load_closes(symbols) if symbols else None
+
+    valuation = build_daily_valuation(history, closes, tickers)
+    _VALUATION_CACHE[portfolio] = (history, key, valuation)
+    return valuation
@@ -6,9 +6,11 @@ avec des données réalistes pour démonstration et validation.
 """
 
 from .create_demo_portfolio import create_demo_portfolio_4
+from .create_synthetic_portfolio import create_synthetic_portfolio
 
 __all__ = [
-    'create_demo_portfolio_4'
+    'create_demo_portfolio_4',
+    'create_synthetic_portfolio'
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,104 @@
+import random
+from datetime import datetime, timedelta
+from src.finview.models.portfolio import Portfolio
+from src.finview.operations import (
+    add_cash,
+    add_financial_investment,
+    add_real_estate_investment,
+    add_credit,
+    update_investment_value
+)
+
+
+# (name template, investment type, unit price range, location)
+FINANCIAL_TEMPLATES = [
+    ("{} Stock", "Stock", (20.0, 900.0), "United States"),
+    ("{} Stock", "Stock", (10.0, 600.0), "France"),
+    ("{} World ETF", "ETF", (30.0, 450.0), "Global"),
+    ("{} Europe ETF", "ETF", (20.0, 120.0), "Europe"),
+    ("{} Bonds", "Bond", (90.0, 110.0), "France"),
+    ("{} Gold ETF", "ETF", (100.0, 200.0), "Global"),
+    ("{} Crypto", "Crypto", (0.5, 3000.0), "Global"),
+    ("{} REIT", "REIT", (2.0, 120.0), "United States"),
+]
+
+# (name template, property type, unit price range, location, rental yield range)
+REAL_ESTATE_TEMPLATES = [
+    ("{} SCPI", "SCPI", (150.0, 250.0), "France", (3.5, 5.5)),
+    ("{} Apartment", "Apartment", (90000.0, 400000.0), "France", (2.5, 4.5)),
+]
+
+NAME_WORDS = ["Alpha", "Nordic", "Pacific", "Atlas", "Horizon", "Summit", "Delta", "Orion",
+              "Paris", "Tokyo", "Lyon", "Berlin", "Tech", "Global", "Value", "Growth"]
+
+
+def create_synthetic_portfolio(n_positions, seed=0, real_estate_share=0.1, price_updates=0,
+                               with_credit=True, start_date=None):
+    """Creates a portfolio of n_positions randomly generated positions (benchmarks, load tests)
+
+    Every position goes through the regular operations (add_cash, add_*_investment,
+    update_investment_value), so the transaction history looks like a real one.
+
+    Args:
+        n_positions: Number of investment positions to create
+        seed: Seed of the random generator (same seed, same portfolio)
+        real_estate_share: Share of positions created as real estate investments
+        price_updates: Number of price updates recorded per position after purchase,
+            spread between the end of the purchases and now (nothing is dated in the future)
+        with_credit: Add a mortgage sized on the real estate holdings
+        start_date: Date of the first transaction (5 years ago by default)
+    """
+    rng = random.Random(seed)
+    end_date = datetime.now()
+    start_date = start_date or end_date - timedelta(days=1825)
+    portfolio = Portfolio(initial_cash=0.0)
+
+    # Draw every position first to deposit the exact amount needed
+    positions = []
+    for i in range(n_positions):
+        word = rng.choice(NAME_WORDS)
+        if rng.random() < real_estate_share:
+            template, property_type, (low, high), location, (yield_low, yield_high) = rng.choice(REAL_ESTATE_TEMPLATES)
+            price = round(rng.uniform(low, high), 2)
+            quantity = 1 if property_type == "Apartment" else rng.randint(5, 50)
+            positions.append(("real_estate", template.format(f"{word} {i}"), price, quantity,
+                              property_type, location, round(rng.uniform(yield_low, yield_high), 2)))
+        else:
+            template, investment_type, (low, high), location = rng.choice(FINANCIAL_TEMPLATES)
+            price = round(rng.uniform(low, high), 2)
+            quantity = max(round(5000.0 / price, 4), 0.0001)
+            positions.append(("financial", template.format(f"{word} {i}"), price, quantity,
+                              investment_type, location, None))
+
+    current_date = start_date
+    add_cash(portfolio, sum(p[2] * p[3] for p in positions) + 10000.0, current_date, "Initial deposit")
+
+    # Purchases spread over the first year (the first fifth of a shorter period)
+    purchase_window = max(min(timedelta(days=365), (end_date - start_date) / 5), timedelta(0))
+    step = purchase_window / max(n_positions, 1)
+    for kind, name, price, quantity, asset_type, location, rental_yield in positions:
+        current_date += step
+        if kind == "real_estate":
+            add_real_estate_investment(portfolio, name, price, quantity, current_date,
+                                       asset_type, location, rental_yield)
+        else:
+            add_financial_investment(portfolio, name, price, quantity, current_date, asset_type, location)
+
+    if with_credit:
+        real_estate_value = portfolio.get_real_estate_investments_value()
+        if real_estate_value > 0:
+            amount = round(0.6 * real_estate_value, 2)
+            add_credit(portfolio, "Synthetic Mortgage", amount, 2.5, round(amount / 240, 2), current_date)
+
+    # Price updates as a random walk from the end of the purchases up to now
+    if price_updates:
+        names = [p[1] for p in positions]
+        prices = {p[1]: p[2] for p in positions}
+        update_step = max(end_date - current_date, timedelta(0)) / price_updates
+        for _ in range(price_updates):
+            current_date += update_step
+            for name in names:
+                prices[name] = round(prices[name] * rng.lognormvariate(0.005, 0.05), 4)
+                update_investment_value(portfolio, name, prices[name], current_date)
+
+    return portfolio
@@ -8,6 +8,7 @@ via l'API Yahoo Finance.
 from .asset_search import search_asset, get_asset_info, get_asset_history
 from .asset_display import create_price_chart, format_asset_info
 from .asset_ui import asset_search_tab
+from .price_store import PriceStore, MonthlyReturns, load_monthly_returns
 
 __all__ = [
     # Core search functions
@@ -18,7 +19,11 @@ __all__ = [
     'create_price_chart',
     'format_asset_info',
     # UI components
-    'asset_search_tab'
+    'asset_search_tab',
+    # Local price store
+    'PriceStore',
+    'MonthlyReturns',
+    'load_monthly_returns'
 ]
 
 __version__ = "1.0.0"
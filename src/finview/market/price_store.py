@@ -0,0 +1,263 @@
+"""
+Stockage local des historiques de prix (SQLite) et rendements mensuels
+
+Remplace la base PostgreSQL distante de import_yfinance_db.py par un fichier
+SQLite local, avec la même table stock_data (symbol, category, date, OHLCV).
+
+Les rendements mensuels sont précalculés une fois dans un tableau NumPy
+(une ligne contiguë par ticker, une colonne par mois) enregistré en .npy et
+relu en mémoire partagée (mmap) : le bootstrap des simulations n'est plus
+que de l'arithmétique d'indices, sans pandas par trajectoire.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_STORE_PATH = os.path.join("market_data", "prices.sqlite")
+DEFAULT_RETURNS_DIR = os.path.join("market_data", "returns")
+RETURNS_FILENAME = "monthly_returns.npy"
+RETURNS_META_FILENAME = "monthly_returns.json"
+# Début de l'historique importé : assez long pour que le bootstrap tire ses
+# blocs dans plusieurs cycles de marché (krachs de 2000 et 2008 compris)
+DEFAULT_START_DATE = "2000-01-01"
+
+# Mêmes tickers que import_yfinance_db.py
+DEFAULT_SYMBOLS = {
+    'Actions US': ['AAPL', 'GOOGL', 'MSFT', 'TSLA', 'AMZN', 'NVDA'],
+    'Actions FR': ['MC.PA', 'OR.PA', 'SAN.PA', 'AIR.PA'],
+    'Indices': ['^GSPC', '^DJI', '^IXIC', '^FCHI'],
+    'Cryptos': ['BTC-USD', 'ETH-USD', 'BNB-USD'],
+    'ETF': ['SPY', 'QQQ', 'VOO', 'VTI'],
+    'Matières premières': ['GC=F', 'SI=F', 'CL=F']
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stock_data (
+    symbol TEXT,
+    category TEXT,
+    date DATE,
+    open DOUBLE PRECISION,
+    high DOUBLE PRECISION,
+    low DOUBLE PRECISION,
+    close DOUBLE PRECISION,
+    volume BIGINT
+);
+CREATE INDEX IF NOT EXISTS idx_stock_data_symbol_date ON stock_data (symbol, date);
+"""
+
+
+class PriceStore:
+    """
+    Historique OHLCV local dans un fichier SQLite
+
+    Attributes:
+        path: Chemin du fichier SQLite
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def insert_history(self, symbol, category, data):
+        """
+        Ajoute (ou remplace) l'historique d'un ticker
+
+        Args:
+            symbol: Ticker (ex: 'AAPL')
+            category: Catégorie d'import (ex: 'Actions US')
+            data: DataFrame indexé par date avec les colonnes Open, High,
+                Low, Close, Volume (format yfinance)
+
+        Returns:
+            int: Nombre de lignes insérées
+        """
+        if data.empty:
+            return 0
+        data = data.copy()
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        if 'Volume' not in data.columns:
+            data['Volume'] = 0
+        dates = pd.to_datetime(data.index).strftime('%Y-%m-%d')
+
+        rows = [
+            (symbol, category, date, float(row.Open), float(row.High), float(row.Low),
+             float(row.Close), int(0 if pd.isna(row.Volume) else row.Volume))
+            for date, row in zip(dates, data[['Open', 'High', 'Low', 'Close', 'Volume']].itertuples())
+        ]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM stock_data WHERE symbol = ?", (symbol,))
+            conn.executemany("""
+                INSERT INTO stock_data (symbol, category, date, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        return len(rows)
+
+    def symbols(self):
+        """Tickers présents dans le stock, triés"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT symbol FROM stock_data ORDER BY symbol")]
+
+    def load_closes(self, symbols=None):
+        """
+        Cours de clôture journaliers
+
+        Args:
+            symbols: Tickers à charger (tous par défaut)
+
+        Returns:
+            pd.DataFrame: Une colonne par ticker, indexée par date
+        """
+        query = "SELECT symbol, date, close FROM stock_data"
+        params = ()
+        if symbols is not None:
+            symbols = list(symbols)
+            query += f" WHERE symbol IN ({', '.join('?' * len(symbols))})"
+            params = tuple(symbols)
+        with self._connect() as conn:
+            data = pd.read_sql_query(query, conn, params=params, parse_dates=['date'])
+        return data.pivot_table(index='date', columns='symbol', values='close').sort_index()
+
+    def monthly_returns(self, symbols=None):
+        """
+        Rendements mensuels (clôture de fin de mois à fin de mois)
+
+        Returns:
+            pd.DataFrame: Une colonne par ticker, une ligne par mois (NaN hors historique)
+        """
+        closes = self.load_closes(symbols)
+        month_end = closes.groupby(closes.index.to_period('M')).last()
+        return month_end.pct_change(fill_method=None).iloc[1:]
+
+    def build_return_arrays(self, returns_dir=DEFAULT_RETURNS_DIR):
+        """
+        Précalcule les rendements mensuels de tous les tickers dans un .npy
+
+        Le tableau (n_tickers, n_mois) est en ordre C : l'historique de chaque
+        ticker est contigu. Les métadonnées (tickers, mois) vont dans un .json.
+
+        Returns:
+            str: Chemin du fichier .npy écrit
+        """
+        returns = self.monthly_returns()
+        os.makedirs(returns_dir, exist_ok=True)
+
+        array_path = os.path.join(returns_dir, RETURNS_FILENAME)
+        np.save(array_path, np.ascontiguousarray(returns.to_numpy(dtype=np.float64).T))
+        with open(os.path.join(returns_dir, RETURNS_META_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump({
+                'symbols': list(returns.columns),
+                'months': [str(month) for month in returns.index],
+                'source': os.path.abspath(self.path),
+            }, f, indent=2)
+        return array_path
+
+    def import_from_yfinance(self, symbols=None, start_date=DEFAULT_START_DATE, end_date=None):
+        """
+        Télécharge les historiques via yfinance (comme import_yfinance_db.py)
+
+        Args:
+            symbols: Dict {catégorie: [tickers]} (DEFAULT_SYMBOLS par défaut)
+            start_date / end_date: Période au format 'YYYY-MM-DD'
+                (DEFAULT_START_DATE à aujourd'hui par défaut)
+
+        Returns:
+            dict: Nombre de lignes insérées par ticker
+        """
+        import yfinance as yf
+
+        symbols = symbols or DEFAULT_SYMBOLS
+        end_date = end_date or datetime.today().strftime('%Y-%m-%d')
+        inserted = {}
+        for category, tickers in symbols.items():
+            for ticker in tickers:
+                data = yf.download(ticker, start=start_date, end=end_date, progress=False, auto_adjust=False)
+                inserted[ticker] = self.insert_history(ticker, category, data)
+        return inserted
+
+
+class MonthlyReturns:
+    """
+    Rendements mensuels précalculés, en lecture mmap
+
+    Attributes:
+        matrix: Tableau (n_tickers, n_mois) en lecture seule (np.memmap)
+        symbols: Tickers, dans l'ordre des lignes
+        months: Mois ('YYYY-MM'), dans l'ordre des colonnes
+    """
+
+    def __init__(self, matrix, symbols, months):
+        self.matrix = matrix
+        self.symbols = list(symbols)
+        self.months = list(months)
+        self._rows = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def load(cls, returns_dir=DEFAULT_RETURNS_DIR):
+        """Ouvre les tableaux écrits par PriceStore.build_return_arrays()"""
+        with open(os.path.join(returns_dir, RETURNS_META_FILENAME), encoding='utf-8') as f:
+            meta = json.load(f)
+        matrix = np.load(os.path.join(returns_dir, RETURNS_FILENAME), mmap_mode='r')
+        return cls(matrix, meta['symbols'], meta['months'])
+
+    def __contains__(self, symbol):
+        return symbol in self._rows
+
+    def rows(self, symbols):
+        """
+        Historique commun de plusieurs tickers
+
+        Seuls les mois où tous les tickers demandés ont un rendement sont
+        gardés, pour conserver leurs co-mouvements lors du bootstrap.
+
+        Returns:
+            np.ndarray: Tableau contigu (len(symbols), n_mois_communs)
+        """
+        missing = [symbol for symbol in symbols if symbol not in self._rows]
+        if missing:
+            raise ValueError(f"Tickers absents du stock de prix: {', '.join(missing)}")
+        block = self.matrix[[self._rows[symbol] for symbol in symbols]]
+        return np.ascontiguousarray(block[:, np.isfinite(block).all(axis=0)])
+
+    def span(self, symbols):
+        """
+        Historique complet de plusieurs tickers, sur l'union de leurs mois
+
+        Contrairement à rows(), un ticker à l'historique court ne tronque pas
+        celui des autres : ses mois hors historique restent à NaN.
+
+        Returns:
+            np.ndarray: Tableau contigu (len(symbols), n_mois) avec NaN hors historique
+        """
+        missing = [symbol for symbol in symbols if symbol not in self._rows]
+        if missing:
+            raise ValueError(f"Tickers absents du stock de prix: {', '.join(missing)}")
+        block = self.matrix[[self._rows[symbol] for symbol in symbols]]
+        return np.ascontiguousarray(block[:, np.isfinite(block).any(axis=0)])
+
+
+def load_monthly_returns(store_path=DEFAULT_STORE_PATH, returns_dir=DEFAULT_RETURNS_DIR):
+    """
+    Rendements mensuels en mmap, recalculés si le stock SQLite est plus récent
+
+    Returns:
+        MonthlyReturns: Rendements de tous les tickers du stock
+    """
+    array_path = os.path.join(returns_dir, RETURNS_FILENAME)
+    if not os.path.exists(store_path) and not os.path.exists(array_path):
+        raise FileNotFoundError(f"Stock de prix introuvable: {store_path}")
+    if os.path.exists(store_path) and (
+            not os.path.exists(array_path) or os.path.getmtime(array_path) < os.path.getmtime(store_path)):
+        PriceStore(store_path).build_return_arrays(returns_dir)
+    return MonthlyReturns.load(returns_dir)
@@ -8,11 +8,20 @@ Ce module contient les classes de base pour représenter les différents
 - FinancialInvestment : Investissements financiers (actions, ETF, obligations, crypto)
 - RealEstateInvestment : Investissements immobiliers (SCPI, REIT, immobilier direct)
 - Credit : Gestion des crédits et emprunts
+- CompactFinancialInvestment, CompactRealEstateInvestment, CompactCredit : Variantes
+  à __slots__, plus légères en mémoire (Portfolio.from_dict(data, compact=True))
+- PortfolioHistory : Historique mensuel matérialisé, mis à jour à chaque transaction
+- TransactionLedger : Historique des transactions en colonnes, indexé par date, nom et type
+- PositionStore : Copie en colonnes NumPy des positions (réévaluations et totaux vectorisés)
 """
 
 from .portfolio import Portfolio
 from .investments import Investment, FinancialInvestment, RealEstateInvestment
 from .credit import Credit
+from .compact import CompactInvestment, CompactFinancialInvestment, CompactRealEstateInvestment, CompactCredit
+from .history import PortfolioHistory
+from .ledger import TransactionLedger, as_ledger
+from .positions import PositionStore
 
 __all__ = [
     # Portfolio principal
@@ -22,7 +31,18 @@ __all__ = [
     'FinancialInvestment',
     'RealEstateInvestment',
     # Crédits
-    'Credit'
+    'Credit',
+    # Variantes compactes
+    'CompactInvestment',
+    'CompactFinancialInvestment',
+    'CompactRealEstateInvestment',
+    'CompactCredit',
+    # Historique
+    'PortfolioHistory',
+    'TransactionLedger',
+    'as_ledger',
+    # Positions
+    'PositionStore'
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,138 @@
+import datetime
+import sys
+from typing import Union
+
+from src.finview.models.investments import Investment, FinancialInvestment, RealEstateInvestment
+from src.finview.models.credit import Credit
+
+# Naive dates are stored as microseconds since this epoch
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _compact_date(slot: str) -> property:
+    """
+    Date attribute stored as an int in the given slot
+
+    A naive datetime becomes an int (32 bytes instead of 48) and is rebuilt
+    on read; timezone-aware datetimes are kept as they are.
+    """
+    def getter(self) -> datetime.datetime:
+        value = getattr(self, slot)
+        return _EPOCH + value * _MICROSECOND if isinstance(value, int) else value
+
+    def setter(self, value: datetime.datetime) -> None:
+        if value.tzinfo is None:
+            value = (value - _EPOCH) // _MICROSECOND
+        setattr(self, slot, value)
+
+    return property(getter, setter)
+
+
+def _intern(value: Union[str, None]) -> Union[str, None]:
+    """Share one copy of the strings that repeat across positions (types, locations)"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class CompactInvestment:
+    """
+    Slotted variant of Investment, same constructor and API
+
+    No per-instance __dict__, a compact purchase date and, in the
+    subclasses, type and location strings interned at construction.
+    Registered as a virtual subclass, so isinstance(compact, Investment) is
+    True.
+    """
+
+    __slots__ = ("name", "initial_value", "current_value", "quantity", "_purchase_date")
+
+    def __init__(self, name: str, initial_value: float, current_value: float, quantity: float = 1.0):
+        self.name = name
+        self.initial_value = initial_value
+        self.current_value = current_value
+        self.quantity = quantity
+        self.purchase_date = datetime.datetime.now()
+
+    purchase_date = _compact_date("_purchase_date")
+
+    update_value = Investment.update_value
+    get_total_value = Investment.get_total_value
+    get_gain_loss = Investment.get_gain_loss
+    get_gain_loss_percentage = Investment.get_gain_loss_percentage
+
+
+class CompactFinancialInvestment(CompactInvestment):
+    """Slotted variant of FinancialInvestment"""
+
+    __slots__ = ("investment_type", "location")
+
+    def __init__(
+        self,
+        name: str,
+        initial_value: float,
+        current_value: float,
+        quantity: float = 1.0,
+        investment_type: str = "Stock",
+        location: str = ""
+    ):
+        super().__init__(name, initial_value, current_value, quantity)
+        self.investment_type = _intern(investment_type)
+        self.location = _intern(location)
+
+    __repr__ = FinancialInvestment.__repr__
+
+
+class CompactRealEstateInvestment(CompactInvestment):
+    """Slotted variant of RealEstateInvestment"""
+
+    __slots__ = ("property_type", "location", "rental_yield")
+
+    def __init__(
+        self,
+        name: str,
+        initial_value: float,
+        current_value: float,
+        quantity: float = 1.0,
+        property_type: str = "SCPI",
+        location: str = "",
+        rental_yield: float = 0.0
+    ):
+        super().__init__(name, initial_value, current_value, quantity)
+        self.property_type = _intern(property_type)
+        self.location = _intern(location)
+        self.rental_yield = rental_yield
+
+    get_annual_rental_income = RealEstateInvestment.get_annual_rental_income
+    __repr__ = RealEstateInvestment.__repr__
+
+
+class CompactCredit:
+    """Slotted variant of Credit, with a compact creation date"""
+
+    __slots__ = ("name", "initial_amount", "current_balance", "interest_rate", "monthly_payment", "_creation_date")
+
+    def __init__(
+        self,
+        name: str,
+        initial_amount: float,
+        interest_rate: float,
+        monthly_payment: float = 0
+    ):
+        self.name = name
+        self.initial_amount = initial_amount
+        self.current_balance = initial_amount
+        self.interest_rate = interest_rate
+        self.monthly_payment = monthly_payment
+        self.creation_date = datetime.datetime.now()
+
+    creation_date = _compact_date("_creation_date")
+
+    make_payment = Credit.make_payment
+    apply_interest = Credit.apply_interest
+    get_remaining_balance = Credit.get_remaining_balance
+
+
+Investment.register(CompactInvestment)
+FinancialInvestment.register(CompactFinancialInvestment)
+RealEstateInvestment.register(CompactRealEstateInvestment)
+Credit.register(CompactCredit)
@@ -1,7 +1,13 @@
 import datetime
+from abc import ABCMeta
 
-class Credit:
-    """Credit/Loan with interest rate and payment tracking"""
+class Credit(metaclass=ABCMeta):
+    """
+    Credit/Loan with interest rate and payment tracking
+
+    ABCMeta only lets CompactCredit (models.compact) register as a virtual
+    subclass.
+    """
     
     def __init__(
         self, 
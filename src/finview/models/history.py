@@ -0,0 +1,210 @@
+import bisect
+import datetime
+import math
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Transactions that change the price or the quantity of a financial position
+POSITION_EVENT_TYPES = ("FINANCIAL_INVESTMENT_BUY", "INVESTMENT_UPDATE", "INVESTMENT_SELL")
+
+
+def parse_transaction_date(value) -> datetime.datetime:
+    """Parse a transaction date ('YYYY-MM-DD HH:MM:SS', pandas as a fallback for other formats)"""
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return pd.Timestamp(value).to_pydatetime()
+
+
+def _month_start(date: datetime.datetime) -> datetime.datetime:
+    return datetime.datetime(date.year, date.month, 1)
+
+
+def _next_month(date: datetime.datetime) -> datetime.datetime:
+    """Same day and time, one month later (periods keep the time of the first transaction)"""
+    return date.replace(year=date.year + date.month // 12, month=date.month % 12 + 1)
+
+
+def _number(value) -> float:
+    """Transaction field as a float (missing or NaN counts as 0)"""
+    if value is None:
+        return 0.0
+    value = float(value)
+    return 0.0 if math.isnan(value) else value
+
+
+class PortfolioHistory:
+    """
+    Materialized monthly history of a portfolio
+
+    For every month since the first transaction, keeps the value of the
+    financial positions, the invested capital (running sum of transaction
+    amounts) and a snapshot of each held position's quantity and price. A
+    month is valued with every transaction dated up to its first day (at the
+    time of day of the first transaction), like
+    charts.history.build_monthly_history; real estate is not valued.
+
+    Transactions are applied as they are recorded (Portfolio.append_transaction),
+    in O(1) each plus one snapshot per month crossed. sync() catches up with
+    transactions appended to the list directly, and rebuilds everything when
+    the list was replaced (loaded file) or a transaction is backdated.
+
+    Attributes:
+        periods: Month starts, in order
+        values: Value of the financial positions at each month start
+        invested: Invested capital at each month start
+        snapshots: {name: (quantity, price)} of held positions at each month start
+            (consecutive months without changes share the same dict)
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every transaction applied so far"""
+        self.periods: List[datetime.datetime] = []
+        self.values: List[float] = []
+        self.invested: List[float] = []
+        self.snapshots: List[Dict[str, Tuple[float, float]]] = []
+
+        self._positions: Dict[str, List] = {}  # name -> [quantity, price or None]
+        self._invested = 0.0
+        self._snapshot: Dict[str, Tuple[float, float]] = {}
+        self._snapshot_value = 0.0
+        self._changed = False
+        self._next_period: Optional[datetime.datetime] = None
+        self._last_date: Optional[datetime.datetime] = None
+
+        self._source: Optional[List[Dict]] = None
+        self._revision = None
+        self._applied = 0
+        self._stale = False
+        self._frame = None
+        self._frame_key = None
+
+    # === UPDATES ===
+
+    def sync(self, transaction_history: List[Dict]) -> None:
+        """
+        Bring the history up to date with a transaction list
+
+        Only the transactions added since the last call are applied, unless the
+        list was replaced, shortened, edited (a TransactionLedger whose revision
+        changed: insert, item assignment, refresh...) or received a backdated
+        transaction (older than the last one applied or than a month already
+        recorded), in which case the whole history is rebuilt. A plain list is
+        followed by length only.
+        """
+        if (transaction_history is not self._source or self._stale
+                or len(transaction_history) < self._applied
+                or getattr(transaction_history, "revision", None) != self._revision):
+            self.rebuild(transaction_history)
+            return
+        for transaction in transaction_history[self._applied:]:
+            self._append(transaction)
+        self._applied = len(transaction_history)
+        if self._stale:
+            self.rebuild(transaction_history)
+
+    def rebuild(self, transaction_history: List[Dict]) -> None:
+        """Full rebuild from a transaction list (legacy files, out-of-order transactions)"""
+        self.reset()
+        dated = sorted(
+            ((parse_transaction_date(t["date"]), i) for i, t in enumerate(transaction_history)),
+            key=lambda item: item[0]
+        )
+        for date, i in dated:
+            self._apply(date, transaction_history[i])
+        self._source = transaction_history
+        self._revision = getattr(transaction_history, "revision", None)
+        self._applied = len(transaction_history)
+
+    def _append(self, transaction: Dict) -> None:
+        if self._stale:
+            return
+        date = parse_transaction_date(transaction["date"])
+        if ((self._last_date is not None and date < self._last_date)
+                or (self.periods and date <= self.periods[-1])):
+            # Backdated transaction: the state or the months already recorded are wrong
+            self._stale = True
+            return
+        self._apply(date, transaction)
+
+    def _apply(self, date: datetime.datetime, transaction: Dict) -> None:
+        if self._next_period is None:
+            # Like pd.date_range(first_date.replace(day=1), freq="MS"), which keeps the time of day
+            self._next_period = date.replace(day=1)
+        while self._next_period < date:
+            self._close_period()
+
+        self._invested += _number(transaction.get("amount"))
+        self._last_date = date
+        self._frame = None
+
+        name = transaction.get("name")
+        transaction_type = transaction.get("type")
+        if not name or transaction_type not in POSITION_EVENT_TYPES:
+            return
+
+        position = self._positions.setdefault(name, [0.0, None])
+        if transaction_type == "FINANCIAL_INVESTMENT_BUY":
+            position[0] = _number(transaction.get("quantity"))
+            position[1] = transaction.get("price")
+        elif transaction_type == "INVESTMENT_UPDATE":
+            position[1] = transaction.get("price")
+        else:
+            position[0] -= _number(transaction.get("quantity"))
+        self._changed = True
+
+    def _close_period(self) -> None:
+        """Record the current state for the next month start"""
+        if self._changed:
+            self._snapshot = {
+                name: (quantity, price)
+                for name, (quantity, price) in self._positions.items()
+                if price is not None and quantity > 0
+            }
+            self._snapshot_value = sum(quantity * price for quantity, price in self._snapshot.values())
+            self._changed = False
+        self.periods.append(self._next_period)
+        self.values.append(self._snapshot_value)
+        self.invested.append(self._invested)
+        self.snapshots.append(self._snapshot)
+        self._next_period = _next_month(self._next_period)
+
+    # === READS ===
+
+    def to_frame(self, end: Optional[datetime.datetime] = None) -> pd.DataFrame:
+        """
+        Monthly history up to end (now by default)
+
+        Months after the last transaction carry the current state. The frame
+        is cached until the next transaction or the next month.
+
+        Returns:
+            pd.DataFrame: Columns 'date', 'value', 'invested'
+        """
+        if self._next_period is None:
+            return pd.DataFrame(columns=["date", "value", "invested"])
+
+        end = end or datetime.datetime.now()
+        key = (self._applied, _month_start(end))
+        if self._frame is None or self._frame_key != key:
+            while self._next_period <= end:
+                self._close_period()
+            count = bisect.bisect_right(self.periods, end)
+            self._frame = pd.DataFrame({
+                "date": pd.DatetimeIndex(self.periods[:count]),
+                "value": self.values[:count],
+                "invested": self.invested[:count]
+            })
+            self._frame_key = key
+        return self._frame.copy()
+
+    def positions_at(self, date: datetime.datetime) -> Dict[str, Tuple[float, float]]:
+        """Snapshot {name: (quantity, price)} of the last month start on or before date"""
+        i = bisect.bisect_right(self.periods, date)
+        return dict(self.snapshots[i - 1]) if i else {}
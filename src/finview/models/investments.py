@@ -1,7 +1,13 @@
 import datetime 
+from abc import ABCMeta
 
-class Investment:
-    """Base class for all investment types"""
+class Investment(metaclass=ABCMeta):
+    """
+    Base class for all investment types
+
+    ABCMeta only lets the slotted variants (models.compact) register as
+    virtual subclasses, so isinstance() checks accept both.
+    """
     
     def __init__(self, name: str, initial_value: float, current_value: float, quantity: float = 1.0):
         self.name = name
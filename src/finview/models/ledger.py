@@ -0,0 +1,315 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+_FLOAT_COLUMNS = ("amount", "price", "quantity")
+
+
+def _to_datetime64(value) -> np.datetime64:
+    """Transaction date as datetime64[ns] ('YYYY-MM-DD HH:MM:SS', pandas as a fallback)"""
+    try:
+        return np.datetime64(value, "ns")
+    except (TypeError, ValueError):
+        return pd.Timestamp(value).to_datetime64().astype("datetime64[ns]")
+
+
+def _to_float(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+class TransactionLedger(list):
+    """
+    Transaction history with columnar storage and sorted indexes
+
+    Behaves like the list of transaction dicts it replaces (same items, same
+    JSON shape), and keeps alongside them:
+    - columns: datetime64 dates, categorical types and names (integer codes),
+      amounts, prices and quantities as float64 (NaN when missing),
+    - indexes: row order by date, rows of each name and of each type.
+
+    Appending keeps the columns and indexes up to date in O(1), and extend()
+    adds a whole block of transactions in one pass. Any other
+    list mutation (insert, slice assignment, sort...) marks them stale and
+    they are rebuilt on the next read. Transactions are treated as immutable
+    once recorded: call refresh() after editing one in place.
+
+    revision counts those other mutations (and refresh() calls): readers
+    that follow the ledger incrementally, by length, rebuild when it changes.
+    """
+
+    def __init__(self, transactions: Iterable[Dict] = ()):
+        super().__init__(transactions)
+        self.revision = 0
+        self._reindex()
+
+    # === LIST API ===
+
+    def append(self, transaction: Dict) -> None:
+        super().append(transaction)
+        if self._valid:
+            self._add_row(transaction)
+
+    def extend(self, transactions: Iterable[Dict]) -> None:
+        transactions = list(transactions)
+        super().extend(transactions)
+        if self._valid:
+            self._add_rows(transactions)
+
+    def __iadd__(self, transactions):
+        self.extend(transactions)
+        return self
+
+    def _mutated(method):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._valid = False
+            self.revision += 1
+            return result
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    insert = _mutated(list.insert)
+    pop = _mutated(list.pop)
+    remove = _mutated(list.remove)
+    clear = _mutated(list.clear)
+    sort = _mutated(list.sort)
+    reverse = _mutated(list.reverse)
+    __setitem__ = _mutated(list.__setitem__)
+    __delitem__ = _mutated(list.__delitem__)
+    __imul__ = _mutated(list.__imul__)
+    del _mutated
+
+    def __reduce_ex__(self, protocol):
+        # Columns and indexes are rebuilt on load
+        return (type(self), (list(self),))
+
+    def to_list(self) -> List[Dict]:
+        """Plain list of transaction dicts (JSON shape)"""
+        return list(self)
+
+    # === COLUMNS ===
+
+    def refresh(self) -> None:
+        """Rebuild the columns and indexes after transactions were edited in place"""
+        self.revision += 1
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the columns and indexes from the transaction dicts"""
+        n = len(self)
+        capacity = max(16, n)
+        self._size = 0
+        self._dates = np.empty(capacity, dtype="datetime64[ns]")
+        self._type_codes = np.empty(capacity, dtype=np.int16)
+        self._name_codes = np.empty(capacity, dtype=np.int32)
+        self._floats = {column: np.empty(capacity) for column in _FLOAT_COLUMNS}
+        self._types: List[str] = []
+        self._type_index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._rows_by_type: Dict[int, List[int]] = {}
+        self._rows_by_name: Dict[int, List[int]] = {}
+        self._in_order = True
+        self._date_order = None
+        self._cumulative_amounts = None
+        self._valid = True
+        self._add_rows(self)
+
+    def _ensure(self) -> None:
+        if not self._valid:
+            self._reindex()
+
+    def _grow(self) -> None:
+        capacity = 2 * self._dates.size
+        self._dates = np.resize(self._dates, capacity)
+        self._type_codes = np.resize(self._type_codes, capacity)
+        self._name_codes = np.resize(self._name_codes, capacity)
+        self._floats = {column: np.resize(values, capacity) for column, values in self._floats.items()}
+
+    def _add_rows(self, transactions: List[Dict]) -> None:
+        """Columns and indexes of a block of transactions, dates parsed in one call"""
+        if not transactions:
+            return
+        start, end = self._size, self._size + len(transactions)
+        while end > self._dates.size:
+            self._grow()
+        try:
+            dates = np.array([t["date"] for t in transactions], dtype="datetime64[ns]")
+        except ValueError:
+            dates = pd.to_datetime([t["date"] for t in transactions]).to_numpy(dtype="datetime64[ns]")
+        if (start and dates[0] < self._dates[start - 1]) or np.any(dates[1:] < dates[:-1]):
+            self._in_order = False
+        self._dates[start:end] = dates
+        for column in _FLOAT_COLUMNS:
+            self._floats[column][start:end] = [_to_float(t.get(column)) for t in transactions]
+        for row, transaction in enumerate(transactions, start):
+            self._index_row(row, transaction)
+        self._size = end
+        self._date_order = None
+        self._cumulative_amounts = None
+
+    def _add_row(self, transaction: Dict) -> None:
+        row = self._size
+        if row == self._dates.size:
+            self._grow()
+        date = _to_datetime64(transaction["date"])
+        if row and date < self._dates[row - 1]:
+            self._in_order = False
+        self._dates[row] = date
+        for column in _FLOAT_COLUMNS:
+            self._floats[column][row] = _to_float(transaction.get(column))
+        self._index_row(row, transaction)
+        self._size = row + 1
+        self._date_order = None
+        self._cumulative_amounts = None
+
+    def _index_row(self, row: int, transaction: Dict) -> None:
+        transaction_type = transaction.get("type")
+        type_code = self._type_index.get(transaction_type)
+        if type_code is None:
+            type_code = self._type_index[transaction_type] = len(self._types)
+            self._types.append(transaction_type)
+        self._type_codes[row] = type_code
+        self._rows_by_type.setdefault(type_code, []).append(row)
+
+        name = transaction.get("name")
+        name_code = -1
+        if name is not None:
+            name_code = self._name_index.get(name)
+            if name_code is None:
+                name_code = self._name_index[name] = len(self._names)
+                self._names.append(name)
+            self._rows_by_name.setdefault(name_code, []).append(row)
+        self._name_codes[row] = name_code
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Transaction dates (datetime64[ns]), in row order"""
+        self._ensure()
+        return self._dates[:self._size]
+
+    @property
+    def amounts(self) -> np.ndarray:
+        self._ensure()
+        return self._floats["amount"][:self._size]
+
+    @property
+    def prices(self) -> np.ndarray:
+        self._ensure()
+        return self._floats["price"][:self._size]
+
+    @property
+    def quantities(self) -> np.ndarray:
+        self._ensure()
+        return self._floats["quantity"][:self._size]
+
+    @property
+    def types(self) -> pd.Categorical:
+        """Transaction types, in row order"""
+        self._ensure()
+        return pd.Categorical.from_codes(self._type_codes[:self._size], categories=self._types)
+
+    @property
+    def names(self) -> pd.Categorical:
+        """Asset names (NaN for cash and credit transactions), in row order"""
+        self._ensure()
+        return pd.Categorical.from_codes(self._name_codes[:self._size], categories=self._names)
+
+    def type_values(self) -> np.ndarray:
+        """Transaction types as an object array, in row order"""
+        self._ensure()
+        return np.array(self._types, dtype=object)[self._type_codes[:self._size]]
+
+    def name_values(self) -> np.ndarray:
+        """Asset names (None for cash and credit transactions) as an object array, in row order"""
+        self._ensure()
+        values = np.array(self._names + [None], dtype=object)
+        return values[self._name_codes[:self._size]]
+
+    # === INDEXES ===
+
+    def date_order(self) -> np.ndarray:
+        """Rows sorted by date (stable: recording order among equal dates)"""
+        self._ensure()
+        if self._date_order is None:
+            if self._in_order:
+                self._date_order = np.arange(self._size)
+            else:
+                self._date_order = np.argsort(self._dates[:self._size], kind="stable")
+        return self._date_order
+
+    def _sorted_dates(self) -> np.ndarray:
+        order = self.date_order()
+        return self._dates[:self._size] if self._in_order else self._dates[order]
+
+    def rows(self, name: Optional[str] = None, transaction_type: Optional[str] = None,
+             start=None, end=None) -> np.ndarray:
+        """
+        Rows matching every given filter, sorted by date
+
+        Args:
+            name: Asset name
+            transaction_type: Transaction type (e.g. 'INVESTMENT_UPDATE')
+            start / end: Inclusive date bounds (anything pandas can parse)
+        """
+        self._ensure()
+        if name is not None:
+            rows = np.array(self._rows_by_name.get(self._name_index.get(name), []), dtype=np.intp)
+        elif transaction_type is not None:
+            rows = np.array(self._rows_by_type.get(self._type_index.get(transaction_type), []), dtype=np.intp)
+        else:
+            rows = self.date_order()
+        if name is not None and transaction_type is not None:
+            rows = rows[self._type_codes[rows] == self._type_index.get(transaction_type, -1)]
+
+        if name is None and transaction_type is None:
+            dates = self._sorted_dates()
+        else:
+            if not self._in_order:
+                rows = rows[np.argsort(self._dates[rows], kind="stable")]
+            dates = self._dates[rows]
+        low = 0 if start is None else np.searchsorted(dates, _to_datetime64(start), side="left")
+        high = rows.size if end is None else np.searchsorted(dates, _to_datetime64(end), side="right")
+        return rows[low:high]
+
+    def total_amount(self, end=None, name: Optional[str] = None,
+                     transaction_type: Optional[str] = None) -> float:
+        """Sum of the amounts of the matching transactions dated up to end"""
+        self._ensure()
+        if name is None and transaction_type is None:
+            # Running total over the date order, kept until the next transaction
+            if self._cumulative_amounts is None:
+                amounts = np.nan_to_num(self._floats["amount"][self.date_order()])
+                self._cumulative_amounts = np.concatenate([[0.0], np.cumsum(amounts)])
+            count = self._size if end is None else np.searchsorted(
+                self._sorted_dates(), _to_datetime64(end), side="right")
+            return float(self._cumulative_amounts[count])
+        rows = self.rows(name=name, transaction_type=transaction_type, end=end)
+        return float(np.nansum(self._floats["amount"][rows]))
+
+    def latest(self, count: int) -> List[Dict]:
+        """The count most recent transactions, oldest first"""
+        return [self[row] for row in self.date_order()[-count:]] if count > 0 else []
+
+    def to_frame(self, descending: bool = False) -> pd.DataFrame:
+        """
+        Transactions as a DataFrame sorted by date, with parsed dates
+
+        Every key of the transaction dicts becomes a column, like
+        pd.DataFrame(transaction_history), but 'date' is datetime64. The
+        index is the row of each transaction in the ledger.
+        """
+        order = self.date_order()[::-1] if descending else self.date_order()
+        frame = pd.DataFrame([self[row] for row in order], index=order)
+        if len(frame):
+            frame["date"] = self._dates[order]
+        return frame
+
+
+def as_ledger(transactions: Iterable[Dict]) -> TransactionLedger:
+    """The ledger itself, or a new ledger over a plain list of transactions"""
+    if isinstance(transactions, TransactionLedger):
+        return transactions
+    return TransactionLedger(transactions)
@@ -1,8 +1,167 @@
+import contextlib
 import datetime
-from typing import Dict, List, Optional, Union
+import itertools
+import math
+import os
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
 
 from src.finview.models.investments import FinancialInvestment, RealEstateInvestment
 from src.finview.models.credit import Credit
+from src.finview.models.compact import CompactFinancialInvestment, CompactRealEstateInvestment, CompactCredit
+from src.finview.models.history import PortfolioHistory
+from src.finview.models.ledger import TransactionLedger, as_ledger
+from src.finview.models.positions import PositionStore, position_arrays
+
+# Cross-check every cached total against a full recompute (slow, for debugging)
+DEBUG_TOTALS = os.environ.get("FINVIEW_DEBUG_TOTALS", "") not in ("", "0")
+
+# from_dict enables the columnar position store from this many investments
+POSITION_STORE_MIN_POSITIONS = 1000
+
+# Bucket of each position class, filled on first use (isinstance() through
+# ABCMeta is slow when it fails, and the totals hit it on every mutation)
+_BUCKETS: Dict[type, str] = {}
+
+
+def _bucket_of(item) -> Optional[str]:
+    """'real_estate', 'financial', 'credits' or None"""
+    cls = type(item)
+    bucket = _BUCKETS.get(cls)
+    if bucket is None:
+        if isinstance(item, RealEstateInvestment):
+            bucket = "real_estate"
+        elif isinstance(item, FinancialInvestment):
+            bucket = "financial"
+        elif isinstance(item, Credit):
+            bucket = "credits"
+        else:
+            return None
+        _BUCKETS[cls] = bucket
+    return bucket
+
+
+class PortfolioTotals:
+    """
+    Running totals of a portfolio's positions, per bucket
+
+    Attributes:
+        financial: Value of the financial investments
+        real_estate: Value of the real estate investments
+        credits: Remaining balance of the credits
+        rental_income: Annual rental income of the real estate investments
+    """
+
+    def __init__(self):
+        self.financial = 0.0
+        self.real_estate = 0.0
+        self.credits = 0.0
+        self.rental_income = 0.0
+
+    def add(self, item: Union[FinancialInvestment, RealEstateInvestment, Credit], sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) the contribution of one position"""
+        bucket = _bucket_of(item)
+        if bucket == "real_estate":
+            self.real_estate += sign * item.get_total_value()
+            self.rental_income += sign * item.get_annual_rental_income()
+        elif bucket == "financial":
+            self.financial += sign * item.get_total_value()
+        elif bucket == "credits":
+            self.credits += sign * item.get_remaining_balance()
+
+    @classmethod
+    def compute(cls, portfolio: 'Portfolio') -> 'PortfolioTotals':
+        """Full recompute from the positions"""
+        totals = cls()
+        for bucket in (portfolio.financial_investments, portfolio.real_estate_investments, portfolio.credits):
+            for item in bucket.values():
+                totals.add(item)
+        return totals
+
+
+class InvestmentsView(Mapping):
+    """
+    Live read-only view of a portfolio's financial and real estate investments
+
+    Lookups read the portfolio's two dicts directly, so the view never needs
+    rebuilding and always reflects the current positions. Like the merged
+    dict it replaces, keys follow the financial investments then the real
+    estate ones, and a real estate investment wins over a financial one with
+    the same name.
+    """
+
+    __slots__ = ("_portfolio",)
+
+    def __init__(self, portfolio: 'Portfolio'):
+        self._portfolio = portfolio
+
+    def _dicts(self):
+        """(financial, real estate, whether a name is in both)"""
+        financial = self._portfolio.financial_investments
+        real_estate = self._portfolio.real_estate_investments
+        return financial, real_estate, not financial.keys().isdisjoint(real_estate)
+
+    def __getitem__(self, name: str) -> Union[FinancialInvestment, RealEstateInvestment]:
+        real_estate = self._portfolio.real_estate_investments
+        if name in real_estate:
+            return real_estate[name]
+        return self._portfolio.financial_investments[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._portfolio.real_estate_investments or name in self._portfolio.financial_investments
+
+    def __iter__(self) -> Iterator[str]:
+        financial, real_estate, shared = self._dicts()
+        if not shared:
+            return itertools.chain(financial, real_estate)
+        return itertools.chain(financial, (name for name in real_estate if name not in financial))
+
+    def __len__(self) -> int:
+        financial, real_estate, shared = self._dicts()
+        if not shared:
+            return len(financial) + len(real_estate)
+        return len(financial) + sum(1 for name in real_estate if name not in financial)
+
+    def _iter_items(self):
+        financial, real_estate, shared = self._dicts()
+        if not shared:
+            return itertools.chain(financial.items(), real_estate.items())
+        return itertools.chain(
+            ((name, real_estate.get(name, investment)) for name, investment in financial.items()),
+            ((name, investment) for name, investment in real_estate.items() if name not in financial)
+        )
+
+    def _iter_values(self):
+        financial, real_estate, shared = self._dicts()
+        if not shared:
+            return itertools.chain(financial.values(), real_estate.values())
+        return (investment for _, investment in self._iter_items())
+
+    def items(self) -> ItemsView:
+        return _InvestmentsItems(self)
+
+    def values(self) -> ValuesView:
+        return _InvestmentsValues(self)
+
+    def __repr__(self) -> str:
+        return f"InvestmentsView({dict(self.items())!r})"
+
+
+class _InvestmentsItems(ItemsView):
+    """items() of InvestmentsView, read straight from the underlying dicts"""
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _InvestmentsValues(ValuesView):
+    """values() of InvestmentsView, read straight from the underlying dicts"""
+
+    def __iter__(self):
+        return self._mapping._iter_values()
+
 
 class Portfolio:
     """
@@ -13,26 +172,41 @@ class Portfolio:
         financial_investments: Dictionary of FinancialInvestment objects
         real_estate_investments: Dictionary of RealEstateInvestment objects
         credits: Dictionary of Credit objects
-        transaction_history: List of all transactions
+        transaction_history: TransactionLedger of all transactions (a list of dicts
+            with columnar storage and indexes; plain lists are wrapped on assignment)
+        history: Materialized monthly history, extended as transactions are appended
+        totals: Running totals per bucket (see updating())
+        positions: Optional columnar PositionStore of the investments (see enable_position_store())
+        debug_totals: Cross-check the cached totals on every read (FINVIEW_DEBUG_TOTALS=1)
     """
+
+    debug_totals = DEBUG_TOTALS
     
     def __init__(self, initial_cash: float = 0):
         self.cash = initial_cash
         self.financial_investments: Dict[str, FinancialInvestment] = {}
         self.real_estate_investments: Dict[str, RealEstateInvestment] = {}
         self.credits: Dict[str, Credit] = {}
-        self.transaction_history: List[Dict] = []
+        self.transaction_history = TransactionLedger()
+        self.history = PortfolioHistory()
+        self.totals = PortfolioTotals()
+        self.positions: Optional[PositionStore] = None
 
     @property
-    def investments(self) -> Dict[str, Union[FinancialInvestment, RealEstateInvestment]]:
+    def transaction_history(self) -> TransactionLedger:
+        return self._transaction_history
+
+    @transaction_history.setter
+    def transaction_history(self, transactions: List[Dict]) -> None:
+        self._transaction_history = as_ledger(transactions)
+
+    @property
+    def investments(self) -> InvestmentsView:
         """
-        Compatibility property - returns all investments combined
+        Compatibility property - all investments combined, as a live read-only view
         Useful for legacy code that doesn't distinguish between types
         """
-        all_investments = {}
-        all_investments.update(self.financial_investments)
-        all_investments.update(self.real_estate_investments)
-        return all_investments
+        return InvestmentsView(self)
     
     # === CASH MANAGEMENT ===
     
@@ -70,7 +244,9 @@ class Portfolio:
         if total_cost <= self.cash:
             self.cash -= total_cost
             financial_inv = FinancialInvestment(name, initial_value, initial_value, quantity, investment_type, location)
-            self.financial_investments[name] = financial_inv
+            self._discard(self.financial_investments, name)
+            with self.updating(financial_inv):
+                self.financial_investments[name] = financial_inv
             self._log_transaction(
                 "FINANCIAL_INVESTMENT_BUY", 
                 total_cost, 
@@ -95,10 +271,13 @@ class Portfolio:
         total_cost = initial_value * quantity
         if total_cost <= self.cash:
             self.cash -= total_cost
-            self.real_estate_investments[name] = RealEstateInvestment(
+            real_estate_inv = RealEstateInvestment(
                 name, initial_value, initial_value, quantity,
                 property_type, location, rental_yield
             )
+            self._discard(self.real_estate_investments, name)
+            with self.updating(real_estate_inv):
+                self.real_estate_investments[name] = real_estate_inv
             self._log_transaction(
                 "REAL_ESTATE_INVESTMENT_BUY", 
                 total_cost, 
@@ -107,6 +286,13 @@ class Portfolio:
             return True
         return False
 
+    def _discard(self, positions: Dict, name: str) -> None:
+        """Remove a position (if held) before a new one takes its name, keeping the totals in sync"""
+        old = positions.get(name)
+        if old is not None:
+            with self.updating(old):
+                del positions[name]
+
     def add_investment(self, name: str, initial_value: float, quantity: float = 1.0) -> bool:
         """
         Compatibility method - adds a financial investment by default
@@ -119,9 +305,11 @@ class Portfolio:
         Update the current value of an investment
         Returns True if investment exists, False otherwise
         """
-        if name in self.investments:
-            old_value = self.investments[name].current_value
-            self.investments[name].update_value(new_value)
+        investment = self.investments.get(name)
+        if investment is not None:
+            old_value = investment.current_value
+            with self.updating(investment):
+                investment.update_value(new_value)
             self._log_transaction(
                 "INVESTMENT_UPDATE", 
                 0, 
@@ -129,7 +317,123 @@ class Portfolio:
             )
             return True
         return False
-    
+
+    def revalue_investments(self, prices: Mapping[str, float], date: Optional[datetime.datetime] = None) -> int:
+        """
+        Update the current unit value of many investments at once
+
+        With the position store enabled the rows are found through its name
+        index and the new values applied as one array operation; each
+        revaluation is still logged as an INVESTMENT_UPDATE transaction (same
+        format as operations.update_investment_value), and that per-position
+        logging is most of the cost on large books. See apply_price_snapshot
+        for a compact log.
+
+        Args:
+            prices: New unit value by investment name (unknown names are ignored)
+            date: Date of the revaluation (datetime.now() by default)
+
+        Returns:
+            int: Number of investments revalued
+
+        Raises:
+            ValueError: If a new value is not positive
+        """
+        matched = self._match_prices(prices)
+        if not matched:
+            return 0
+        self._apply_prices(matched)
+
+        date_str = (date or datetime.datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+        self.transaction_history.extend({
+            'date': date_str,
+            'type': 'INVESTMENT_UPDATE',
+            'amount': new_value,
+            'name': investment.name,
+            'price': new_value,
+            'description': f'{investment.name}: {old_value:.2f}€ → {new_value:.2f}€ ({investment_type})'
+        } for investment, investment_type, old_value, new_value in matched)
+        self.history.sync(self.transaction_history)
+        return len(matched)
+
+    def apply_price_snapshot(self, prices: Mapping[str, float], as_of: Optional[datetime.datetime] = None) -> int:
+        """
+        Revalue the book from a price snapshot (e.g. nightly closes)
+
+        Positions whose value changes are updated in one pass (one array
+        operation with the position store) and recorded as one block of
+        INVESTMENT_UPDATE transactions sharing the snapshot date and a single
+        description, appended to the ledger at once. Positions already at the
+        snapshot price are left alone and not logged. Save the portfolio once
+        afterwards.
+
+        Args:
+            prices: Unit value by investment name (unknown names are ignored)
+            as_of: Date of the snapshot (datetime.now() by default)
+
+        Returns:
+            int: Number of investments revalued
+
+        Raises:
+            ValueError: If a price is not positive
+        """
+        matched = [match for match in self._match_prices(prices) if match[3] != match[2]]
+        if not matched:
+            return 0
+        self._apply_prices(matched)
+
+        date_str = (as_of or datetime.datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+        description = f"Price snapshot of {date_str[:10]} ({len(matched)} positions)"
+        self.transaction_history.extend({
+            'date': date_str,
+            'type': 'INVESTMENT_UPDATE',
+            'amount': new_value,
+            'name': investment.name,
+            'price': new_value,
+            'description': description
+        } for investment, _, _, new_value in matched)
+        self.history.sync(self.transaction_history)
+        return len(matched)
+
+    def _match_prices(self, prices: Mapping[str, float]) -> List[tuple]:
+        """(investment, 'financial' or 'real_estate', old value, new value) of each priced investment"""
+        for new_value in prices.values():
+            if new_value <= 0:
+                raise ValueError(f"La nouvelle valeur doit être positive, reçue: {new_value}")
+
+        # Same lookup as self.investments: real estate wins over financial
+        matched = []
+        financial, real_estate = self.financial_investments, self.real_estate_investments
+        for name, new_value in prices.items():
+            investment = real_estate.get(name)
+            investment_type = "real_estate"
+            if investment is None:
+                investment = financial.get(name)
+                investment_type = "financial"
+            if investment is not None:
+                matched.append((investment, investment_type, investment.current_value, new_value))
+        return matched
+
+    def _apply_prices(self, matched: List[tuple]) -> None:
+        """Set the new values of _match_prices() and keep the totals in sync"""
+        unstored = matched
+        if self.positions is not None:
+            # Rows found through the store's name index and updated in one
+            # array operation; an investment missing from the store falls back
+            # to the per-object update below
+            rows = self.positions.rows_of([match[0] for match in matched], [match[1] for match in matched])
+            stored = rows >= 0
+            unstored = [] if stored.all() else [match for match, found in zip(matched, stored.tolist()) if not found]
+            if stored.any():
+                new_values = np.fromiter((match[3] for match in matched), dtype=float, count=len(matched))
+                financial, real_estate, rental_income = self.positions.revalue(rows[stored], new_values[stored])
+                self.totals.financial += financial
+                self.totals.real_estate += real_estate
+                self.totals.rental_income += rental_income
+        for investment, _, _, new_value in unstored:
+            with self.updating(investment):
+                investment.update_value(new_value)
+
     def sell_investment(self, name: str, quantity: Optional[float] = None) -> bool:
         """
         Sell an investment (fully or partially)
@@ -156,12 +460,14 @@ class Portfolio:
             sale_value = investment.get_total_value()
             self.cash += sale_value
             self._log_transaction("INVESTMENT_SELL", sale_value, f"Full sale of {name}")
-            del investment_dict[name]
+            with self.updating(investment):
+                del investment_dict[name]
         else:
             # Partial sale
             sale_value = investment.current_value * quantity
             self.cash += sale_value
-            investment.quantity -= quantity
+            with self.updating(investment):
+                investment.quantity -= quantity
             self._log_transaction(
                 "INVESTMENT_SELL", 
                 sale_value, 
@@ -185,7 +491,9 @@ class Portfolio:
         """
         if name in self.credits:
             return False
-        self.credits[name] = Credit(name, amount, interest_rate, monthly_payment)
+        credit = Credit(name, amount, interest_rate, monthly_payment)
+        with self.updating(credit):
+            self.credits[name] = credit
         self.cash += amount
         self._log_transaction("CREDIT_ADD", amount, f"New credit: {name} at {interest_rate}%")
         return True
@@ -198,46 +506,154 @@ class Portfolio:
         if name not in self.credits or amount > self.cash:
             return False
 
+        credit = self.credits[name]
         self.cash -= amount
-        self.credits[name].make_payment(amount)
+        with self.updating(credit):
+            credit.make_payment(amount)
         self._log_transaction("CREDIT_PAYMENT", amount, f"Payment on {name}")
 
         # Remove credit if fully paid
-        if self.credits[name].get_remaining_balance() <= 0.01:
-            del self.credits[name]
+        if credit.get_remaining_balance() <= 0.01:
+            with self.updating(credit):
+                del self.credits[name]
         return True
     
+    # === AGGREGATE TOTALS ===
+
+    def _holds(self, item) -> bool:
+        """Whether item is currently one of the portfolio's positions"""
+        bucket = _bucket_of(item)
+        if bucket == "real_estate":
+            positions = self.real_estate_investments
+        elif bucket == "financial":
+            positions = self.financial_investments
+        else:
+            positions = self.credits
+        return positions.get(item.name) is item
+
+    @contextlib.contextmanager
+    def updating(self, item: Union[FinancialInvestment, RealEstateInvestment, Credit]) -> Iterator[None]:
+        """
+        Keep the totals (and the position store) in sync while a position is
+        added, changed or removed
+
+        The position's contribution is taken out of the totals on entry (if it
+        is held) and added back on exit (if it is still held), so creating,
+        updating and deleting positions are all O(1):
+
+            with portfolio.updating(investment):
+                investment.update_value(new_value)
+        """
+        if self._holds(item):
+            self.totals.add(item, -1)
+        try:
+            yield
+        finally:
+            held = self._holds(item)
+            if held:
+                self.totals.add(item)
+            if self.positions is not None and _bucket_of(item) != "credits":
+                if held:
+                    self.positions.put(item)
+                else:
+                    self.positions.remove(item)
+
+    def refresh_totals(self) -> None:
+        """Recompute the totals (and the position store) from the positions, after editing the dicts directly"""
+        self.totals = PortfolioTotals.compute(self)
+        if self.positions is not None:
+            self.enable_position_store()
+
+    def enable_position_store(self) -> None:
+        """
+        Keep a columnar copy of the investments (PositionStore)
+
+        Worth it for large books: revaluations and chart inputs become array
+        operations. from_dict enables it from POSITION_STORE_MIN_POSITIONS
+        investments.
+        """
+        self.positions = PositionStore.from_investments(self.financial_investments, self.real_estate_investments)
+
+    def get_position_arrays(self, kind: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Per-position arrays for charts and tables (names, types, values, gain/loss...)
+
+        Read from the position store when it is enabled, built from the
+        investment objects otherwise.
+
+        Args:
+            kind: 'financial', 'real_estate' or None for all investments
+
+        Returns:
+            dict: See PositionStore.arrays
+        """
+        if self.positions is not None:
+            return self.positions.arrays(kind)
+        buckets = {
+            None: (self.financial_investments, self.real_estate_investments),
+            "financial": (self.financial_investments,),
+            "real_estate": (self.real_estate_investments,),
+        }[kind]
+        return position_arrays([investment for bucket in buckets for investment in bucket.values()])
+
+    def _total(self, bucket: str) -> float:
+        value = getattr(self.totals, bucket)
+        if self.debug_totals:
+            expected = {"full recompute": getattr(PortfolioTotals.compute(self), bucket)}
+            if self.positions is not None and bucket != "credits":
+                expected["position store"] = (self.positions.total_rental_income() if bucket == "rental_income"
+                                              else self.positions.total_value(bucket))
+            for source, total in expected.items():
+                if not math.isclose(value, total, rel_tol=1e-9, abs_tol=1e-6):
+                    raise AssertionError(f"Cached {bucket} total out of sync: {value!r} != {total!r} ({source})")
+        return value
+
     # === PORTFOLIO METRICS ===
     
     def get_financial_investments_value(self) -> float:
-        """Calculate total value of financial investments"""
-        return sum(inv.get_total_value() for inv in self.financial_investments.values())
+        """Total value of financial investments (running total)"""
+        return self._total("financial")
 
     def get_real_estate_investments_value(self) -> float:
-        """Calculate total value of real estate investments"""
-        return sum(inv.get_total_value() for inv in self.real_estate_investments.values())
+        """Total value of real estate investments (running total)"""
+        return self._total("real_estate")
 
     def get_total_investments_value(self) -> float:
         """Calculate total value of all investments"""
         return self.get_financial_investments_value() + self.get_real_estate_investments_value()
 
     def get_total_annual_rental_income(self) -> float:
-        """Calculate total annual rental income from real estate"""
-        return sum(inv.get_annual_rental_income() for inv in self.real_estate_investments.values())
+        """Total annual rental income from real estate (running total)"""
+        return self._total("rental_income")
     
     def get_total_credits_balance(self) -> float:
-        """Calculate total remaining balance on all credits"""
-        return sum(credit.get_remaining_balance() for credit in self.credits.values())
+        """Total remaining balance on all credits (running total)"""
+        return self._total("credits")
     
     def get_net_worth(self) -> float:
         """Calculate net worth (assets - liabilities)"""
         return self.cash + self.get_total_investments_value() - self.get_total_credits_balance()
     
     # === TRANSACTION LOGGING ===
-    
+
+    def append_transaction(self, transaction: Dict) -> None:
+        """Record a transaction and extend the materialized history with it"""
+        self.transaction_history.append(transaction)
+        self.history.sync(self.transaction_history)
+
+    def get_monthly_history(self):
+        """
+        Monthly value and invested capital (see PortfolioHistory.to_frame)
+
+        Catches up with transactions added outside append_transaction, or
+        rebuilds the history after a load.
+        """
+        self.history.sync(self.transaction_history)
+        return self.history.to_frame()
+
     def _log_transaction(self, transaction_type: str, amount: float, description: str) -> None:
         """Internal method to log transactions"""
-        self.transaction_history.append({
+        self.append_transaction({
             'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'type': transaction_type,
             'amount': amount,
@@ -283,17 +699,28 @@ class Portfolio:
                     'creation_date': credit.creation_date.isoformat()
                 } for name, credit in self.credits.items()
             },
-            'transaction_history': self.transaction_history
+            'transaction_history': self.transaction_history.to_list()
         }
     
     @classmethod
-    def from_dict(cls, data: Dict) -> 'Portfolio':
-        """Recreate portfolio from dictionary (deserialization)"""
+    def from_dict(cls, data: Dict, compact: bool = False) -> 'Portfolio':
+        """
+        Recreate portfolio from dictionary (deserialization)
+
+        Args:
+            data: Dictionary produced by to_dict
+            compact: Build the slotted position classes of models.compact
+                (smaller in memory, for loading many portfolios at once)
+        """
         portfolio = cls(data['cash'])
+        financial_cls, real_estate_cls, credit_cls = (
+            (CompactFinancialInvestment, CompactRealEstateInvestment, CompactCredit) if compact
+            else (FinancialInvestment, RealEstateInvestment, Credit)
+        )
 
         # Restore financial investments
         for name, inv_data in data.get('financial_investments', {}).items():
-            investment = FinancialInvestment(
+            investment = financial_cls(
                 inv_data['name'],
                 inv_data['initial_value'],
                 inv_data['current_value'],
@@ -306,7 +733,7 @@ class Portfolio:
 
         # Restore real estate investments
         for name, inv_data in data.get('real_estate_investments', {}).items():
-            investment = RealEstateInvestment(
+            investment = real_estate_cls(
                 inv_data['name'],
                 inv_data['initial_value'],
                 inv_data['current_value'],
@@ -320,7 +747,7 @@ class Portfolio:
 
         # Backward compatibility with old 'investments' format
         for name, inv_data in data.get('investments', {}).items():
-            investment = FinancialInvestment(
+            investment = financial_cls(
                 inv_data['name'],
                 inv_data['initial_value'],
                 inv_data['current_value'],
@@ -333,7 +760,7 @@ class Portfolio:
 
         # Restore credits
         for name, credit_data in data.get('credits', {}).items():
-            credit = Credit(
+            credit = credit_cls(
                 credit_data['name'],
                 credit_data['initial_amount'],
                 credit_data['interest_rate'],
@@ -343,7 +770,12 @@ class Portfolio:
             credit.creation_date = datetime.datetime.fromisoformat(credit_data['creation_date'])
             portfolio.credits[name] = credit
 
-        # Restore transaction history
+        portfolio.refresh_totals()
+        if len(portfolio.financial_investments) + len(portfolio.real_estate_investments) >= POSITION_STORE_MIN_POSITIONS:
+            portfolio.enable_position_store()
+
+        # Restore transaction history (wrapped in a TransactionLedger; the
+        # materialized history is rebuilt on first read)
         portfolio.transaction_history = data.get('transaction_history', [])
 
         return portfolio
\ No newline at end of file
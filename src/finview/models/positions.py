@@ -0,0 +1,279 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.finview.models.investments import RealEstateInvestment
+
+# Row kinds, in the order of the 'kind' codes
+KINDS = ("financial", "real_estate")
+
+
+def _kind_of(investment) -> int:
+    return 1 if _is_real_estate(investment) else 0
+
+
+# Per-class cache: isinstance() through ABCMeta is slow when it fails
+_REAL_ESTATE_CLASSES: Dict[type, bool] = {}
+
+
+def _is_real_estate(investment) -> bool:
+    cls = type(investment)
+    result = _REAL_ESTATE_CLASSES.get(cls)
+    if result is None:
+        result = _REAL_ESTATE_CLASSES[cls] = isinstance(investment, RealEstateInvestment)
+    return result
+
+
+class PositionStore:
+    """
+    Columnar copy of a portfolio's investments, one row per position
+
+    Quantities, unit values, rental yields and purchase dates are NumPy
+    arrays; kinds, types and locations are integer codes into category
+    lists. Totals, gain/loss vectors, bulk revaluation and chart inputs are
+    array operations over the active rows instead of Python loops over
+    objects.
+
+    The investment objects stay the reference: the portfolio copies a
+    position into its row every time it changes (Portfolio.updating), and
+    revalue() writes new prices back to the objects. Removed positions free
+    their row for the next one. rows_of() finds the rows of many positions
+    through a name index per kind, built on first use and kept until a
+    position enters or leaves the store.
+
+    Attributes:
+        types: Investment or property types, indexed by 'type' code
+        locations: Locations, indexed by 'location' code
+        objects: Investment object of each row (None for free rows)
+    """
+
+    _FLOAT_COLUMNS = ("quantity", "initial_value", "current_value", "rental_yield")
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(capacity, 1)
+        self.columns: Dict[str, np.ndarray] = {column: np.zeros(capacity) for column in self._FLOAT_COLUMNS}
+        self.columns["name"] = np.empty(capacity, dtype=object)
+        self.columns["purchase_date"] = np.zeros(capacity, dtype="datetime64[us]")
+        self.columns["kind"] = np.zeros(capacity, dtype=np.int8)
+        self.columns["type"] = np.zeros(capacity, dtype=np.int16)
+        self.columns["location"] = np.zeros(capacity, dtype=np.int16)
+        self.active = np.zeros(capacity, dtype=bool)
+
+        self.types: List[str] = []
+        self.locations: List[str] = []
+        self._codes: Dict[str, Dict[str, int]] = {"type": {}, "location": {}}
+        self.objects: List = [None] * capacity
+        self._rows: Dict[Tuple[int, str], int] = {}
+        self._name_index: Dict[str, Dict[str, int]] = {}
+        self._free: List[int] = []
+        self._size = 0
+
+    @classmethod
+    def from_investments(cls, financial_investments: Dict, real_estate_investments: Dict) -> 'PositionStore':
+        """Store holding the given investments"""
+        store = cls(len(financial_investments) + len(real_estate_investments))
+        for bucket in (financial_investments, real_estate_investments):
+            for investment in bucket.values():
+                store.put(investment)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # === ROWS ===
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            categories = self.types if column == "type" else self.locations
+            code = codes[value] = len(categories)
+            categories.append(value)
+        return code
+
+    def _grow(self) -> None:
+        capacity = 2 * self.active.size
+        self.columns = {column: np.resize(values, capacity) for column, values in self.columns.items()}
+        self.active = np.resize(self.active, capacity)
+        self.active[self._size:] = False
+        self.objects.extend([None] * (capacity - len(self.objects)))
+
+    def row(self, investment) -> Optional[int]:
+        """Row of an investment (None if it is not in the store)"""
+        row = self._rows.get((_kind_of(investment), investment.name))
+        if row is None or self.objects[row] is not investment:
+            return None
+        return row
+
+    def put(self, investment) -> int:
+        """Insert or refresh the row of an investment"""
+        key = (_kind_of(investment), investment.name)
+        row = self._rows.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == self.active.size:
+                    self._grow()
+                row = self._size
+                self._size += 1
+            self._rows[key] = row
+            self._name_index.clear()
+
+        columns = self.columns
+        columns["name"][row] = investment.name
+        columns["quantity"][row] = investment.quantity
+        columns["initial_value"][row] = investment.initial_value
+        columns["current_value"][row] = investment.current_value
+        columns["rental_yield"][row] = getattr(investment, "rental_yield", 0.0)
+        columns["purchase_date"][row] = investment.purchase_date
+        columns["kind"][row] = key[0]
+        if key[0] == 1:
+            columns["type"][row] = self._code("type", investment.property_type)
+        else:
+            columns["type"][row] = self._code("type", getattr(investment, "investment_type", ""))
+        columns["location"][row] = self._code("location", investment.location)
+        self.active[row] = True
+        self.objects[row] = investment
+        return row
+
+    def remove(self, investment) -> None:
+        """Free the row of an investment"""
+        row = self.row(investment)
+        if row is None:
+            return
+        del self._rows[(_kind_of(investment), investment.name)]
+        self._name_index.clear()
+        self.active[row] = False
+        self.objects[row] = None
+        self._free.append(row)
+
+    def rows(self, kind: Optional[str] = None) -> np.ndarray:
+        """Active rows in row order (a freed row is reused in place), optionally of one kind"""
+        mask = self.active[:self._size]
+        if kind is not None:
+            mask = mask & (self.columns["kind"][:self._size] == KINDS.index(kind))
+        return np.flatnonzero(mask)
+
+    def rows_of(self, investments: Sequence, kinds: Sequence[str]) -> np.ndarray:
+        """
+        Rows of many investments, like row() for each of them
+
+        Args:
+            investments: Investment objects
+            kinds: Kind of each investment ('financial' or 'real_estate')
+
+        Returns:
+            np.ndarray: Row of each investment, -1 if it is not in the store
+        """
+        for kind in KINDS:
+            if kind not in self._name_index:
+                code = KINDS.index(kind)
+                self._name_index[kind] = {name: row for (row_kind, name), row in self._rows.items() if row_kind == code}
+        index = self._name_index
+        count = len(investments)
+        found = np.fromiter((index[kind].get(investment.name, -1) for investment, kind in zip(investments, kinds)),
+                            dtype=np.intp, count=count)
+        stored = found >= 0
+        # An object replaced without going through the portfolio is not the stored one
+        objects = np.fromiter(self.objects, dtype=object, count=len(self.objects))
+        investments = np.fromiter(investments, dtype=object, count=count)
+        stored[stored] = objects[found[stored]] == investments[stored]
+        found[~stored] = -1
+        return found
+
+    # === ARRAY OPERATIONS ===
+
+    def values(self, rows: np.ndarray) -> np.ndarray:
+        """Total value (quantity × current unit value) of each row"""
+        return self.columns["quantity"][rows] * self.columns["current_value"][rows]
+
+    def gain_loss(self, rows: np.ndarray) -> np.ndarray:
+        """Absolute gain/loss of each row"""
+        columns = self.columns
+        return (columns["current_value"][rows] - columns["initial_value"][rows]) * columns["quantity"][rows]
+
+    def gain_loss_percentage(self, rows: np.ndarray) -> np.ndarray:
+        """Gain/loss in % of each row (0 when the initial value is 0)"""
+        initial = self.columns["initial_value"][rows]
+        current = self.columns["current_value"][rows]
+        return np.divide(current - initial, initial, out=np.zeros(rows.size), where=initial != 0) * 100
+
+    def total_value(self, kind: Optional[str] = None) -> float:
+        return float(self.values(self.rows(kind)).sum())
+
+    def total_rental_income(self) -> float:
+        rows = self.rows("real_estate")
+        return float((self.values(rows) * self.columns["rental_yield"][rows] / 100).sum())
+
+    def revalue(self, rows: np.ndarray, prices: np.ndarray) -> Tuple[float, float, float]:
+        """
+        Set the current unit value of many rows at once
+
+        The new values are written to the arrays, then to the investment
+        objects.
+
+        Returns:
+            tuple: Change of the financial value, the real estate value and
+            the annual rental income
+        """
+        columns = self.columns
+        change = (prices - columns["current_value"][rows]) * columns["quantity"][rows]
+        real_estate = columns["kind"][rows] == 1
+        changes = (
+            float(change[~real_estate].sum()),
+            float(change[real_estate].sum()),
+            float((change[real_estate] * columns["rental_yield"][rows][real_estate] / 100).sum()),
+        )
+        columns["current_value"][rows] = prices
+        for row, price in zip(rows.tolist(), prices.tolist()):
+            self.objects[row].current_value = price
+        return changes
+
+    def arrays(self, kind: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Chart inputs of the active rows (see Portfolio.get_position_arrays)
+
+        Returns:
+            dict: 'name', 'kind', 'type', 'location' (object arrays) and
+            'quantity', 'initial_value', 'current_value', 'value',
+            'gain_loss', 'gain_loss_percentage', 'rental_yield' (float64)
+        """
+        rows = self.rows(kind)
+        columns = self.columns
+        return {
+            "name": columns["name"][rows],
+            "kind": np.array(KINDS, dtype=object)[columns["kind"][rows]],
+            "type": np.array(self.types + [""], dtype=object)[columns["type"][rows]],
+            "location": np.array(self.locations + [""], dtype=object)[columns["location"][rows]],
+            "quantity": columns["quantity"][rows],
+            "initial_value": columns["initial_value"][rows],
+            "current_value": columns["current_value"][rows],
+            "value": self.values(rows),
+            "gain_loss": self.gain_loss(rows),
+            "gain_loss_percentage": self.gain_loss_percentage(rows),
+            "rental_yield": columns["rental_yield"][rows],
+        }
+
+
+def position_arrays(investments: List) -> Dict[str, np.ndarray]:
+    """Same arrays as PositionStore.arrays, built from investment objects"""
+    quantity = np.array([inv.quantity for inv in investments], dtype=float)
+    initial = np.array([inv.initial_value for inv in investments], dtype=float)
+    current = np.array([inv.current_value for inv in investments], dtype=float)
+    return {
+        "name": np.array([inv.name for inv in investments], dtype=object),
+        "kind": np.array([KINDS[_kind_of(inv)] for inv in investments], dtype=object),
+        "type": np.array([
+            inv.property_type if _is_real_estate(inv) else getattr(inv, "investment_type", "")
+            for inv in investments
+        ], dtype=object),
+        "location": np.array([inv.location for inv in investments], dtype=object),
+        "quantity": quantity,
+        "initial_value": initial,
+        "current_value": current,
+        "value": quantity * current,
+        "gain_loss": (current - initial) * quantity,
+        "gain_loss_percentage": np.divide(current - initial, initial, out=np.zeros(initial.size), where=initial != 0) * 100,
+        "rental_yield": np.array([getattr(inv, "rental_yield", 0.0) for inv in investments], dtype=float),
+    }
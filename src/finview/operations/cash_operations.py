@@ -28,7 +28,7 @@ def add_cash(portfolio, amount: float, date: Optional[datetime] = None, descript
         date = datetime.now()
     
     portfolio.cash += amount
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'CASH_ADD',
         'amount': amount,
@@ -64,7 +64,7 @@ def withdraw_cash(portfolio, amount: float, date: Optional[datetime] = None, des
         date = datetime.now()
     
     portfolio.cash -= amount
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'CASH_WITHDRAW',
         'amount': amount,
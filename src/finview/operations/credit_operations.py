@@ -58,14 +58,15 @@ def add_credit(
     )
     credit.creation_date = date
     
-    # Enregistrement dans le portfolio
-    portfolio.credits[name] = credit
+    # Enregistrement dans le portfolio (et dans ses totaux)
+    with portfolio.updating(credit):
+        portfolio.credits[name] = credit
     
     # Ajout du cash emprunté
     portfolio.cash += amount
     
     # Enregistrement dans l'historique
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'CREDIT_ADD',
         'amount': amount,
@@ -125,15 +126,14 @@ def pay_credit(
     # Déduction du cash
     portfolio.cash -= amount
     
-    # Enregistrement du paiement
-    credit.make_payment(amount)
-    
-    # Si le crédit est soldé, le supprimer
-    if credit.current_balance <= 0:
-        del portfolio.credits[name]
+    # Enregistrement du paiement ; si le crédit est soldé, le supprimer
+    with portfolio.updating(credit):
+        credit.make_payment(amount)
+        if credit.current_balance <= 0:
+            del portfolio.credits[name]
     
     # Enregistrement dans l'historique
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'CREDIT_PAYMENT',
         'amount': amount,
@@ -70,11 +70,12 @@ def add_financial_investment(
     )
     investment.purchase_date = date
     
-    # Enregistrement dans le portfolio
-    portfolio.financial_investments[name] = investment
+    # Enregistrement dans le portfolio (et dans ses totaux)
+    with portfolio.updating(investment):
+        portfolio.financial_investments[name] = investment
     
     # Enregistrement dans l'historique
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'FINANCIAL_INVESTMENT_BUY',
         'amount': total_cost,
@@ -160,11 +161,12 @@ def add_real_estate_investment(
     )
     investment.purchase_date = date
     
-    # Enregistrement dans le portfolio
-    portfolio.real_estate_investments[name] = investment
+    # Enregistrement dans le portfolio (et dans ses totaux)
+    with portfolio.updating(investment):
+        portfolio.real_estate_investments[name] = investment
     
     # Enregistrement dans l'historique
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'REAL_ESTATE_INVESTMENT_BUY',
         'amount': total_cost,
@@ -223,10 +225,11 @@ def update_investment_value(
     old_value = investment.current_value
     
     # Mise à jour de la valeur
-    investment.update_value(new_value)
+    with portfolio.updating(investment):
+        investment.update_value(new_value)
     
     # Enregistrement dans l'historique
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'INVESTMENT_UPDATE',
         'amount': new_value,
@@ -293,15 +296,14 @@ def sell_investment(
     # Ajout du cash
     portfolio.cash += sale_value
     
-    # Mise à jour de la quantité
-    investment.quantity -= quantity
-    
-    # Si quantité = 0, supprimer l'investissement
-    if investment.quantity == 0:
-        del investment_dict[name]
+    # Mise à jour de la quantité ; si quantité = 0, supprimer l'investissement
+    with portfolio.updating(investment):
+        investment.quantity -= quantity
+        if investment.quantity == 0:
+            del investment_dict[name]
     
     # Enregistrement dans l'historique
-    portfolio.transaction_history.append({
+    portfolio.append_transaction({
         'date': date.strftime('%Y-%m-%d %H:%M:%S'),
         'type': 'INVESTMENT_SELL',
         'amount': sale_value,
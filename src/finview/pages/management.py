@@ -196,10 +196,35 @@ def _update_investment(portfolio):
             save_portfolio(portfolio)
             st.success(f"Value of '{inv_to_update}' updated!")
             st.rerun()
+
+        st.markdown("#### Update all values")
+        if st.button("🔄 Update all prices from Yahoo Finance", key="update_all_prices"):
+            prices = _fetch_last_prices(list(portfolio.investments.keys()))
+            updated = portfolio.apply_price_snapshot(prices)
+            if updated:
+                save_portfolio(portfolio)
+                st.success(f"{updated} investment(s) updated!")
+                st.rerun()
+            else:
+                st.warning("⚠️ No new price found. Investments must be named after their Yahoo Finance ticker.")
     else:
         st.info("No investments to update")
 
 
+def _fetch_last_prices(tickers):
+    """Dernier cours de clôture de chaque ticker, en un seul téléchargement"""
+    try:
+        closes = yf.download(tickers, period="5d", progress=False)["Close"]
+    except Exception:
+        return {}
+    if closes.empty:
+        return {}
+    if closes.ndim == 1:
+        closes = closes.to_frame(tickers[0])
+    last = closes.ffill().iloc[-1]
+    return {ticker: float(price) for ticker, price in last.items() if price > 0}
+
+
 def _sell_investment(portfolio):
     """Sell investments"""
     st.markdown("#### Sell investments")
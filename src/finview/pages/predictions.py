@@ -2,8 +2,6 @@
 Predictions page - Monte Carlo simulations for portfolio forecasting
 """
 
-import time
-
 import pandas as pd
 import streamlit as st
 
@@ -12,9 +10,16 @@ from src.finview.predictions import (
     simulate_portfolio_future,
     create_prediction_chart,
     create_statistics_summary,
+    probability_below,
 )
 
 
+# Mode "Auto" : précision cible sur les percentiles finaux
+AUTO_TOLERANCE = 0.01
+AUTO_MAX_SIMULATIONS = 100_000
+AUTO_TIME_BUDGET = 10.0
+
+
 def show_predictions(portfolio):
     """Page de prédictions patrimoniales"""
     st.header("🔮 Wealth Predictions")
@@ -28,7 +33,12 @@ def show_predictions(portfolio):
     with col1:
         years = st.selectbox("Prediction horizon", options=[1, 5, 10, 20, 30], index=2)
     with col2:
-        num_simulations = st.selectbox("Number of simulations", options=[100, 500, 1000, 2000], index=2)
+        num_simulations = st.selectbox(
+            "Number of simulations",
+            options=[100, 500, 1000, 2000, "Auto"],
+            index=2,
+            help="Auto runs batches until the final P10/P50/P90 are known to ±1% (95% confidence)"
+        )
 
     # Options avancées
     with st.expander("⚙️ Advanced Options"):
@@ -36,6 +46,10 @@ def show_predictions(portfolio):
                                         help="Adjust values for purchasing power")
         include_fees = st.checkbox("Include management fees", value=True,
                                    help="Annual fees: 0.3% ETF, 1% SCPI, etc.")
+        correlated = st.checkbox("Correlated asset returns", value=False,
+                                 help="Draw returns with category-level correlations instead of independently")
+        seed = st.number_input("Random seed", min_value=0, value=42, step=1,
+                               help="Same seed and settings give exactly the same projection")
         st.info("""
         **Realistic Simulation includes:**
         - 🔻 Market crashes (~12% probability/year, -20% to -50%)
@@ -45,31 +59,50 @@ def show_predictions(portfolio):
         - 📊 Asset correlation during crises
         """)
 
-    # Bouton de lancement
-    run_prediction = st.button("🚀 Run Prediction", type="primary", use_container_width=True)
+    # Boutons de lancement / annulation
+    col_run, col_cancel = st.columns([4, 1])
+    with col_run:
+        run_prediction = st.button("🚀 Run Prediction", type="primary", use_container_width=True)
+    with col_cancel:
+        # Un clic relance le script : Streamlit interrompt l'exécution en cours
+        # au prochain appel d'un élément (rafraîchissement de la barre de
+        # progression). Les résultats précédents restent affichés.
+        st.button("✖ Cancel", use_container_width=True,
+                  help="Interrupts the running simulation; previous results are kept")
 
     if run_prediction:
-        progress_text = "Running Monte Carlo simulations..."
-        my_bar = st.progress(0, text=progress_text)
-
-        for percent_complete in range(100):
-            my_bar.progress(percent_complete + 1)
-            time.sleep(0.04)
+        adaptive = num_simulations == "Auto"
+        scenarios_text = "scenarios until convergence" if adaptive else f"{num_simulations:,} scenarios"
+        my_bar = st.progress(0.0, text=f"Analyzing {scenarios_text} over {years} years...")
+
+        def update_progress(event):
+            median = event['percentiles']['p50'][-1]
+            my_bar.progress(
+                min(event['progress'], 1.0),
+                text=f"{event['completed']:,} scenarios simulated - "
+                     f"median after {years} years: {format_currency(median)}"
+            )
 
+        prediction_results = simulate_portfolio_future(
+            portfolio,
+            years=years,
+            num_simulations=AUTO_MAX_SIMULATIONS if adaptive else num_simulations,
+            tolerance=AUTO_TOLERANCE if adaptive else None,
+            time_budget=AUTO_TIME_BUDGET if adaptive else None,
+            include_inflation=include_inflation,
+            include_fees=include_fees,
+            seed=int(seed),
+            correlated=correlated,
+            progress_callback=update_progress
+        )
+        st.session_state.prediction_results = prediction_results
+        st.session_state.prediction_years = years
         my_bar.empty()
 
-        with st.spinner(f"Analyzing {num_simulations} scenarios over {years} years..."):
-            prediction_results = simulate_portfolio_future(
-                portfolio,
-                years=years,
-                num_simulations=num_simulations,
-                include_inflation=include_inflation,
-                include_fees=include_fees
-            )
-            st.session_state.prediction_results = prediction_results
-            st.session_state.prediction_years = years
-
-        st.success("✅ Prediction completed successfully!")
+        st.success(
+            f"✅ Prediction completed successfully! "
+            f"({prediction_results['num_simulations_used']:,} simulations)"
+        )
 
     # Affichage des résultats
     if 'prediction_results' in st.session_state:
@@ -255,11 +288,9 @@ def _show_key_metrics(stats, results):
     st.markdown("##### ⚠️ Risk Analysis")
 
     # Calculer probabilité de perte
-    simulations = results['simulations']
-    final_values = simulations[:, -1]
-    prob_loss = (final_values < stats['initial']).sum() / len(final_values) * 100
-    prob_major_loss = (final_values < stats['initial'] * 0.8).sum() / len(final_values) * 100
-    prob_double = (final_values > stats['initial'] * 2).sum() / len(final_values) * 100
+    prob_loss = probability_below(results, stats['initial']) * 100
+    prob_major_loss = probability_below(results, stats['initial'] * 0.8) * 100
+    prob_double = (1 - probability_below(results, stats['initial'] * 2)) * 100
 
     risk_col1, risk_col2, risk_col3 = st.columns(3)
 
@@ -7,6 +7,7 @@ import streamlit as st
 
 from src.finview.ui.formatting import format_currency, format_percentage
 from src.finview.charts import create_monthly_transactions_chart
+from src.finview.models import as_ledger
 
 
 def show_summary(portfolio):
@@ -137,8 +138,8 @@ def _show_transaction_history(portfolio):
         st.markdown("💡 **Tip**: Use the 'Create demo portfolio' button in the sidebar to see a full history example!")
         return
 
-    df_history = pd.DataFrame(portfolio.transaction_history)
-    df_history = df_history.sort_values('date', ascending=False)
+    # Trié par l'index de dates du ledger, dates déjà converties
+    df_history = as_ledger(portfolio.transaction_history).to_frame(descending=True)
 
     # Adding history metrics
     st.subheader("📊 Activity Summary")
@@ -161,7 +162,7 @@ def _show_transaction_history(portfolio):
         st.metric("Credit payments", f"{format_currency(credit_payments)}")
 
     # Chart of transaction evolution by month
-    df_history['month'] = pd.to_datetime(df_history['date']).dt.to_period('M').astype(str)
+    df_history['month'] = df_history['date'].dt.to_period('M').astype(str)
     monthly_transactions = df_history.groupby(['month', 'type']).size().reset_index(name='count')
 
     if len(monthly_transactions) > 0:
@@ -210,13 +211,13 @@ def _show_transaction_history(portfolio):
     if type_filter != "All":
         filtered_df = filtered_df[filtered_df['type'] == type_filter]
     if date_filter:
-        filtered_df = filtered_df[pd.to_datetime(filtered_df['date']).dt.date >= date_filter]
+        filtered_df = filtered_df[filtered_df['date'].dt.date >= date_filter]
 
     # Improved table display
     display_df = filtered_df.copy()
     display_df['Type'] = display_df['type'].map(mapping_type_dictionnary).fillna(display_df['type'])
     display_df['Amount'] = display_df['amount'].apply(lambda x: f"{x:.2f}€" if x > 0 else "")
-    display_df['Date'] = pd.to_datetime(display_df['date']).dt.strftime('%d/%m/%Y %H:%M')
+    display_df['Date'] = display_df['date'].dt.strftime('%d/%m/%Y %H:%M')
 
     # Display table
     st.subheader(f"📋 Transactions ({len(filtered_df)} results)")
@@ -243,7 +244,7 @@ def _show_transaction_history(portfolio):
         st.subheader("🕒 Major Events Timeline")
         major_events = df_history[df_history['type'].isin(['INVESTMENT_BUY', 'CREDIT_ADD', 'INVESTMENT_SELL'])].head(10)
         for _, event in major_events.iterrows():
-            event_date = pd.to_datetime(event['date']).strftime('%d/%m/%Y')
+            event_date = event['date'].strftime('%d/%m/%Y')
             if event['type'] == 'INVESTMENT_BUY':
                 st.write(f"📈 **{event_date}**: {event['description']} ({format_currency(event['amount'])})")
             elif event['type'] == 'CREDIT_ADD':
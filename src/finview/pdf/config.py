@@ -80,6 +80,11 @@ IMAGE_DASHBOARD_PERF = {'x': 10, 'y': None, 'w': 150, 'h': 100}
 IMAGE_ALLOCATION_PIE = {'x': 5, 'y': None, 'w': 200, 'h': 220}
 IMAGE_PREDICTION = {'x': 10, 'y': None, 'w': 190, 'h': None}
 
+# Monte Carlo predictions (fixed seed so that two reports of the same portfolio agree)
+PREDICTION_YEARS = 10
+PREDICTION_SIMULATIONS = 1000
+PREDICTION_SEED = 42
+
 # Diversification thresholds
 DIVERSIFICATION_HIGH = 8
 DIVERSIFICATION_MEDIUM = 5
@@ -17,6 +17,8 @@ from .config import (
     # Image dimensions in PDF
     IMAGE_DASHBOARD_PIE, IMAGE_DASHBOARD_PERF, IMAGE_ALLOCATION_PIE,
     IMAGE_PREDICTION,
+    # Predictions
+    PREDICTION_YEARS, PREDICTION_SIMULATIONS, PREDICTION_SEED,
     # Authors
     AUTHORS
 )
@@ -27,6 +29,7 @@ from .components import (
 )
 from src.finview.predictions import simulate_portfolio_future, create_prediction_chart, create_statistics_summary
 from src.finview.charts import create_portfolio_pie_chart, create_performance_chart_filtered
+from src.finview.models import as_ledger
 
 
 def add_cover_page(pdf, logo_path):
@@ -198,9 +201,9 @@ def add_performance_analysis_page(pdf, portfolio, logo_path):
         ]
         create_table_header(pdf, columns)
         
-        # Transaction content (last 10 transactions)
+        # Transaction content (10 most recent transactions, from the ledger's date index)
         pdf.set_font("Arial", '', FONT_SIZE_TABLE_SMALL)
-        last_transactions = portfolio.transaction_history[-10:]
+        last_transactions = as_ledger(portfolio.transaction_history).latest(10)
         for transaction in last_transactions:
             description = sanitize_text(transaction['description'], 50)
             pdf.cell(TABLE_TRANSACTION_WIDTHS['date'], 8, transaction['date'], border=1)
@@ -336,7 +339,7 @@ def add_details_page(pdf, portfolio, logo_path):
     create_table_header(pdf, columns)
     
     # Calculate total portfolio value
-    total_portfolio = sum(inv.get_total_value() for inv in portfolio.investments.values())
+    total_portfolio = portfolio.get_total_investments_value()
     
     # Table content
     pdf.set_font("Arial", '', FONT_SIZE_TABLE_CONTENT)
@@ -373,7 +376,12 @@ def add_predictions_page(pdf, portfolio, logo_path):
         return
     
     try:
-        prediction_results = simulate_portfolio_future(portfolio, years=10, num_simulations=1000)
+        prediction_results = simulate_portfolio_future(
+            portfolio,
+            years=PREDICTION_YEARS,
+            num_simulations=PREDICTION_SIMULATIONS,
+            seed=PREDICTION_SEED
+        )
         stats = create_statistics_summary(prediction_results)
         
         # Prediction chart
@@ -385,7 +393,7 @@ def add_predictions_page(pdf, portfolio, logo_path):
         # Key statistics
         pdf.set_font("Arial", 'B', FONT_SIZE_SECTION_SUBTITLE)
         pdf.set_text_color(*TEXT_COLOR)
-        pdf.cell(0, 8, "10-year forecast scenarios", ln=True)
+        pdf.cell(0, 8, f"{PREDICTION_YEARS}-year forecast scenarios", ln=True)
         pdf.ln(3)
         
         # Scenarios table header
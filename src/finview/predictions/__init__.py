@@ -9,16 +9,49 @@ en utilisant des simulations Monte Carlo réalistes incluant :
 - Rendements historiques conservateurs
 """
 
-from .monte_carlo import simulate_portfolio_future, create_statistics_summary
+from .monte_carlo import (
+    simulate_portfolio_future,
+    iter_portfolio_simulation,
+    SimulationCancelled,
+    create_statistics_summary,
+    probability_below,
+)
+from .monthly import (
+    simulate_portfolio_monthly,
+    cash_flow_schedule,
+    credit_amortization_schedule,
+    credit_payment_schedule,
+)
+from .sweep import sweep_portfolio_scenarios
+from .bootstrap import simulate_portfolio_bootstrap
+from .regimes import RegimeModel
 from .visualization_prediction import create_prediction_chart
 from .utils import get_asset_return_params, get_asset_category
+from .classification import classify_asset, classify_many, clear_classification_cache
+from .cache import SimulationCache, get_simulation_cache, configure_simulation_cache
 
 __all__ = [
     "simulate_portfolio_future",
+    "iter_portfolio_simulation",
+    "SimulationCancelled",
     "create_statistics_summary",
+    "simulate_portfolio_monthly",
+    "cash_flow_schedule",
+    "credit_amortization_schedule",
+    "credit_payment_schedule",
+    "sweep_portfolio_scenarios",
+    "simulate_portfolio_bootstrap",
+    "RegimeModel",
+    "probability_below",
     "create_prediction_chart",
     "get_asset_return_params",
     "get_asset_category",
+    "classify_asset",
+    "classify_many",
+    "clear_classification_cache",
+    "SimulationCache",
+    "get_simulation_cache",
+    "configure_simulation_cache",
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,242 @@
+"""
+Moteur Monte Carlo par bootstrap de rendements historiques
+
+Au lieu des lois paramétriques de HISTORICAL_RETURNS, chaque trajectoire
+rejoue des blocs de mois consécutifs tirés dans l'historique réel des
+tickers (block bootstrap). Les mêmes mois sont tirés pour tous les actifs
+d'une trajectoire, dans l'historique complet de chaque ticker : corrélations,
+queues épaisses et krachs historiques sont conservés tels quels, et un
+ticker récent (BTC-USD) ne tronque pas l'historique des autres.
+
+Les rendements mensuels viennent du stock de prix local
+(market/price_store.py), lus en mmap : un tirage se résume à des indices
+de mois (trajectoires × mois) appliqués au tableau de chaque ticker.
+Les actifs sans historique (SCPI, obligations, liquidités...) suivent leurs
+paramètres de config.py au pas mensuel, sans choc de crise.
+"""
+import numpy as np
+
+from .config import BOOTSTRAP_PARAMS
+from .monte_carlo import (
+    _collect_composition,
+    _compute_percentiles,
+    _cumulative_inflation,
+    _remaining_debt_schedule,
+)
+from .monthly import MONTHS_PER_YEAR, _monthly_asset_arrays
+from .rng import make_seed_sequence, make_generator
+
+
+def valid_block_starts(span, block_size):
+    """
+    Débuts de bloc utilisables par chaque ticker
+
+    Args:
+        span: Rendements (n_tickers, n_mois), NaN hors historique (MonthlyReturns.span)
+        block_size: Mois consécutifs par bloc
+
+    Returns:
+        np.ndarray: Booléens (n_tickers, n_mois - block_size + 1), vrais quand
+            les block_size mois à partir de ce début ont tous un rendement
+    """
+    if block_size <= 0:
+        raise ValueError(f"La taille de bloc doit être positive, reçue: {block_size}")
+    counts = np.zeros((span.shape[0], span.shape[1] + 1), dtype=np.int64)
+    np.cumsum(np.isfinite(span), axis=1, out=counts[:, 1:])
+    return counts[:, block_size:] - counts[:, :-block_size] == block_size
+
+
+def block_bootstrap_starts(rng, num_paths, months, valid, block_size):
+    """
+    Début du bloc historique de chaque trajectoire, pour chaque ticker
+
+    Un tirage commun est fait sur l'union des historiques : chaque ticker
+    rejoue son historique complet et garde ses co-mouvements avec les autres
+    sur les mois qu'ils partagent. Seuls les blocs tirés hors de l'historique
+    d'un ticker sont remplacés par un second tirage commun, limité aux
+    débuts valides pour tous les tickers (leur recouvrement).
+
+    Args:
+        rng: Générateur NumPy
+        num_paths: Nombre de trajectoires
+        months: Mois à simuler
+        valid: Débuts utilisables par ticker (voir valid_block_starts)
+        block_size: Mois consécutifs par bloc
+
+    Returns:
+        np.ndarray: Débuts (n_tickers, num_paths, n_blocs), le mois i d'une
+            trajectoire est starts[..., i // block_size] + i % block_size
+    """
+    n_blocks = -(-months // block_size)
+    candidates = np.flatnonzero(valid.any(axis=0)).astype(np.int32)
+    starts = candidates[rng.integers(0, len(candidates), size=(num_paths, n_blocks))]
+    outside = ~valid[:, starts]                                      # (tickers, n, blocs)
+    if not outside.any():
+        return np.broadcast_to(starts, (len(valid),) + starts.shape)
+
+    overlap = np.flatnonzero(valid.all(axis=0)).astype(np.int32)
+    fallback = overlap[rng.integers(0, len(overlap), size=(num_paths, n_blocks))]
+    return np.where(outside, fallback, starts)
+
+
+def resolve_tickers(portfolio_composition, history, tickers=None):
+    """
+    Ticker historique de chaque actif (ou None s'il n'y en a pas)
+
+    Priorité : ticker explicite, nom de l'actif s'il est lui-même un ticker
+    du stock, ticker de référence d'un mot-clé du nom
+    (BOOTSTRAP_PARAMS['name_proxies']), puis de sa catégorie
+    (BOOTSTRAP_PARAMS['category_proxies']). L'immobilier détenu en direct
+    n'a que son ticker explicite : sa catégorie vient de mots-clés et ne
+    décrit pas son marché.
+
+    Returns:
+        list: Ticker (ou None) aligné sur la composition
+    """
+    tickers = tickers or {}
+    name_proxies = BOOTSTRAP_PARAMS['name_proxies']
+    category_proxies = BOOTSTRAP_PARAMS['category_proxies']
+    resolved = []
+    for asset in portfolio_composition:
+        candidates = [tickers.get(asset['name'])]
+        if not asset.get('real_estate', False):
+            name = asset['name'].lower()
+            candidates.append(asset['name'])
+            candidates.extend(ticker for keyword, ticker in name_proxies.items() if keyword in name)
+            candidates.append(category_proxies.get(asset['category']))
+        resolved.append(next((c for c in candidates if c is not None and c in history), None))
+    return resolved
+
+
+def simulate_portfolio_bootstrap(portfolio, history, years=10, num_simulations=1000,
+                                 include_inflation=True, include_fees=True, block_size=None,
+                                 tickers=None, seed=None):
+    """
+    Simule l'évolution du portefeuille en rejouant des rendements historiques
+
+    Args:
+        portfolio: Objet Portfolio à simuler
+        history: market.price_store.MonthlyReturns (voir load_monthly_returns)
+        years: Nombre d'années de projection
+        num_simulations: Nombre de simulations Monte Carlo
+        include_inflation: Ajuster pour l'inflation
+        include_fees: Inclure les frais de gestion
+        block_size: Mois consécutifs par bloc (BOOTSTRAP_PARAMS['block_size'] par défaut)
+        tickers: Dict optionnel {nom de l'actif: ticker}
+        seed: Graine pour des résultats reproductibles
+
+    Returns:
+        dict: Même structure que simulate_portfolio_future(keep_paths=True),
+            plus 'bootstrap' (ticker de chaque actif, taille de bloc et mois
+            d'historique de chaque ticker)
+
+    Raises:
+        ValueError: Si l'historique d'un ticker, ou leur recouvrement quand
+            leurs historiques diffèrent, compte moins de
+            BOOTSTRAP_PARAMS['min_blocks'] blocs disjoints
+    """
+    if years <= 0:
+        raise ValueError(f"L'horizon doit être positif, reçu: {years}")
+    if block_size is None:
+        block_size = BOOTSTRAP_PARAMS['block_size']
+    min_blocks = BOOTSTRAP_PARAMS['min_blocks']
+
+    portfolio_composition = _collect_composition(portfolio)
+    assets = _monthly_asset_arrays(portfolio, portfolio_composition)
+    total_debt = portfolio.get_total_credits_balance() if hasattr(portfolio, 'get_total_credits_balance') else 0
+    initial_value = assets['values'].sum() - total_debt
+
+    asset_tickers = resolve_tickers(portfolio_composition, history, tickers)
+    historical = np.array([ticker is not None for ticker in asset_tickers], dtype=bool)
+    used = sorted({ticker for ticker in asset_tickers if ticker is not None})
+
+    seed_sequence = make_seed_sequence(seed)
+    rng = make_generator(seed_sequence)
+    months = years * MONTHS_PER_YEAR
+    n_assets = len(portfolio_composition)
+    fees = assets['monthly_fees'] if include_fees else np.zeros(n_assets)
+
+    # Historique complet de chaque ticker utilisé, sur l'union de leurs mois
+    history_months = {}
+    if used:
+        span = history.span(used)
+        if span.shape[1] < block_size:
+            raise ValueError(
+                f"Historique insuffisant: {span.shape[1]} mois disponibles pour des blocs de {block_size} mois"
+            )
+        valid = valid_block_starts(span, block_size)
+        history_months = dict(zip(used, np.isfinite(span).sum(axis=1).tolist()))
+        short = {ticker: n for ticker, n in history_months.items() if n // block_size < min_blocks}
+        if not short and not valid.all(axis=0)[valid.any(axis=0)].all():
+            # Historiques de longueurs différentes : le recouvrement sert aux blocs manquants
+            common = int(np.isfinite(span).all(axis=0).sum())
+            if common // block_size < min_blocks:
+                short = {f"recouvrement de {', '.join(used)}": common}
+        if short:
+            detail = ', '.join(f"{ticker} ({n} mois)" for ticker, n in short.items())
+            raise ValueError(
+                f"Historique trop court pour le bootstrap: {detail}, moins de {min_blocks} blocs "
+                f"de {block_size} mois. Réimporter un historique plus long "
+                f"(PriceStore.import_from_yfinance) ou réduire block_size."
+            )
+        asset_rows = np.array([used.index(ticker) for ticker in asset_tickers if ticker is not None])
+        asset_starts = block_bootstrap_starts(rng, num_simulations, months, valid, block_size)[asset_rows]
+        block_of, within = np.divmod(np.arange(months, dtype=np.int32), block_size)
+
+    growth = np.empty((num_simulations, years, n_assets))
+    parametric = ~historical
+    for year in range(years):
+        window = slice(year * MONTHS_PER_YEAR, (year + 1) * MONTHS_PER_YEAR)
+
+        # 1. Actifs historiques : mois tirés dans l'historique de leur ticker
+        if used:
+            month_index = asset_starts[:, :, block_of[window]] + within[window]
+            returns = span[asset_rows[:, None, None], month_index]      # (actifs, n, 12)
+            returns -= fees[historical, None, None]
+            np.maximum(returns, -0.95, out=returns)
+            returns += 1
+            growth[:, year, historical] = returns.prod(axis=2).T
+
+        # 2. Autres actifs : paramètres de config.py au pas mensuel
+        if parametric.any():
+            z = rng.standard_normal((num_simulations, MONTHS_PER_YEAR, int(parametric.sum())))
+            returns = np.where(
+                assets['lognormal'][parametric],
+                np.expm1(assets['monthly_log_means'][parametric] + assets['monthly_stds'][parametric] * z),
+                assets['monthly_means'][parametric] + assets['monthly_stds'][parametric] * z
+            )
+            returns -= fees[parametric]
+            np.maximum(returns, -0.95, out=returns)
+            returns += 1
+            growth[:, year, parametric] = returns.prod(axis=1)
+
+    np.cumprod(growth, axis=1, out=growth)
+    totals = growth @ assets['values']
+
+    remaining_debt = _remaining_debt_schedule(total_debt, years)
+    simulations_nominal = np.empty((num_simulations, years + 1))
+    simulations_nominal[:, 0] = initial_value
+    simulations_nominal[:, 1:] = totals - remaining_debt[1:]
+
+    simulations = simulations_nominal.copy()
+    if include_inflation:
+        simulations[:, 1:] /= _cumulative_inflation({'inflation': rng.standard_normal((num_simulations, years))})
+
+    return {
+        'simulations': simulations,
+        'simulations_nominal': simulations_nominal,
+        'percentiles': _compute_percentiles(simulations),
+        'percentiles_nominal': _compute_percentiles(simulations_nominal),
+        'initial_value': initial_value,
+        'years': years,
+        'composition': portfolio_composition,
+        'include_inflation': include_inflation,
+        'include_fees': include_fees,
+        'bootstrap': {
+            'tickers': {asset['name']: ticker for asset, ticker in zip(portfolio_composition, asset_tickers)},
+            'block_size': block_size,
+            'history_months': history_months,
+        },
+        'seed': seed_sequence.entropy,
+        'num_simulations_used': num_simulations,
+    }
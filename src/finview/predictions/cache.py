@@ -0,0 +1,303 @@
+"""
+Cache des résultats de simulation Monte Carlo
+
+Les résultats sont indexés par une empreinte stable (SHA-256) de la
+composition du portefeuille, des paramètres de simulation, des tables de
+configuration (HISTORICAL_RETURNS, CRISIS_PARAMS, REGIME_PARAMS,
+INFLATION_PARAMS, ANNUAL_FEES, ...) et de la graine. Deux niveaux :
+- un LRU en mémoire, partagé par toutes les sessions du processus
+  (page Predictions, génération PDF), borné en nombre d'entrées et en
+  octets (un résultat plus gros que la borne, ex: keep_paths=True avec
+  beaucoup de trajectoires, ne va que sur disque) ;
+- un niveau disque optionnel (.npz) partagé entre processus et redémarrages,
+  avec éviction des entrées les moins récemment utilisées au-delà d'une
+  taille maximale.
+
+Seules les simulations déterministes (graine entière, pas de budget de temps)
+sont mises en cache. Le cache garde et renvoie des copies profondes : un
+appelant qui modifie ses résultats n'altère ni le cache ni les autres appelants.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from . import config
+from .streaming import StreamingPercentiles
+
+logger = logging.getLogger(__name__)
+
+# Tables dont dépendent les résultats : toute modification invalide le cache
+_CONFIG_TABLES = (
+    'HISTORICAL_RETURNS', 'DEFAULT_RETURN_PARAMS', 'CATEGORY_KEYWORDS', 'DEFAULT_CATEGORY',
+    'CRISIS_PARAMS', 'REGIME_PARAMS', 'INFLATION_PARAMS', 'ANNUAL_FEES',
+    'SIMULATION_PARAMS', 'ASSET_CATEGORIES', 'CATEGORY_CORRELATIONS', 'INTRA_CATEGORY_CORRELATION',
+    'CONVERGENCE_PARAMS', 'BOOTSTRAP_PARAMS',
+)
+
+
+def _canonical(value):
+    """Convertit une valeur en structure JSON déterministe"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _canonical(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float):
+        return repr(value)
+    return value
+
+
+def simulation_cache_key(portfolio_composition, total_debt, parameters):
+    """
+    Empreinte stable d'une demande de simulation
+
+    Args:
+        portfolio_composition: Composition collectée du portefeuille
+        total_debt: Dette totale
+        parameters: Paramètres de simulation influant sur le résultat (graine comprise)
+
+    Returns:
+        str: Empreinte hexadécimale SHA-256
+    """
+    payload = {
+        'composition': [
+            {key: asset[key] for key in ('name', 'value', 'type', 'category', 'params')}
+            for asset in portfolio_composition
+        ],
+        'total_debt': total_debt,
+        'parameters': parameters,
+        'config': {name: getattr(config, name, None) for name in _CONFIG_TABLES},
+    }
+    encoded = json.dumps(_canonical(payload), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+# === SÉRIALISATION .npz ===
+
+def _flatten(value, path, arrays):
+    """Remplace les tableaux et sketches par des références vers `arrays`"""
+    if isinstance(value, StreamingPercentiles):
+        for name, array in value.to_arrays().items():
+            arrays[f'{path}.{name}'] = array
+        return {'__sketch__': path}
+    if isinstance(value, np.ndarray):
+        arrays[path] = value
+        return {'__array__': path}
+    if isinstance(value, dict):
+        return {k: _flatten(v, f'{path}.{k}', arrays) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_flatten(v, f'{path}.{i}', arrays) for i, v in enumerate(value)]}
+    if isinstance(value, list):
+        return [_flatten(v, f'{path}.{i}', arrays) for i, v in enumerate(value)]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _unflatten(value, arrays):
+    """Opération inverse de _flatten"""
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[value['__array__']]
+        if '__sketch__' in value:
+            prefix = value['__sketch__'] + '.'
+            return StreamingPercentiles.from_arrays(
+                {k[len(prefix):]: arrays[k] for k in arrays.files if k.startswith(prefix)}
+            )
+        if '__tuple__' in value:
+            return tuple(_unflatten(v, arrays) for v in value['__tuple__'])
+        return {k: _unflatten(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unflatten(v, arrays) for v in value]
+    return value
+
+
+def _nbytes(value):
+    """Taille des tableaux (et sketches) contenus dans des résultats"""
+    if isinstance(value, StreamingPercentiles):
+        return sum(array.nbytes for array in value.to_arrays().values())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def save_results_npz(results, path):
+    """
+    Enregistre un dict de résultats dans un fichier .npz
+
+    L'écriture passe par un fichier temporaire propre à chaque appel, renommé
+    ensuite en une fois : deux processus qui écrivent la même entrée ne se
+    partagent pas de fichier, et un lecteur ne voit jamais un .npz incomplet.
+    """
+    arrays = {}
+    metadata = _flatten(results, 'r', arrays)
+    arrays['__metadata__'] = np.array(json.dumps(metadata, ensure_ascii=False))
+    path = os.fspath(path)
+    # Suffixe .tmp : l'éviction (glob '*.npz') ne touche pas un fichier en cours d'écriture
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp_path = f.name
+        try:
+            np.savez(f, **arrays)
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_results_npz(path):
+    """Charge un dict de résultats enregistré par save_results_npz"""
+    with np.load(path, allow_pickle=False) as arrays:
+        metadata = json.loads(str(arrays['__metadata__']))
+        return _unflatten(metadata, arrays)
+
+
+class SimulationCache:
+    """
+    Cache LRU en mémoire avec niveau disque .npz optionnel
+
+    Args:
+        max_entries: Nombre maximal de résultats gardés en mémoire
+        disk_dir: Répertoire du niveau disque (None = désactivé)
+        max_disk_bytes: Taille maximale du niveau disque avant éviction
+        max_memory_bytes: Taille maximale des tableaux gardés en mémoire
+    """
+
+    def __init__(self, max_entries=None, disk_dir=None, max_disk_bytes=None, max_memory_bytes=None):
+        self.max_entries = max_entries if max_entries is not None else config.CACHE_PARAMS['memory_entries']
+        self.max_memory_bytes = (max_memory_bytes if max_memory_bytes is not None
+                                 else config.CACHE_PARAMS['max_memory_bytes'])
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = (max_disk_bytes if max_disk_bytes is not None
+                               else config.CACHE_PARAMS['max_disk_bytes'])
+        self._memory = OrderedDict()  # key -> (résultats, octets)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key):
+        return self.disk_dir / f'{key}.npz'
+
+    def get(self, key):
+        """Renvoie une copie profonde des résultats en cache, ou None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                results = self._memory[key][0]
+            else:
+                results = None
+        if results is not None:
+            return copy.deepcopy(results)
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            if path.exists():
+                try:
+                    results = load_results_npz(path)
+                    os.utime(path)  # Marque l'entrée comme récemment utilisée
+                except Exception as e:
+                    logger.warning(f"Entrée de cache illisible {path}: {e}")
+                else:
+                    self._remember(key, copy.deepcopy(results))
+                    self.hits += 1
+                    return results
+
+        self.misses += 1
+        return None
+
+    def put(self, key, results):
+        """Ajoute (une copie profonde de) des résultats aux deux niveaux de cache"""
+        self._remember(key, copy.deepcopy(results))
+        if self.disk_dir is not None:
+            try:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+                save_results_npz(results, self._disk_path(key))
+                self._evict_disk()
+            except Exception as e:
+                logger.warning(f"Impossible d'écrire le cache disque: {e}")
+
+    def _remember(self, key, results):
+        nbytes = _nbytes(results)
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            if nbytes > self.max_memory_bytes:
+                return  # Trop gros pour la mémoire : niveau disque seulement
+            self._memory[key] = (results, nbytes)
+            self._memory_bytes += nbytes
+            while len(self._memory) > self.max_entries or self._memory_bytes > self.max_memory_bytes:
+                self._memory_bytes -= self._memory.popitem(last=False)[1][1]
+
+    def _evict_disk(self):
+        """Supprime les fichiers les moins récemment utilisés au-delà de max_disk_bytes"""
+        entries = []
+        for path in self.disk_dir.glob('*.npz'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Vide le cache mémoire et le niveau disque"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for path in self.disk_dir.glob('*.npz'):
+                path.unlink(missing_ok=True)
+
+
+_default_cache = None
+
+
+def get_simulation_cache():
+    """Cache partagé du processus (créé à partir de CACHE_PARAMS)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SimulationCache(disk_dir=config.CACHE_PARAMS['disk_dir'])
+    return _default_cache
+
+
+def configure_simulation_cache(max_entries=None, disk_dir=None, max_disk_bytes=None, max_memory_bytes=None):
+    """
+    Remplace le cache partagé (ex: pour activer le niveau disque)
+
+    Returns:
+        SimulationCache: Le nouveau cache partagé
+    """
+    global _default_cache
+    _default_cache = SimulationCache(max_entries, disk_dir, max_disk_bytes, max_memory_bytes)
+    return _default_cache
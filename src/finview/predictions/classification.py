@@ -0,0 +1,186 @@
+"""
+Index de classification des actifs (paramètres de rendement et catégorie)
+
+Les tables HISTORICAL_RETURNS et CATEGORY_KEYWORDS sont compilées une seule
+fois en un automate d'Aho–Corasick : tous les mots-clés (en minuscules) sont
+reconnus en un seul passage sur le nom de l'actif, quelle que soit la taille
+des tables. Chaque mot-clé porte sa priorité (rang dans sa table) et l'on
+garde la plus petite trouvée, ce qui redonne exactement le « premier
+mot-clé de la table contenu dans le nom » des anciennes boucles.
+
+Les résultats sont mémorisés par (nom, type) : une même position n'est
+classée qu'une fois, que ce soit pour une simulation ou un rapport PDF.
+"""
+from collections import deque
+from functools import lru_cache
+
+from .config import HISTORICAL_RETURNS, DEFAULT_RETURN_PARAMS, CATEGORY_KEYWORDS, DEFAULT_CATEGORY
+
+
+class KeywordAutomaton:
+    """
+    Automate d'Aho–Corasick sur plusieurs tables de mots-clés
+
+    Chaque table associe des mots-clés à des priorités ; scan() renvoie, pour
+    chaque table, la plus petite priorité parmi les mots-clés contenus dans
+    le texte (None si aucun). Les transitions sont précalculées (automate
+    déterministe) : le parcours fait une recherche de dict par caractère.
+    """
+
+    def __init__(self, tables):
+        """
+        Args:
+            tables: Liste de listes de (mot-clé, priorité)
+        """
+        self.n_tables = len(tables)
+        goto = [{}]
+        outputs = [{}]
+        for table_id, table in enumerate(tables):
+            for keyword, priority in table:
+                state = 0
+                for char in keyword:
+                    if char not in goto[state]:
+                        goto.append({})
+                        outputs.append({})
+                        goto[state][char] = len(goto) - 1
+                    state = goto[state][char]
+                if priority < outputs[state].get(table_id, priority + 1):
+                    outputs[state][table_id] = priority
+
+        # Liens d'échec et transitions complètes, en largeur d'abord (le lien
+        # d'échec d'un état est toujours moins profond, donc déjà traité)
+        fail = [0] * len(goto)
+        self.transitions = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for table_id, priority in outputs[fail[state]].items():
+                if priority < outputs[state].get(table_id, priority + 1):
+                    outputs[state][table_id] = priority
+            transitions = dict(self.transitions[fail[state]])
+            transitions.update(goto[state])
+            self.transitions[state] = transitions
+            for char, child in goto[state].items():
+                fail[child] = self.transitions[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+
+        self.outputs = [tuple(output.items()) or None for output in outputs]
+
+    def scan(self, text):
+        """
+        Returns:
+            list: Plus petite priorité trouvée dans text pour chaque table (ou None)
+        """
+        best = [None] * self.n_tables
+        transitions = self.transitions
+        outputs = self.outputs
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            output = outputs[state]
+            if output is not None:
+                for table_id, priority in output:
+                    if best[table_id] is None or priority < best[table_id]:
+                        best[table_id] = priority
+        return best
+
+
+class ClassificationIndex:
+    """
+    Tables de classification compilées
+
+    Un automate pour le nom (clés de rendement + mots-clés de catégorie) et
+    un pour le type (mots-clés de catégorie hors « nom seul »).
+    """
+
+    def __init__(self, historical_returns, category_keywords):
+        self.historical_returns = historical_returns
+        self.return_keys = list(historical_returns)
+        self.category_names = [category for category, _, _ in category_keywords]
+
+        return_table = [(key.lower(), priority) for priority, key in enumerate(self.return_keys)]
+        category_table = [
+            (keyword, priority)
+            for priority, (_, keywords, _) in enumerate(category_keywords)
+            for keyword in keywords
+        ]
+        type_table = [
+            (keyword, priority)
+            for priority, (_, keywords, name_only) in enumerate(category_keywords)
+            if not name_only
+            for keyword in keywords
+        ]
+        self.name_automaton = KeywordAutomaton([return_table, category_table])
+        self.type_automaton = KeywordAutomaton([type_table])
+        self._type_priority = lru_cache(maxsize=1024)(self._scan_type)
+
+    def _scan_type(self, asset_type):
+        return self.type_automaton.scan((asset_type or '').lower())[0]
+
+    def classify(self, asset_name, asset_type=None):
+        """
+        Même logique que get_asset_return_params et get_asset_category (utils.py)
+
+        Returns:
+            tuple: (paramètres de rendement, catégorie)
+        """
+        return_priority, name_category = self.name_automaton.scan(asset_name.lower())
+
+        if asset_name in self.historical_returns:
+            params = self.historical_returns[asset_name]
+        elif return_priority is not None:
+            params = self.historical_returns[self.return_keys[return_priority]]
+        elif asset_type and asset_type in self.historical_returns:
+            params = self.historical_returns[asset_type]
+        else:
+            params = DEFAULT_RETURN_PARAMS
+
+        candidates = [p for p in (name_category, self._type_priority(asset_type)) if p is not None]
+        category = self.category_names[min(candidates)] if candidates else DEFAULT_CATEGORY
+        return params, category
+
+
+@lru_cache(maxsize=1)
+def get_classification_index():
+    """Index compilé à partir des tables de config.py (construit une seule fois)"""
+    return ClassificationIndex(HISTORICAL_RETURNS, CATEGORY_KEYWORDS)
+
+
+@lru_cache(maxsize=131072)
+def classify_asset(asset_name, asset_type=None):
+    """
+    Paramètres de rendement et catégorie d'un actif (mémorisés par (nom, type))
+
+    Args:
+        asset_name: Nom de l'actif
+        asset_type: Type d'actif (optionnel)
+
+    Returns:
+        tuple: (paramètres de rendement, catégorie)
+    """
+    return get_classification_index().classify(asset_name, asset_type)
+
+
+def classify_many(names, types=None):
+    """
+    Classe un lot d'actifs (les couples (nom, type) déjà vus sont servis par le cache)
+
+    Args:
+        names: Noms des actifs
+        types: Types des actifs, alignés sur names (None = aucun type)
+
+    Returns:
+        list: (paramètres de rendement, catégorie) pour chaque actif
+    """
+    names = list(names)
+    types = [None] * len(names) if types is None else list(types)
+    if len(types) != len(names):
+        raise ValueError(f"names et types doivent avoir la même longueur ({len(names)} != {len(types)})")
+
+    return [classify_asset(name, asset_type) for name, asset_type in zip(names, types)]
+
+
+def clear_classification_cache():
+    """Recompile l'index et vide le cache (après modification des tables de config.py)"""
+    classify_asset.cache_clear()
+    get_classification_index.cache_clear()
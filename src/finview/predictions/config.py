@@ -85,6 +85,9 @@ HISTORICAL_RETURNS = {
     'Compte Épargne': {'mean': 2.0, 'std': 0.2, 'distribution': 'normal'},
 }
 
+# Paramètres utilisés quand ni le nom ni le type ne sont reconnus
+DEFAULT_RETURN_PARAMS = {'mean': 5.5, 'std': 15.0, 'distribution': 'normal'}
+
 # ============================================================================
 # PARAMÈTRES DE CRISE ET RÉALISME
 # ============================================================================
@@ -113,6 +116,21 @@ CRISIS_PARAMS = {
     }
 }
 
+# Régimes de marché à mémoire (chaîne de Markov, voir predictions/regimes.py).
+# Ligne = régime de l'année, colonne = régime de l'année suivante.
+# Distribution stationnaire ≈ (70%, 25%, 5%), comme les probabilités
+# indépendantes ci-dessus, mais les crises persistent (30% de rester en
+# crise) et suivent plus souvent une correction.
+REGIME_PARAMS = {
+    'states': ('calm', 'correction', 'crisis'),
+    'transition_matrix': [
+        # calme  correction  crise
+        [0.75,   0.22,       0.03],  # calme
+        [0.60,   0.33,       0.07],  # correction
+        [0.45,   0.25,       0.30],  # crise
+    ],
+}
+
 # Inflation moyenne et volatilité
 INFLATION_PARAMS = {
     'mean': 2.0,  # 2% d'inflation moyenne
@@ -120,6 +138,21 @@ INFLATION_PARAMS = {
     'max': 8.0  # Plafond en cas de pic inflationniste
 }
 
+# Mots-clés de catégorie, testés dans l'ordre sur le nom et le type de l'actif
+# (premier groupe trouvé = catégorie). Les mots-clés « nom seul » ne sont
+# cherchés que dans le nom. Catégorie par défaut : 'Actions'.
+CATEGORY_KEYWORDS = [
+    # (catégorie, mots-clés, nom seul)
+    ('Crypto', ('crypto', 'bitcoin', 'ethereum'), False),
+    ('Actions', ('action', 'stock', 'tesla', 'apple', 'nvda'), False),
+    ('ETF', ('etf',), False),
+    ('SCPI', ('scpi', 'immobilier', 'reit'), False),
+    ('Obligations', ('obligation', 'bond'), False),
+    ('Liquidités', ('liquidité', 'cash', 'livret', 'épargne'), False),
+    ('Or', ('or', 'gold'), True),
+]
+DEFAULT_CATEGORY = 'Actions'
+
 # Frais annuels moyens par type d'actif
 ANNUAL_FEES = {
     'Actions': 0.003,  # 0.3% de frais de courtage/transaction annuels
@@ -133,3 +166,88 @@ ANNUAL_FEES = {
     'REIT': 0.008,
     'Private Equity': 0.020  # 2% management fees
 }
+
+# ============================================================================
+# PARAMÈTRES DU MOTEUR DE SIMULATION
+# ============================================================================
+
+SIMULATION_PARAMS = {
+    'chunk_size': 2000,  # Trajectoires par bloc (un flux aléatoire indépendant par bloc)
+    'min_chunks': 8,     # Blocs minimum par simulation (estimation de l'erreur standard)
+    'n_workers': 1,      # Processus pour répartir les blocs (1 = exécution en série)
+    'sketch_compression': 1000,  # Compression des t-digest du mode flux (~500 centroïdes par année)
+}
+
+# ============================================================================
+# CORRÉLATIONS ENTRE CATÉGORIES D'ACTIFS
+# ============================================================================
+
+# Ordre des catégories renvoyées par get_asset_category()
+ASSET_CATEGORIES = ['Actions', 'ETF', 'Crypto', 'SCPI', 'Obligations', 'Or', 'Liquidités']
+
+# Corrélation annuelle des rendements entre catégories (matrice symétrique définie positive)
+CATEGORY_CORRELATIONS = [
+    # Actions  ETF   Crypto  SCPI  Oblig.  Or    Liquid.
+    [1.00,    0.90,  0.40,   0.35,  0.10,  0.05,  0.00],  # Actions
+    [0.90,    1.00,  0.40,   0.35,  0.15,  0.05,  0.00],  # ETF
+    [0.40,    0.40,  1.00,   0.10,  0.00,  0.10,  0.00],  # Crypto
+    [0.35,    0.35,  0.10,   1.00,  0.20,  0.05,  0.00],  # SCPI
+    [0.10,    0.15,  0.00,   0.20,  1.00,  0.25,  0.10],  # Obligations
+    [0.05,    0.05,  0.10,   0.05,  0.25,  1.00,  0.00],  # Or
+    [0.00,    0.00,  0.00,   0.00,  0.10,  0.00,  1.00],  # Liquidités
+]
+
+# Part de la variance d'un actif expliquée par le facteur de sa catégorie
+# (= corrélation entre deux actifs de la même catégorie)
+INTRA_CATEGORY_CORRELATION = {
+    'Actions': 0.50,
+    'ETF': 0.85,
+    'Crypto': 0.70,
+    'SCPI': 0.60,
+    'Obligations': 0.70,
+    'Or': 0.90,
+    'Liquidités': 0.90,
+}
+
+# Arrêt anticipé (mode adaptatif de simulate_portfolio_future)
+CONVERGENCE_PARAMS = {
+    'percentiles': ('p10', 'p50', 'p90'),  # Percentiles de la dernière année suivis
+    'z_score': 1.96,                        # Intervalle de confiance à 95%
+    'min_chunks': 4,                        # Blocs minimum avant de tester la convergence
+    'chunk_size': 500,                      # Taille de bloc maximale en mode adaptatif
+}
+
+# Cache des résultats de simulation (voir predictions/cache.py)
+CACHE_PARAMS = {
+    'memory_entries': 32,                  # Résultats gardés en mémoire (LRU)
+    'max_memory_bytes': 256 * 1024 * 1024, # Taille maximale des tableaux gardés en mémoire
+    'disk_dir': None,                      # Répertoire .npz partagé entre processus (None = désactivé)
+    'max_disk_bytes': 256 * 1024 * 1024,   # Taille maximale du niveau disque
+}
+
+# Bootstrap historique (voir predictions/bootstrap.py et market/price_store.py)
+BOOTSTRAP_PARAMS = {
+    'block_size': 12,  # Mois consécutifs par bloc (conserve l'autocorrélation et les crises)
+    'min_blocks': 10,  # Blocs disjoints minimum dans l'historique de chaque ticker utilisé
+    # Ticker de référence par mot-clé du nom (en minuscules), prioritaire sur la catégorie :
+    # un « Gold ETF » est classé ETF mais suit l'or
+    'name_proxies': {
+        'gold': 'GC=F',
+        'silver': 'SI=F',
+        'bitcoin': 'BTC-USD',
+        'btc': 'BTC-USD',
+        'ethereum': 'ETH-USD',
+        'nasdaq': 'QQQ',
+        'cac 40': '^FCHI',
+        's&p': '^GSPC',
+        'sp500': '^GSPC',
+    },
+    # Ticker de référence par catégorie, pour les actifs sans ticker explicite
+    # (jamais pour l'immobilier détenu en direct, classé par mots-clés)
+    'category_proxies': {
+        'Actions': '^GSPC',
+        'ETF': 'SPY',
+        'Crypto': 'BTC-USD',
+        'Or': 'GC=F',
+    },
+}
@@ -0,0 +1,87 @@
+"""
+Arrêt anticipé des simulations Monte Carlo sur critère de convergence
+
+Les blocs de trajectoires sont agrégés un par un ; après chaque bloc,
+l'intervalle de confiance des percentiles suivis (P10/P50/P90 de la dernière
+année par défaut) est estimé par moyennes par lots. La simulation s'arrête dès
+que toutes les demi-largeurs relatives passent sous la tolérance, ou quand le
+budget de temps est épuisé.
+"""
+import time
+
+import numpy as np
+
+from .config import CONVERGENCE_PARAMS
+from .variance_reduction import percentile_standard_errors
+
+
+class ConvergenceMonitor:
+    """
+    Suit la précision des percentiles finaux au fil des blocs
+
+    Args:
+        tolerance: Demi-largeur relative maximale de l'intervalle de confiance
+            (ex: 0.01 = ±1%). None = pas de critère de précision.
+        time_budget: Durée maximale en secondes. None = pas de limite.
+        keys: Percentiles suivis (CONVERGENCE_PARAMS['percentiles'] par défaut)
+        z_score: Quantile normal de l'intervalle (1.96 ≈ 95%)
+    """
+
+    def __init__(self, tolerance=None, time_budget=None, keys=None, z_score=None):
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError(f"La tolérance doit être positive, reçue: {tolerance}")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError(f"Le budget de temps doit être positif, reçu: {time_budget}")
+
+        self.tolerance = tolerance
+        self.time_budget = time_budget
+        self.keys = tuple(keys or CONVERGENCE_PARAMS['percentiles'])
+        self.z_score = z_score or CONVERGENCE_PARAMS['z_score']
+        self.start = time.perf_counter()
+        self.relative_errors = None
+        self.converged = False
+        self.reason = None
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def should_stop(self, chunk_percentiles, chunk_sizes):
+        """
+        Indique s'il faut arrêter après le dernier bloc agrégé
+
+        Args:
+            chunk_percentiles: Percentiles de chaque bloc déjà simulé
+            chunk_sizes: Taille de chaque bloc déjà simulé
+
+        Returns:
+            bool: True si la précision cible est atteinte ou le budget épuisé
+        """
+        if len(chunk_percentiles) >= CONVERGENCE_PARAMS['min_chunks'] and self.tolerance is not None:
+            errors = percentile_standard_errors(chunk_percentiles, chunk_sizes)
+            weights = np.asarray(chunk_sizes, dtype=float) / sum(chunk_sizes)
+            self.relative_errors = {}
+            for key in self.keys:
+                center = weights @ np.array([p[key][-1] for p in chunk_percentiles])
+                self.relative_errors[key] = float(self.z_score * errors[key][-1] / max(abs(center), 1e-12))
+
+            if all(error <= self.tolerance for error in self.relative_errors.values()):
+                self.converged = True
+                self.reason = 'tolerance'
+                return True
+
+        if self.time_budget is not None and self.elapsed >= self.time_budget:
+            self.reason = 'time_budget'
+            return True
+        return False
+
+    def summary(self):
+        """Résumé de l'arrêt pour le dict de résultats"""
+        return {
+            'tolerance': self.tolerance,
+            'time_budget': self.time_budget,
+            'converged': self.converged,
+            'reason': self.reason or 'max_simulations',
+            'relative_errors': self.relative_errors,
+            'elapsed': self.elapsed,
+        }
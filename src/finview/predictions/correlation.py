@@ -0,0 +1,104 @@
+"""
+Modèle de rendements corrélés entre actifs
+
+Chaque actif dépend d'un facteur commun à sa catégorie et d'un bruit propre :
+
+    z_actif = sqrt(ρ_intra) · F_catégorie + sqrt(1 - ρ_intra) · ε_actif
+
+Les facteurs de catégorie sont corrélés selon CATEGORY_CORRELATIONS. La matrice
+(7 × 7) n'est factorisée qu'une fois (Cholesky mis en cache), et les tirages
+corrélés de toutes les trajectoires sont obtenus par un seul produit matriciel
+par lot : le coût reste proportionnel au nombre de catégories, pas d'actifs.
+Les lois marginales restent N(0, 1), seules les dépendances changent.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .config import ASSET_CATEGORIES, CATEGORY_CORRELATIONS, INTRA_CATEGORY_CORRELATION
+
+
+@lru_cache(maxsize=8)
+def _cholesky_factor(correlations):
+    """Facteur de Cholesky (triangulaire inférieur) d'une matrice de corrélation"""
+    matrix = np.array(correlations, dtype=float)
+    if not np.allclose(matrix, matrix.T):
+        raise ValueError("La matrice de corrélation doit être symétrique")
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError as e:
+        raise ValueError(f"La matrice de corrélation n'est pas définie positive: {e}") from e
+    factor.flags.writeable = False
+    return factor
+
+
+def get_category_cholesky():
+    """Facteur de Cholesky de CATEGORY_CORRELATIONS (calculé une seule fois)"""
+    return _cholesky_factor(tuple(tuple(row) for row in CATEGORY_CORRELATIONS))
+
+
+class CorrelationModel:
+    """
+    Structure de corrélation d'une composition de portefeuille
+
+    Attributes:
+        cholesky: Facteur de Cholesky des catégories (C, C)
+        category_index: Indice de catégorie de chaque actif (n_actifs,)
+        loadings: Exposition de chaque actif au facteur de sa catégorie
+        idiosyncratic: Poids du bruit propre de chaque actif
+    """
+
+    def __init__(self, categories):
+        self.cholesky = get_category_cholesky()
+        lookup = {category: i for i, category in enumerate(ASSET_CATEGORIES)}
+        unknown = sorted(set(categories) - set(lookup))
+        if unknown:
+            raise ValueError(f"Catégories sans corrélation définie: {', '.join(unknown)}")
+
+        intra = np.array([INTRA_CATEGORY_CORRELATION[c] for c in categories], dtype=float)
+        self.category_index = np.array([lookup[c] for c in categories], dtype=np.intp)
+        self.loadings = np.sqrt(intra)
+        self.idiosyncratic = np.sqrt(1 - intra)
+
+    @classmethod
+    def from_composition(cls, portfolio_composition):
+        return cls([asset['category'] for asset in portfolio_composition])
+
+    def asset_correlation_matrix(self):
+        """Matrice de corrélation implicite entre actifs (pour contrôle)"""
+        category_matrix = self.cholesky @ self.cholesky.T
+        idx = self.category_index
+        matrix = np.outer(self.loadings, self.loadings) * category_matrix[np.ix_(idx, idx)]
+        np.fill_diagonal(matrix, 1.0)
+        return matrix
+
+    @property
+    def n_inputs(self):
+        """Nombre de normales indépendantes nécessaires par année (facteurs + bruits propres)"""
+        return self.cholesky.shape[0] + self.category_index.size
+
+    def transform(self, normals):
+        """
+        Transforme des normales indépendantes en normales corrélées
+
+        Args:
+            normals: Tableau (..., n_inputs) : facteurs de catégorie puis bruits propres
+
+        Returns:
+            np.ndarray: Tableau (..., n_actifs), de même dtype que normals
+        """
+        n_categories = self.cholesky.shape[0]
+        dtype = normals.dtype
+        factors = normals[..., :n_categories] @ self.cholesky.T.astype(dtype, copy=False)
+        draws = normals[..., n_categories:] * self.idiosyncratic.astype(dtype, copy=False)
+        draws += self.loadings.astype(dtype, copy=False) * factors[..., self.category_index]
+        return draws
+
+    def standard_normal(self, rng, num_paths, years):
+        """
+        Tire des normales centrées réduites corrélées
+
+        Returns:
+            np.ndarray: Tableau (num_paths, years, n_actifs)
+        """
+        return self.transform(rng.standard_normal((num_paths, years, self.n_inputs)))
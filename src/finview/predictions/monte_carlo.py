@@ -1,35 +1,33 @@
 """
 Moteur de simulation Monte Carlo pour les prédictions de patrimoine
 """
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
-from .config import CRISIS_PARAMS, INFLATION_PARAMS, HISTORICAL_RETURNS
-from .utils import get_asset_return_params, get_asset_category, get_annual_fees
+from .config import CRISIS_PARAMS, INFLATION_PARAMS, HISTORICAL_RETURNS, SIMULATION_PARAMS, CONVERGENCE_PARAMS
+from .utils import get_annual_fees
+from .classification import classify_asset
+from .rng import spawn_chunk_seeds, make_generator, default_chunk_size
+from .streaming import StreamingPercentiles
+from .correlation import CorrelationModel
+from .variance_reduction import normalize_methods, draw_standard_inputs, percentile_standard_errors
+from .convergence import ConvergenceMonitor
+from .regimes import RegimeModel, independent_regimes, impact_tables, CORRECTION, CRISIS
+from .cache import get_simulation_cache, simulation_cache_key
 
 
-def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
-                              include_inflation=True, include_fees=True):
+def _collect_composition(portfolio):
     """
-    Simule l'évolution future du portefeuille avec Monte Carlo RÉALISTE
+    Collecte la composition du portefeuille avec les paramètres de chaque actif
 
-    Améliorations:
-    - Scénarios de crise aléatoires
-    - Corrélation entre actifs lors de crises
-    - Inflation
-    - Frais de gestion
-    - Rendements plus conservateurs
-    
     Args:
         portfolio: Objet Portfolio à simuler
-        years: Nombre d'années de projection
-        num_simulations: Nombre de simulations Monte Carlo
-        include_inflation: Ajuster pour l'inflation
-        include_fees: Inclure les frais de gestion
-        
+
     Returns:
-        dict: Résultats de simulation avec percentiles et statistiques
+        list: Liste de dicts ('name', 'value', 'type', 'category', 'params',
+            'real_estate')
     """
-    # Collecter la composition
     portfolio_composition = []
 
     if portfolio.cash > 0:
@@ -38,35 +36,61 @@ def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
             'value': portfolio.cash,
             'type': 'Liquidités',
             'category': 'Liquidités',
-            'params': HISTORICAL_RETURNS['Liquidités']
+            'params': HISTORICAL_RETURNS['Liquidités'],
+            'real_estate': False
         })
 
     for name, inv in portfolio.financial_investments.items():
         inv_type = getattr(inv, 'investment_type', 'Action')
-        params = get_asset_return_params(name, inv_type)
-        category = get_asset_category(name, inv_type)
+        params, category = classify_asset(name, inv_type)
         portfolio_composition.append({
             'name': name,
             'value': inv.get_total_value(),
             'type': inv_type,
             'category': category,
-            'params': params
+            'params': params,
+            'real_estate': False
         })
 
     for name, inv in portfolio.real_estate_investments.items():
         property_type = getattr(inv, 'property_type', 'SCPI')
-        params = get_asset_return_params(name, property_type)
-        category = get_asset_category(name, property_type)
+        params, category = classify_asset(name, property_type)
         portfolio_composition.append({
             'name': name,
             'value': inv.get_total_value(),
             'type': property_type,
             'category': category,
-            'params': params
+            'params': params,
+            'real_estate': True
         })
 
+    return portfolio_composition
+
+
+def _remaining_debt_schedule(total_debt, years):
+    """
+    Dette restante en fin de chaque année (remboursement linéaire)
+
+    Returns:
+        np.ndarray: Tableau de taille years + 1 (année 0 incluse)
+    """
+    if total_debt <= 0:
+        return np.zeros(years + 1)
+    debt_reduction = total_debt * (1 / years)
+    return np.maximum(0, total_debt - debt_reduction * np.arange(years + 1))
+
+
+def _simulate_paths_loop(portfolio_composition, years, num_simulations, total_debt,
+                         include_inflation, include_fees, rng):
+    """
+    Moteur de référence : boucles Python (simulation × année × actif)
+
+    Conservé pour valider le moteur vectorisé.
+
+    Returns:
+        tuple: (simulations, simulations_nominal) de forme (num_simulations, years + 1)
+    """
     initial_value = sum(asset['value'] for asset in portfolio_composition)
-    total_debt = portfolio.get_total_credits_balance() if hasattr(portfolio, 'get_total_credits_balance') else 0
 
     # Matrices de simulation
     simulations = np.zeros((num_simulations, years + 1))
@@ -81,7 +105,7 @@ def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
 
         for year in range(1, years + 1):
             # 1. Déterminer s'il y a une crise ou correction cette année
-            market_event = np.random.random()
+            market_event = rng.random()
             is_crisis = market_event < CRISIS_PARAMS['crisis_probability']
             is_correction = (not is_crisis) and (market_event < CRISIS_PARAMS['crisis_probability'] +
                                                    CRISIS_PARAMS['mild_correction_probability'])
@@ -89,7 +113,7 @@ def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
             # 2. Générer l'inflation pour cette année
             inflation_rate = 0
             if include_inflation:
-                inflation_rate = np.random.normal(
+                inflation_rate = rng.normal(
                     INFLATION_PARAMS['mean'] / 100,
                     INFLATION_PARAMS['std'] / 100
                 )
@@ -102,12 +126,12 @@ def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
             for asset in portfolio_composition:
                 # Rendement de base
                 if asset['params']['distribution'] == 'lognormal':
-                    base_return = np.random.lognormal(
+                    base_return = rng.lognormal(
                         mean=np.log(1 + asset['params']['mean'] / 100) - 0.5 * (asset['params']['std'] / 100) ** 2,
                         sigma=asset['params']['std'] / 100
                     ) - 1
                 else:
-                    base_return = np.random.normal(
+                    base_return = rng.normal(
                         asset['params']['mean'] / 100,
                         asset['params']['std'] / 100
                     )
@@ -117,13 +141,13 @@ def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
                     category = asset['category']
                     if category in CRISIS_PARAMS['crisis_impact']:
                         crisis_mean, crisis_std = CRISIS_PARAMS['crisis_impact'][category]
-                        crisis_shock = np.random.normal(crisis_mean, crisis_std)
+                        crisis_shock = rng.normal(crisis_mean, crisis_std)
                         base_return += crisis_shock
                 elif is_correction:
                     category = asset['category']
                     if category in CRISIS_PARAMS['correction_impact']:
                         corr_mean, corr_std = CRISIS_PARAMS['correction_impact'][category]
-                        correction_shock = np.random.normal(corr_mean, corr_std)
+                        correction_shock = rng.normal(corr_mean, corr_std)
                         base_return += correction_shock
 
                 # Appliquer les frais
@@ -148,37 +172,588 @@ def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
             # Valeur réelle (ajustée de l'inflation)
             simulations[sim, year] = (year_total_nominal - remaining_debt) / cumulative_inflation
 
-    # Calculer les statistiques
-    percentiles = {
-        'p10': np.percentile(simulations, 10, axis=0),
-        'p25': np.percentile(simulations, 25, axis=0),
-        'p50': np.percentile(simulations, 50, axis=0),
-        'p75': np.percentile(simulations, 75, axis=0),
-        'p90': np.percentile(simulations, 90, axis=0),
-        'mean': np.mean(simulations, axis=0)
+    return simulations, simulations_nominal
+
+
+def _composition_arrays(portfolio_composition, dtype=np.float64):
+    """
+    Convertit la composition en tableaux NumPy alignés sur les actifs
+
+    Args:
+        dtype: Précision des paramètres (celle des trajectoires calculées avec)
+
+    Returns:
+        dict: Valeurs initiales, paramètres de rendement, impacts de crise et frais
+    """
+    categories = [asset['category'] for asset in portfolio_composition]
+    means = np.array([asset['params']['mean'] / 100 for asset in portfolio_composition])
+    stds = np.array([asset['params']['std'] / 100 for asset in portfolio_composition])
+    impact_means, impact_stds = impact_tables(categories)
+
+    arrays = {
+        'values': np.array([asset['value'] for asset in portfolio_composition], dtype=float),
+        'means': means,
+        'stds': stds,
+        'log_means': np.log1p(means) - 0.5 * stds ** 2,
+        'impact_means': impact_means,
+        'impact_stds': impact_stds,
+        'crisis_mean': impact_means[CRISIS],
+        'crisis_std': impact_stds[CRISIS],
+        'correction_mean': impact_means[CORRECTION],
+        'correction_std': impact_stds[CORRECTION],
+        'fees': np.array([get_annual_fees(c) for c in categories]),
     }
+    arrays = {key: array.astype(dtype, copy=False) for key, array in arrays.items()}
+    arrays['lognormal'] = np.array([asset['params']['distribution'] == 'lognormal'
+                                    for asset in portfolio_composition], dtype=bool)
+    return arrays
+
+
+def _draw_random_inputs(rng, num_paths, years, n_assets, include_inflation, correlation=None,
+                        variance_reduction=(), dtype=np.float64):
+    """
+    Tire en une fois tous les aléas d'un bloc de trajectoires
+
+    Les rendements et les chocs sont tirés en loi normale centrée réduite puis
+    transformés, ce qui permet de réutiliser les mêmes tirages (scénarios, etc.).
+    Avec un CorrelationModel, les rendements de base sont corrélés entre actifs.
+
+    Args:
+        variance_reduction: Méthodes de réduction de variance (voir variance_reduction.py)
+        dtype: Précision des tirages (np.float64 ou np.float32)
+
+    Returns:
+        dict: 'market_event' (n, years), 'base' et 'shock' (n, years, n_assets),
+              'inflation' (n, years) ou None
+    """
+    n_base = correlation.n_inputs if correlation is not None else n_assets
+    draws = draw_standard_inputs(rng, num_paths, years, n_base, n_assets,
+                                 include_inflation, variance_reduction, dtype)
+    if correlation is not None:
+        draws['base'] = correlation.transform(draws['base'])
+    return draws
+
+
+def _base_returns(assets, draws):
+    """
+    Rendements de base (n, years, n_actifs) : loi normale ou log-normale par actif
+
+    Calculés dans un seul tableau (expm1 appliqué sur place aux colonnes
+    log-normales) plutôt que par np.where entre deux tableaux complets.
+    """
+    lognormal = assets['lognormal']
+    returns = assets['stds'] * draws['base']
+    returns += np.where(lognormal, assets['log_means'], assets['means'])
+    np.expm1(returns, out=returns, where=lognormal)
+    return returns
+
+
+def _asset_growth(assets, base_returns, draws, include_fees, crisis_probability=None,
+                  regime_model=None, out=None):
+    """
+    Valeur nominale cumulée des actifs, par année, à partir des rendements de base
+
+    Ajoute les chocs de crise/correction (communs à tous les actifs d'une
+    trajectoire), retire les frais, applique le plancher à -95% puis fait le
+    produit cumulé sur les années.
+
+    Args:
+        crisis_probability: Probabilité annuelle de crise
+            (CRISIS_PARAMS['crisis_probability'] par défaut)
+        regime_model: RegimeModel optionnel : régimes enchaînés par une
+            chaîne de Markov au lieu d'être tirés indépendamment chaque année
+        out: Tableau de travail pour les rendements (ex: base_returns lui-même
+            quand il n'est plus utile ensuite)
+
+    Returns:
+        np.ndarray: Valeur totale des actifs (n, years), hors dette
+    """
+    # 1. Régime de chaque année (commun à tous les actifs d'une trajectoire)
+    if regime_model is not None:
+        regimes = regime_model.simulate(draws['market_event'])
+    else:
+        regimes = independent_regimes(draws['market_event'], crisis_probability)
+
+    # 2. Chocs de marché lus dans les tables (régime, actif), un seul tableau de travail
+    shock = assets['impact_means'][regimes]
+    returns = np.add(base_returns, shock, out=out)
+    # mode='clip' : écriture directe dans shock (régimes toujours dans 0..2)
+    np.take(assets['impact_stds'], regimes, axis=0, out=shock, mode='clip')
+    shock *= draws['shock']
+    returns += shock
+
+    # 3. Frais et plancher de perte
+    if include_fees:
+        returns -= assets['fees']
+    np.maximum(returns, -0.95, out=returns)
+
+    # 4. Valeur des actifs par produit cumulé, puis somme pondérée
+    returns += 1
+    np.cumprod(returns, axis=1, out=returns)
+    return returns @ assets['values']
+
+
+def _cumulative_inflation(draws):
+    """Inflation cumulée (n, years), plafonnée chaque année à INFLATION_PARAMS['max']"""
+    inflation = np.minimum(
+        INFLATION_PARAMS['mean'] / 100 + INFLATION_PARAMS['std'] / 100 * draws['inflation'],
+        INFLATION_PARAMS['max'] / 100
+    )
+    return np.cumprod(1 + inflation, axis=1)
+
+
+def _paths_from_draws(assets, draws, remaining_debt, include_inflation, include_fees, regime_model=None):
+    """
+    Calcule les trajectoires de patrimoine à partir des tirages aléatoires
+
+    Reproduit exactement la logique du moteur en boucles : rendement de base
+    normal ou log-normal, choc de crise/correction par catégorie, frais,
+    plancher à -95%, puis produit cumulé sur les années.
+
+    Returns:
+        tuple: (simulations, simulations_nominal) de forme (n, years + 1)
+    """
+    num_paths, years = draws['market_event'].shape
+    dtype = assets['values'].dtype
+
+    base_returns = _base_returns(assets, draws)
+    totals = _asset_growth(assets, base_returns, draws, include_fees,
+                           regime_model=regime_model, out=base_returns)
+
+    if include_inflation:
+        cumulative_inflation = _cumulative_inflation(draws)
+    else:
+        cumulative_inflation = np.ones((num_paths, years), dtype=dtype)
+
+    # Valeur initiale et dette restante calculées en float64 puis arrondies
+    simulations_nominal = np.empty((num_paths, years + 1), dtype=dtype)
+    simulations_nominal[:, 0] = assets['values'].sum(dtype=np.float64) - remaining_debt[0]
+    simulations_nominal[:, 1:] = totals - remaining_debt[1:].astype(dtype)
+
+    simulations = simulations_nominal.copy()
+    simulations[:, 1:] /= cumulative_inflation
+
+    return simulations, simulations_nominal
+
+
+def _simulate_paths_vectorized(portfolio_composition, years, num_simulations, total_debt,
+                               include_inflation, include_fees, rng, correlation=None,
+                               variance_reduction=(), regime_model=None, dtype=np.float64):
+    """
+    Moteur vectorisé : tous les aléas sont tirés sous forme de tableaux
+    (num_simulations, years, n_actifs) puis réduits par produits cumulés
+
+    Args:
+        correlation: CorrelationModel optionnel pour des rendements corrélés
+        variance_reduction: Tuple de méthodes de réduction de variance
+        regime_model: RegimeModel optionnel pour des régimes de marché à mémoire
+        dtype: Précision des tirages et des trajectoires (np.float64 ou np.float32)
+
+    Returns:
+        tuple: (simulations, simulations_nominal) de forme (num_simulations, years + 1)
+    """
+    assets = _composition_arrays(portfolio_composition, dtype)
+    draws = _draw_random_inputs(rng, num_simulations, years, len(portfolio_composition),
+                                include_inflation, correlation, variance_reduction, dtype)
+    return _paths_from_draws(assets, draws, _remaining_debt_schedule(total_debt, years),
+                             include_inflation, include_fees, regime_model)
+
+
+def _compute_percentiles(simulations):
+    """
+    Percentiles et moyenne par année d'une matrice de trajectoires
 
-    percentiles_nominal = {
-        'p10': np.percentile(simulations_nominal, 10, axis=0),
-        'p25': np.percentile(simulations_nominal, 25, axis=0),
-        'p50': np.percentile(simulations_nominal, 50, axis=0),
-        'p75': np.percentile(simulations_nominal, 75, axis=0),
-        'p90': np.percentile(simulations_nominal, 90, axis=0),
-        'mean': np.mean(simulations_nominal, axis=0)
+    Toujours renvoyés en float64, la moyenne étant accumulée en float64
+    même pour des trajectoires en float32.
+    """
+    p10, p25, p50, p75, p90 = np.percentile(simulations, [10, 25, 50, 75, 90], axis=0).astype(np.float64)
+    return {
+        'p10': p10,
+        'p25': p25,
+        'p50': p50,
+        'p75': p75,
+        'p90': p90,
+        'mean': np.mean(simulations, axis=0, dtype=np.float64)
     }
 
+
+ENGINES = {
+    'vectorized': _simulate_paths_vectorized,
+    'loop': _simulate_paths_loop,
+}
+
+PRECISIONS = {
+    'float64': np.float64,
+    'float32': np.float32,
+}
+
+
+def _simulate_chunk(engine, portfolio_composition, years, num_paths, total_debt,
+                    include_inflation, include_fees, seed_sequence, keep_paths, model_options):
+    """
+    Simule un bloc de trajectoires avec son propre flux aléatoire
+
+    Fonction de niveau module pour pouvoir être exécutée dans un processus worker.
+    Sans keep_paths, le bloc est résumé en sketches avant d'être renvoyé.
+    """
+    simulations, simulations_nominal = ENGINES[engine](
+        portfolio_composition, years, num_paths, total_debt,
+        include_inflation, include_fees, make_generator(seed_sequence),
+        **model_options
+    )
+    if keep_paths:
+        return simulations, simulations_nominal
+    return StreamingPercentiles.from_block(simulations), StreamingPercentiles.from_block(simulations_nominal)
+
+
+def _run_chunks(engine, portfolio_composition, years, chunks, total_debt,
+                include_inflation, include_fees, n_workers, keep_paths, model_options):
+    """
+    Exécute les blocs en série ou dans un ProcessPoolExecutor
+
+    Les blocs sont produits un par un dans leur ordre d'origine : le résultat
+    ne dépend donc pas du nombre de workers, et l'appelant peut les agréger
+    au fil de l'eau.
+
+    Yields:
+        tuple: (simulations, simulations_nominal) du bloc, ou leurs sketches
+    """
+    args = [
+        (engine, portfolio_composition, years, chunk_paths, total_debt,
+         include_inflation, include_fees, chunk_seed, keep_paths, model_options)
+        for chunk_paths, chunk_seed in chunks
+    ]
+
+    if n_workers <= 1 or len(args) <= 1:
+        for chunk_args in args:
+            yield _simulate_chunk(*chunk_args)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=min(n_workers, len(args)))
+    try:
+        yield from executor.map(_simulate_chunk, *zip(*args))
+    finally:
+        # En cas d'arrêt anticipé, les blocs pas encore démarrés sont annulés
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _pooled_percentiles(chunk_percentiles, chunk_sizes):
+    """Moyenne des percentiles par bloc, pondérée par la taille des blocs (estimation partielle)"""
+    weights = np.asarray(chunk_sizes, dtype=float) / sum(chunk_sizes)
+    return {
+        key: weights @ np.array([p[key] for p in chunk_percentiles])
+        for key in chunk_percentiles[0]
+    }
+
+
+def _final_event(results, num_simulations):
+    """Dernier événement de progression, porteur des résultats complets"""
     return {
-        'simulations': simulations,
-        'simulations_nominal': simulations_nominal,
-        'percentiles': percentiles,
-        'percentiles_nominal': percentiles_nominal,
+        'completed': results['num_simulations_used'],
+        'total': num_simulations,
+        'progress': 1.0,
+        'percentiles': results['percentiles'],
+        'results': results,
+    }
+
+
+class SimulationCancelled(Exception):
+    """Simulation interrompue par le callback de progression"""
+
+
+def iter_portfolio_simulation(portfolio, years=10, num_simulations=1000,
+                              include_inflation=True, include_fees=True,
+                              engine='vectorized', seed=None, chunk_size=None,
+                              n_workers=None, keep_paths=False, correlated=False,
+                              regime_switching=False, variance_reduction=None, tolerance=None,
+                              time_budget=None, use_cache=True, precision='float64'):
+    """
+    Version générateur de simulate_portfolio_future : progression bloc par bloc
+
+    Mêmes arguments que simulate_portfolio_future. Interrompre l'itération
+    (break, close()) annule la simulation, y compris les blocs en attente
+    dans les processus workers.
+
+    Yields:
+        dict: Après chaque bloc, 'completed' (trajectoires simulées), 'total',
+            'progress' (entre 0 et 1), 'percentiles' (estimation partielle des
+            percentiles par année) et 'results' (None, sauf pour le dernier
+            événement qui contient les résultats complets).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur de simulation inconnu: {engine} (attendu: {', '.join(ENGINES)})")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Précision inconnue: {precision} (attendu: {', '.join(PRECISIONS)})")
+
+    # Collecter la composition
+    portfolio_composition = _collect_composition(portfolio)
+
+    initial_value = sum(asset['value'] for asset in portfolio_composition)
+    total_debt = portfolio.get_total_credits_balance() if hasattr(portfolio, 'get_total_credits_balance') else 0
+
+    if n_workers is None:
+        n_workers = SIMULATION_PARAMS['n_workers']
+
+    # Options du modèle de rendements, préparées une seule fois par simulation
+    methods = normalize_methods(variance_reduction)
+    model_options = {}
+    if correlated:
+        if engine != 'vectorized':
+            raise ValueError("Les rendements corrélés nécessitent le moteur 'vectorized'")
+        model_options['correlation'] = CorrelationModel.from_composition(portfolio_composition)
+    if regime_switching:
+        if engine != 'vectorized':
+            raise ValueError("Les régimes de marché à mémoire nécessitent le moteur 'vectorized'")
+        model_options['regime_model'] = RegimeModel()
+    if methods:
+        if engine != 'vectorized':
+            raise ValueError("La réduction de variance nécessite le moteur 'vectorized'")
+        model_options['variance_reduction'] = methods
+    if precision != 'float64':
+        if engine != 'vectorized':
+            raise ValueError(f"La précision '{precision}' nécessite le moteur 'vectorized'")
+        model_options['dtype'] = PRECISIONS[precision]
+
+    # Un flux aléatoire indépendant par bloc de trajectoires (blocs plus petits
+    # en mode adaptatif pour pouvoir s'arrêter tôt)
+    adaptive = tolerance is not None or time_budget is not None
+    if chunk_size is None:
+        chunk_size = default_chunk_size(
+            num_simulations,
+            power_of_two='sobol' in methods,
+            max_size=CONVERGENCE_PARAMS['chunk_size'] if adaptive else None
+        )
+
+    # Résultat déjà calculé pour la même demande ?
+    cache_key = None
+    if use_cache and isinstance(seed, (int, np.integer)) and time_budget is None:
+        cache_key = simulation_cache_key(portfolio_composition, total_debt, {
+            'years': years,
+            'num_simulations': num_simulations,
+            'include_inflation': include_inflation,
+            'include_fees': include_fees,
+            'engine': engine,
+            'seed': int(seed),
+            'chunk_size': chunk_size,
+            'keep_paths': keep_paths,
+            'correlated': correlated,
+            'regime_switching': regime_switching,
+            'variance_reduction': methods,
+            'tolerance': tolerance,
+            'precision': precision,
+        })
+        cached = get_simulation_cache().get(cache_key)
+        if cached is not None:
+            yield _final_event(cached, num_simulations)
+            return
+
+    seed_sequence, chunks = spawn_chunk_seeds(seed, num_simulations, chunk_size)
+    blocks = _run_chunks(engine, portfolio_composition, years, chunks, total_debt,
+                         include_inflation, include_fees, n_workers, keep_paths, model_options)
+
+    results = {
+        'simulations': None,
+        'simulations_nominal': None,
         'initial_value': initial_value - total_debt,
         'years': years,
         'composition': portfolio_composition,
         'include_inflation': include_inflation,
-        'include_fees': include_fees
+        'include_fees': include_fees,
+        'correlated': correlated,
+        'regime_switching': regime_switching,
+        'variance_reduction': methods,
+        'precision': precision,
+        'seed': seed_sequence.entropy
     }
 
+    monitor = ConvergenceMonitor(tolerance, time_budget) if adaptive else None
+
+    # Trajectoires conservées : copiées bloc par bloc dans les matrices finales
+    # (pas de liste de blocs puis concatenate, qui doublerait le pic mémoire)
+    if keep_paths:
+        simulations = np.empty((num_simulations, years + 1), dtype=PRECISIONS[precision])
+        simulations_nominal = np.empty_like(simulations)
+
+    # Agrégation au fil des blocs + percentiles par bloc pour l'erreur standard
+    chunk_percentiles = []
+    chunk_percentiles_nominal = []
+    chunk_sizes = []
+    distribution = StreamingPercentiles(years + 1)
+    distribution_nominal = StreamingPercentiles(years + 1)
+
+    try:
+        for (chunk_paths, _), block in zip(chunks, blocks):
+            if keep_paths:
+                start = sum(chunk_sizes)
+                simulations[start:start + chunk_paths] = block[0]
+                simulations_nominal[start:start + chunk_paths] = block[1]
+                chunk_percentiles.append(_compute_percentiles(block[0]))
+                chunk_percentiles_nominal.append(_compute_percentiles(block[1]))
+            else:
+                chunk_percentiles.append(block[0].percentiles())
+                chunk_percentiles_nominal.append(block[1].percentiles())
+                distribution.merge(block[0])
+                distribution_nominal.merge(block[1])
+            chunk_sizes.append(chunk_paths)
+
+            completed = sum(chunk_sizes)
+            yield {
+                'completed': completed,
+                'total': num_simulations,
+                'progress': completed / num_simulations,
+                'percentiles': _pooled_percentiles(chunk_percentiles, chunk_sizes),
+                'results': None,
+            }
+
+            if monitor is not None and monitor.should_stop(chunk_percentiles, chunk_sizes):
+                break
+    finally:
+        blocks.close()
+
+    if keep_paths:
+        completed = sum(chunk_sizes)
+        if completed < num_simulations:
+            simulations = simulations[:completed].copy()
+            simulations_nominal = simulations_nominal[:completed].copy()
+        results.update({
+            'simulations': simulations,
+            'simulations_nominal': simulations_nominal,
+            'percentiles': _compute_percentiles(simulations),
+            'percentiles_nominal': _compute_percentiles(simulations_nominal),
+        })
+    else:
+        results.update({
+            'distribution': distribution,
+            'distribution_nominal': distribution_nominal,
+            'percentiles': distribution.percentiles(),
+            'percentiles_nominal': distribution_nominal.percentiles(),
+        })
+
+    results['standard_errors'] = percentile_standard_errors(chunk_percentiles, chunk_sizes)
+    results['standard_errors_nominal'] = percentile_standard_errors(chunk_percentiles_nominal, chunk_sizes)
+    results['num_simulations_used'] = sum(chunk_sizes)
+    results['convergence'] = monitor.summary() if monitor is not None else None
+
+    if cache_key is not None:
+        get_simulation_cache().put(cache_key, results)
+    yield _final_event(results, num_simulations)
+
+
+def simulate_portfolio_future(portfolio, years=10, num_simulations=1000,
+                              include_inflation=True, include_fees=True,
+                              progress_callback=None, **options):
+    """
+    Simule l'évolution future du portefeuille avec Monte Carlo RÉALISTE
+
+    Améliorations:
+    - Scénarios de crise aléatoires
+    - Corrélation entre actifs lors de crises
+    - Inflation
+    - Frais de gestion
+    - Rendements plus conservateurs
+    
+    Args:
+        portfolio: Objet Portfolio à simuler
+        years: Nombre d'années de projection
+        num_simulations: Nombre de simulations Monte Carlo
+        include_inflation: Ajuster pour l'inflation
+        include_fees: Inclure les frais de gestion
+        progress_callback: Fonction appelée après chaque bloc avec l'événement
+            de progression (voir iter_portfolio_simulation). Si elle renvoie
+            False, la simulation est annulée (SimulationCancelled).
+
+    Options (**options, transmises à iter_portfolio_simulation):
+        engine: 'vectorized' (NumPy, par défaut) ou 'loop' (boucles Python de
+            référence, statistiquement identique, conservé pour validation)
+        seed: Graine pour des résultats reproductibles (entier, SeedSequence
+            ou np.random.Generator). None = tirage non déterministe.
+        chunk_size: Trajectoires par bloc, chaque bloc ayant son propre flux
+            PCG64 (par défaut : au plus SIMULATION_PARAMS['chunk_size'], avec
+            au moins SIMULATION_PARAMS['min_chunks'] blocs). Pour une même
+            graine, le résultat ne dépend que de ce découpage.
+        n_workers: Nombre de processus pour répartir les blocs
+            (SIMULATION_PARAMS['n_workers'] par défaut, 1 = exécution en série)
+        keep_paths: Conserver les matrices complètes 'simulations' et
+            'simulations_nominal' (percentiles exacts). Par défaut, les blocs
+            sont agrégés en flux (t-digest par année + moyenne courante) et la
+            mémoire reste constante quel que soit num_simulations.
+        correlated: Tirer des rendements corrélés entre actifs (facteurs de
+            catégorie, voir predictions/correlation.py) au lieu de rendements
+            indépendants. Uniquement avec le moteur 'vectorized'.
+        regime_switching: Enchaîner les années calmes / de correction / de
+            crise par une chaîne de Markov (REGIME_PARAMS, voir
+            predictions/regimes.py) : les crises persistent et se regroupent
+            au lieu d'être tirées indépendamment chaque année. Uniquement
+            avec le moteur 'vectorized'.
+        variance_reduction: None, 'antithetic', 'sobol', 'stratified' ou une
+            combinaison (ex: ('antithetic', 'stratified')). Uniquement avec le
+            moteur 'vectorized'. Voir predictions/variance_reduction.py.
+        tolerance: Mode adaptatif : arrêter dès que l'intervalle de confiance
+            à 95% des P10/P50/P90 finaux est à ±tolerance (relatif) près.
+            num_simulations devient alors un maximum.
+        time_budget: Mode adaptatif : arrêter après ce nombre de secondes
+            (le résultat n'est alors plus reproductible à graine égale).
+        use_cache: Réutiliser/enregistrer le résultat dans le cache partagé
+            (predictions/cache.py). Ne s'applique qu'aux simulations
+            déterministes : graine entière et pas de time_budget.
+        precision: 'float64' (par défaut) ou 'float32' : tirages, rendements
+            et trajectoires en simple précision, ce qui divise par deux la
+            mémoire des blocs et des matrices keep_paths. La valeur initiale,
+            la dette, les moyennes et les sketches restent en float64, et les
+            percentiles sont renvoyés en float64. Sur les mêmes tirages, les
+            percentiles diffèrent de moins de 1e-5 en relatif du calcul en
+            float64 (produits cumulés de 40 ans, voir
+            benchmarks/bench_precision.py) ; les tirages float32 formant un
+            autre flux aléatoire, le résultat n'est pas identique bit à bit à
+            graine égale mais reste dans l'erreur Monte Carlo.
+            Uniquement avec le moteur 'vectorized'.
+
+    Returns:
+        dict: Résultats de simulation avec percentiles et statistiques.
+            En mode flux, 'simulations' vaut None et 'distribution' /
+            'distribution_nominal' contiennent les sketches par année.
+            'standard_errors' / 'standard_errors_nominal' donnent l'erreur
+            standard de chaque percentile par année (None si un seul bloc).
+            'num_simulations_used' donne le nombre de trajectoires réellement
+            simulées, 'convergence' le détail de l'arrêt en mode adaptatif.
+
+    Raises:
+        SimulationCancelled: Si progress_callback renvoie False
+    """
+    events = iter_portfolio_simulation(
+        portfolio, years=years, num_simulations=num_simulations,
+        include_inflation=include_inflation, include_fees=include_fees, **options
+    )
+    try:
+        for event in events:
+            if event['results'] is not None:
+                return event['results']
+            if progress_callback is not None and progress_callback(event) is False:
+                raise SimulationCancelled(
+                    f"Simulation annulée après {event['completed']} trajectoires sur {event['total']}"
+                )
+    finally:
+        events.close()
+
+
+def probability_below(prediction_results, threshold):
+    """
+    Probabilité que la valeur finale (réelle) soit inférieure à un seuil
+
+    Exacte si les trajectoires ont été conservées, estimée via le sketch sinon.
+
+    Args:
+        prediction_results: Résultats de simulate_portfolio_future()
+        threshold: Seuil de valeur finale
+
+    Returns:
+        float: Probabilité entre 0 et 1
+    """
+    simulations = prediction_results.get('simulations')
+    if simulations is not None:
+        return float((simulations[:, -1] < threshold).mean())
+    return float(prediction_results['distribution'].cdf(threshold))
+
 
 def create_statistics_summary(prediction_results):
     """
@@ -0,0 +1,428 @@
+"""
+Moteur de simulation Monte Carlo au pas mensuel
+
+Complète simulate_portfolio_future (pas annuel) pour les projections qui
+dépendent des flux de trésorerie :
+- versements et retraits récurrents (échéancier mensuel),
+- amortissement réel de chaque crédit (taux et mensualité du Credit),
+  mensualités payées sur les actifs simulés,
+- loyers des investissements immobiliers (rental_yield), réinvestis.
+
+Les rendements annuels de config.py sont ramenés au mois (même espérance
+annuelle), une crise ou correction éventuelle par an frappe un mois tiré au
+hasard. Les actifs de mêmes paramètres (en pratique, de même catégorie)
+sont regroupés en poches : un seul tirage par poche et par mois, quel que
+soit le nombre de positions. Le calcul est vectorisé sur les trajectoires
+et les poches : seule la boucle sur les mois reste en Python, car les flux
+dépendent de la valeur atteinte par chaque trajectoire.
+"""
+import numpy as np
+
+from .config import CRISIS_PARAMS, INFLATION_PARAMS, HISTORICAL_RETURNS
+from .monte_carlo import PRECISIONS, _collect_composition, _composition_arrays, _compute_percentiles
+from .rng import make_seed_sequence, make_generator
+
+MONTHS_PER_YEAR = 12
+
+
+def cash_flow_schedule(years, monthly_amount, start_year=0, end_year=None, annual_growth=0.0):
+    """
+    Échéancier mensuel d'un flux récurrent (versement ou retrait)
+
+    Args:
+        years: Horizon de projection en années
+        monthly_amount: Montant mensuel la première année du flux
+        start_year: Année (incluse) à partir de laquelle le flux commence
+        end_year: Année (exclue) à laquelle le flux s'arrête (None = jusqu'au bout)
+        annual_growth: Revalorisation annuelle du montant en % (ex: 2.0)
+
+    Returns:
+        np.ndarray: Montant de chaque mois, de taille years * 12
+    """
+    months = np.arange(years * MONTHS_PER_YEAR)
+    end_month = years * MONTHS_PER_YEAR if end_year is None else end_year * MONTHS_PER_YEAR
+    active = (months >= start_year * MONTHS_PER_YEAR) & (months < end_month)
+    growth = (1 + annual_growth / 100) ** (months // MONTHS_PER_YEAR)
+    return np.where(active, monthly_amount * growth, 0.0)
+
+
+def _as_schedule(value, months, label):
+    """Montant constant ou échéancier explicite -> tableau de taille months"""
+    schedule = np.asarray(value, dtype=float)
+    if schedule.ndim == 0:
+        return np.full(months, float(schedule))
+    if schedule.shape != (months,):
+        raise ValueError(f"L'échéancier '{label}' doit contenir {months} mois, reçu: {schedule.shape[0]}")
+    return schedule
+
+
+def _credit_balances(credits, months):
+    """Capital restant dû (months + 1, crédits) et taux mensuel de chaque crédit"""
+    balances = np.array([credit.current_balance for credit in credits], dtype=float)
+    payments = np.array([credit.monthly_payment for credit in credits], dtype=float)
+    rates = np.array([credit.interest_rate for credit in credits], dtype=float) / 100 / MONTHS_PER_YEAR
+    rates = np.where(payments > 0, rates, 0.0)
+
+    k = np.arange(months + 1)[:, None]
+    growth = (1 + rates) ** k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(rates > 0, (growth - 1) / rates, k)
+    return np.maximum(balances * growth - payments * annuity, 0.0), rates
+
+
+def credit_amortization_schedule(credits, months):
+    """
+    Capital restant dû total, fin de chaque mois, pour une liste de crédits
+
+    Chaque crédit est amorti à mensualité constante au taux annuel du Credit
+    (B_k = B_0·(1+r)^k - M·((1+r)^k - 1)/r). Un crédit sans mensualité
+    renseignée est supposé remboursé in fine : son capital reste constant.
+
+    Args:
+        credits: Objets Credit (current_balance, interest_rate, monthly_payment)
+        months: Nombre de mois de projection
+
+    Returns:
+        np.ndarray: Dette totale de taille months + 1 (mois 0 inclus)
+    """
+    credits = list(credits)
+    if not credits:
+        return np.zeros(months + 1)
+    return _credit_balances(credits, months)[0].sum(axis=1)
+
+
+def credit_payment_schedule(credits, months):
+    """
+    Mensualités totales payées chaque mois pour une liste de crédits
+
+    Même amortissement que credit_amortization_schedule : la mensualité
+    M du Credit tant que le crédit court, puis le solde (intérêts compris)
+    le mois où il s'éteint, et rien ensuite. Un crédit remboursé in fine ne
+    coûte rien avant l'horizon.
+
+    Returns:
+        np.ndarray: Mensualités de taille months (mois 1 à months)
+    """
+    credits = list(credits)
+    if not credits:
+        return np.zeros(months)
+    remaining, rates = _credit_balances(credits, months)
+    return (remaining[:-1] * (1 + rates) - remaining[1:]).sum(axis=1)
+
+
+def _monthly_asset_arrays(portfolio, portfolio_composition, dtype=np.float64):
+    """
+    Paramètres mensuels des actifs (rendements, frais, loyers, allocation)
+
+    Args:
+        dtype: Précision des paramètres (celle des trajectoires calculées avec)
+
+    Returns:
+        dict: Tableaux alignés sur les actifs de la composition
+    """
+    assets = _composition_arrays(portfolio_composition, dtype)
+
+    # Espérance annuelle conservée : (1 + m)^(1/12) - 1 en loi normale,
+    # log-rendement annuel réparti sur 12 mois en loi log-normale
+    assets['monthly_means'] = np.expm1(np.log1p(assets['means']) / MONTHS_PER_YEAR)
+    assets['monthly_log_means'] = assets['log_means'] / MONTHS_PER_YEAR
+    assets['monthly_stds'] = assets['stds'] / np.sqrt(MONTHS_PER_YEAR)
+    assets['monthly_fees'] = assets['fees'] / MONTHS_PER_YEAR
+
+    rental_yields = {name: inv.rental_yield for name, inv in portfolio.real_estate_investments.items()}
+    assets['monthly_rent'] = np.array([
+        rental_yields.get(asset['name'], 0.0) / 100 / MONTHS_PER_YEAR for asset in portfolio_composition
+    ], dtype=dtype)
+
+    # Les versements sont investis selon l'allocation actuelle
+    total = assets['values'].sum()
+    assets['allocation'] = assets['values'] / total if total > 0 else np.zeros_like(assets['values'])
+    return assets
+
+
+def _pool_assets(assets):
+    """
+    Regroupe les actifs de mêmes paramètres de rendement en poches
+
+    Des actifs indépendants de même loi, pondérés par w_i (somme 1), ont un
+    rendement de poche Σ w_i (m + σ z_i) ~ m + σ·√h·Z avec h = Σ w_i² :
+    un seul tirage par poche suffit, avec un écart-type réduit de √h (de
+    même pour les chocs de crise). En loi log-normale, la volatilité de la
+    poche est ajustée pour conserver l'espérance et la variance du facteur
+    de croissance. Les poids internes d'une poche restent ceux de départ
+    (poche rééquilibrée chaque mois), ses loyers sont la moyenne pondérée
+    de ceux de ses actifs.
+
+    Returns:
+        dict: Tableaux alignés sur les poches, mêmes clés que les actifs
+    """
+    keys = ('monthly_means', 'monthly_log_means', 'monthly_stds', 'monthly_fees',
+            'crisis_mean', 'crisis_std', 'correction_mean', 'correction_std')
+    dtype = assets['values'].dtype
+    parameters = np.column_stack([assets['lognormal']] + [assets[key] for key in keys]).astype(np.float64)
+    _, first, pool = np.unique(parameters, axis=0, return_index=True, return_inverse=True)
+    pool = pool.ravel()
+    n_pools = first.size
+
+    # Poids dans la poche : valeurs actuelles, ou allocation (portefeuille vide)
+    weights = assets['values'].astype(np.float64)
+    if not weights.any():
+        weights = assets['allocation'].astype(np.float64)
+    pool_weights = np.bincount(pool, weights, n_pools)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.where(pool_weights[pool] > 0, weights / pool_weights[pool], 1.0 / np.bincount(pool)[pool])
+    herfindahl = np.bincount(pool, w ** 2, n_pools)
+    diversification = np.sqrt(herfindahl)
+
+    pooled = {key: assets[key][first].astype(np.float64) for key in keys}
+    pooled['lognormal'] = assets['lognormal'][first]
+    pooled['values'] = np.bincount(pool, assets['values'].astype(np.float64), n_pools)
+    pooled['allocation'] = np.bincount(pool, assets['allocation'].astype(np.float64), n_pools)
+    pooled['monthly_rent'] = np.bincount(pool, w * assets['monthly_rent'], n_pools)
+    for key in ('crisis_std', 'correction_std'):
+        pooled[key] = pooled[key] * diversification
+
+    # σ de la poche : √h·σ en loi normale ; en loi log-normale,
+    # s² = log(1 + h·(exp(σ²) - 1)), log-moyenne corrigée de (σ² - s²) / 2
+    stds = pooled['monthly_stds']
+    lognormal_stds = np.sqrt(np.log1p(herfindahl * np.expm1(stds ** 2)))
+    pooled['monthly_log_means'] = pooled['monthly_log_means'] + np.where(
+        pooled['lognormal'], (stds ** 2 - lognormal_stds ** 2) / 2, 0.0
+    )
+    pooled['monthly_stds'] = np.where(pooled['lognormal'], lognormal_stds, stds * diversification)
+
+    return {key: value if key == 'lognormal' else value.astype(dtype) for key, value in pooled.items()}
+
+
+def _simulate_monthly_paths(assets, num_simulations, years, contributions, withdrawals,
+                            include_inflation, include_fees, include_rental_income, rng):
+    """
+    Trajectoires mensuelles vectorisées sur (trajectoires, poches d'actifs)
+
+    Les actifs sont d'abord regroupés en poches (voir _pool_assets). Les
+    aléas sont tirés année par année (12 mois d'un coup, dans un tampon
+    réutilisé) et directement transformés en facteurs de croissance 1 + r :
+    une seule transformation affine (moyenne, frais), l'exponentielle sur
+    les seuls actifs log-normaux (placés en tête), puis les chocs de crise
+    tirés pour les seules trajectoires touchées. Les flux sont ensuite
+    appliqués mois par mois : versements répartis selon l'allocation,
+    retraits (mensualités de crédit comprises) vendus au prorata des
+    positions et plafonnés à la valeur disponible.
+
+    Returns:
+        dict: 'totals' (n, months + 1) valeur nominale des actifs,
+              'inflation' (n, months + 1) inflation cumulée,
+              'rental_income' (n,) loyers cumulés, 'depleted' (n,) booléen
+    """
+    assets = _pool_assets(assets)
+    # Poches log-normales en tête : leur exponentielle porte sur une tranche
+    order = np.argsort(~assets['lognormal'], kind='stable')
+    assets = {key: value[order] for key, value in assets.items()}
+    n_lognormal = int(assets['lognormal'].sum())
+    n_assets = assets['values'].size
+    dtype = assets['values'].dtype
+    months = years * MONTHS_PER_YEAR
+
+    holdings = np.tile(assets['values'], (num_simulations, 1))
+    # Une ligne par mois : écritures contiguës dans la boucle
+    totals = np.empty((months + 1, num_simulations), dtype=dtype)
+    totals[0] = assets['values'].sum()
+    cumulative_inflation = np.ones((num_simulations, months + 1))
+    rental_income = np.zeros(num_simulations)
+    depleted = np.zeros(num_simulations, dtype=bool)
+
+    # Facteur de croissance : 1 + m + σz - frais (loi normale),
+    # exp(log-moyenne + σz) - frais (loi log-normale)
+    fees = assets['monthly_fees'] if include_fees else np.zeros(n_assets, dtype=dtype)
+    shift = np.where(assets['lognormal'], assets['monthly_log_means'], 1 + assets['monthly_means'] - fees)
+    lognormal_fees = fees[:n_lognormal]
+    crisis_probability = CRISIS_PARAMS['crisis_probability']
+    event_probability = crisis_probability + CRISIS_PARAMS['mild_correction_probability']
+
+    # Une seule multiplication matricielle par mois : valeur totale et loyers
+    valuation = np.column_stack([np.ones(n_assets, dtype=dtype), assets['monthly_rent']])
+    with_rent = include_rental_income and assets['monthly_rent'].any()
+    growth = np.empty((MONTHS_PER_YEAR, num_simulations, n_assets), dtype=dtype)
+    inflow = np.empty((num_simulations, n_assets), dtype=dtype)
+
+    for year in range(years):
+        # 1. Facteurs de croissance mensuels de base (12, n, actifs)
+        rng.standard_normal(dtype=dtype, out=growth)
+        growth *= assets['monthly_stds']
+        growth += shift
+        if n_lognormal:
+            lognormal_growth = growth[..., :n_lognormal]
+            np.exp(lognormal_growth, out=lognormal_growth)
+            lognormal_growth -= lognormal_fees
+
+        # 2. Au plus une crise ou correction par an, sur un mois tiré au hasard
+        event = rng.random(num_simulations)
+        hit = np.flatnonzero(event < event_probability)
+        if hit.size:
+            event_month = rng.integers(0, MONTHS_PER_YEAR, size=hit.size)
+            shock_z = rng.standard_normal((hit.size, n_assets), dtype=dtype)
+            is_crisis = (event[hit] < crisis_probability)[:, None]
+            growth[event_month, hit] += np.where(
+                is_crisis,
+                assets['crisis_mean'] + assets['crisis_std'] * shock_z,
+                assets['correction_mean'] + assets['correction_std'] * shock_z
+            )
+
+        # 3. Plancher de perte (-95 % par mois)
+        np.maximum(growth, 0.05, out=growth)
+
+        # 4. Inflation annuelle tirée une fois, répartie sur les 12 mois
+        if include_inflation:
+            inflation = rng.standard_normal(num_simulations)
+            inflation = np.minimum(
+                INFLATION_PARAMS['mean'] / 100 + INFLATION_PARAMS['std'] / 100 * inflation,
+                INFLATION_PARAMS['max'] / 100
+            )
+            monthly_inflation = (1 + inflation) ** (1 / MONTHS_PER_YEAR)
+            start = year * MONTHS_PER_YEAR
+            cumulative_inflation[:, start + 1:start + MONTHS_PER_YEAR + 1] = (
+                cumulative_inflation[:, start, None] *
+                monthly_inflation[:, None] ** np.arange(1, MONTHS_PER_YEAR + 1)
+            )
+
+        # 5. Flux du mois (dépendent de la valeur de chaque trajectoire)
+        for month in range(MONTHS_PER_YEAR):
+            t = year * MONTHS_PER_YEAR + month
+            net_flow = float(contributions[t] - withdrawals[t])
+            holdings *= growth[month]
+            if with_rent:
+                total, rent = (holdings @ valuation).T
+                rental_income += rent
+                flow = rent + net_flow
+            else:
+                total = holdings @ valuation[:, 0]
+                flow = np.full(num_simulations, net_flow, dtype=dtype)
+
+            # Retrait : vente au prorata, plafonnée à la valeur disponible
+            if withdrawals[t] > 0:
+                outflow = np.maximum(-flow, 0.0)
+                depleted |= outflow > total + 1e-9
+                np.minimum(outflow, total, out=outflow)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    kept = np.where(total > 0, 1 - outflow / total, 0.0)
+                holdings *= kept[:, None]
+                total *= kept
+                np.maximum(flow, 0.0, out=flow)
+
+            # Versement et loyers : investis selon l'allocation (qui somme à 1)
+            if with_rent or contributions[t] > 0:
+                np.multiply(flow[:, None], assets['allocation'], out=inflow)
+                holdings += inflow
+            totals[t + 1] = total + flow
+
+    return {
+        'totals': totals.T,
+        'inflation': cumulative_inflation,
+        'rental_income': rental_income,
+        'depleted': depleted,
+    }
+
+
+def simulate_portfolio_monthly(portfolio, years=10, num_simulations=1000,
+                               monthly_contribution=0.0, monthly_withdrawal=0.0,
+                               include_inflation=True, include_fees=True,
+                               include_rental_income=True, seed=None, precision='float64'):
+    """
+    Simule l'évolution du patrimoine au pas mensuel avec flux de trésorerie
+
+    Args:
+        portfolio: Objet Portfolio à simuler
+        years: Nombre d'années de projection
+        num_simulations: Nombre de simulations Monte Carlo
+        monthly_contribution: Versement mensuel (montant constant ou échéancier
+            de years * 12 mois, voir cash_flow_schedule), investi selon
+            l'allocation actuelle du portefeuille
+        monthly_withdrawal: Retrait mensuel (montant ou échéancier), vendu au
+            prorata des positions et plafonné à la valeur disponible.
+            Les mensualités des crédits (credit_payment_schedule) sont
+            prélevées de la même manière sur les actifs simulés.
+        include_inflation: Ajuster pour l'inflation
+        include_fees: Inclure les frais de gestion
+        include_rental_income: Réinvestir les loyers des investissements
+            immobiliers (rental_yield appliqué à leur valeur simulée)
+        seed: Graine pour des résultats reproductibles (voir rng.make_seed_sequence)
+        precision: 'float64' (par défaut) ou 'float32' : tirages, rendements
+            et trajectoires en simple précision, plus rapides et deux fois
+            moins gourmands en mémoire. La dette, l'inflation et les loyers
+            cumulés restent en float64.
+
+    Returns:
+        dict: Même structure que simulate_portfolio_future (valeurs annuelles
+            dans 'simulations' / 'percentiles'), plus 'months',
+            'monthly_percentiles' (valeurs réelles par mois),
+            'debt_schedule' (capital restant dû par mois), 'cash_flows'
+            (totaux versés, retirés, mensualités de crédit, loyers moyens) et
+            'depletion_probability' (part des trajectoires où un retrait ou
+            une mensualité n'a pu être couvert).
+    """
+    if years <= 0:
+        raise ValueError(f"L'horizon doit être positif, reçu: {years}")
+    if num_simulations <= 0:
+        raise ValueError(f"Le nombre de simulations doit être positif, reçu: {num_simulations}")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Précision inconnue: {precision} (attendu: {', '.join(PRECISIONS)})")
+
+    months = years * MONTHS_PER_YEAR
+    contributions = _as_schedule(monthly_contribution, months, 'monthly_contribution')
+    withdrawals = _as_schedule(monthly_withdrawal, months, 'monthly_withdrawal')
+
+    portfolio_composition = _collect_composition(portfolio)
+    if not any(asset['value'] > 0 for asset in portfolio_composition):
+        # Portefeuille vide : les versements sont placés en liquidités
+        portfolio_composition = [{
+            'name': 'Liquidités',
+            'value': 0.0,
+            'type': 'Liquidités',
+            'category': 'Liquidités',
+            'params': HISTORICAL_RETURNS['Liquidités']
+        }]
+    assets = _monthly_asset_arrays(portfolio, portfolio_composition, PRECISIONS[precision])
+    if not assets['allocation'].any():
+        assets['allocation'][0] = 1.0
+
+    debt = credit_amortization_schedule(portfolio.credits.values(), months)
+    # Les mensualités sont payées sur les actifs, comme un retrait
+    debt_payments = credit_payment_schedule(portfolio.credits.values(), months)
+
+    seed_sequence = make_seed_sequence(seed)
+    paths = _simulate_monthly_paths(assets, num_simulations, years, contributions, withdrawals + debt_payments,
+                                    include_inflation, include_fees, include_rental_income,
+                                    make_generator(seed_sequence))
+
+    monthly_nominal = paths['totals'] - debt
+    monthly_real = monthly_nominal / paths['inflation']
+    yearly = slice(None, None, MONTHS_PER_YEAR)
+    simulations = monthly_real[:, yearly]
+    simulations_nominal = monthly_nominal[:, yearly]
+
+    monthly_percentiles = _compute_percentiles(monthly_real)
+
+    return {
+        'simulations': simulations,
+        'simulations_nominal': simulations_nominal,
+        'percentiles': {key: values[yearly] for key, values in monthly_percentiles.items()},
+        'percentiles_nominal': _compute_percentiles(simulations_nominal),
+        'monthly_percentiles': monthly_percentiles,
+        'initial_value': float(monthly_nominal[0, 0]),
+        'years': years,
+        'months': months,
+        'composition': portfolio_composition,
+        'include_inflation': include_inflation,
+        'include_fees': include_fees,
+        'precision': precision,
+        'debt_schedule': debt,
+        'cash_flows': {
+            'contributions': float(contributions.sum()),
+            'withdrawals': float(withdrawals.sum()),
+            'debt_payments': float(debt_payments.sum()),
+            'rental_income_mean': float(paths['rental_income'].mean()),
+        },
+        'depletion_probability': float(paths['depleted'].mean()),
+        'seed': seed_sequence.entropy,
+        'num_simulations_used': num_simulations,
+    }
@@ -0,0 +1,112 @@
+"""
+Régimes de marché (calme / correction / crise) pour les simulations
+
+Chaque année de chaque trajectoire est dans un régime codé par un entier
+(CALM, CORRECTION, CRISIS). Les chocs de crise et de correction sont ensuite
+lus dans des tables (régime, actif) par indexation avancée, sans branche
+par actif.
+
+Deux modèles produisent ces régimes à partir des mêmes uniformes
+draws['market_event'] :
+- independent_regimes : tirage indépendant chaque année (CRISIS_PARAMS),
+- RegimeModel : chaîne de Markov (REGIME_PARAMS), où les crises persistent
+  et se regroupent. Toutes les trajectoires avancent ensemble : une seule
+  boucle Python sur les années.
+"""
+import numpy as np
+
+from .config import CRISIS_PARAMS, REGIME_PARAMS
+
+CALM, CORRECTION, CRISIS = 0, 1, 2
+
+
+def independent_regimes(uniforms, crisis_probability=None):
+    """
+    Régimes tirés indépendamment chaque année
+
+    Args:
+        uniforms: Uniformes (n, years)
+        crisis_probability: Probabilité annuelle de crise
+            (CRISIS_PARAMS['crisis_probability'] par défaut)
+
+    Returns:
+        np.ndarray: Régimes int8 (n, years)
+    """
+    if crisis_probability is None:
+        crisis_probability = CRISIS_PARAMS['crisis_probability']
+    regimes = (uniforms < crisis_probability + CRISIS_PARAMS['mild_correction_probability']).astype(np.int8)
+    regimes += uniforms < crisis_probability
+    return regimes
+
+
+def impact_tables(categories):
+    """
+    Moyenne et écart-type du choc par (régime, actif)
+
+    Args:
+        categories: Catégorie de chaque actif
+
+    Returns:
+        tuple: (moyennes, écarts-types), tableaux (3, n_actifs), ligne CALM nulle
+    """
+    means = np.zeros((3, len(categories)))
+    stds = np.zeros((3, len(categories)))
+    for regime, table in ((CORRECTION, CRISIS_PARAMS['correction_impact']),
+                          (CRISIS, CRISIS_PARAMS['crisis_impact'])):
+        for i, category in enumerate(categories):
+            means[regime, i], stds[regime, i] = table.get(category, (0.0, 0.0))
+    return means, stds
+
+
+class RegimeModel:
+    """
+    Chaîne de Markov sur les régimes de marché
+
+    Attributes:
+        transition_matrix: Matrice (3, 3), ligne = régime courant
+        cumulative: Cumul des lignes, pour inverser la loi de transition
+        stationary: Distribution stationnaire (régime de la première année)
+    """
+
+    def __init__(self, transition_matrix=None):
+        if transition_matrix is None:
+            transition_matrix = REGIME_PARAMS['transition_matrix']
+        matrix = np.array(transition_matrix, dtype=float)
+        if matrix.shape != (3, 3):
+            raise ValueError(f"La matrice de transition doit être 3 × 3, reçue: {matrix.shape}")
+        if (matrix < 0).any() or not np.allclose(matrix.sum(axis=1), 1):
+            raise ValueError("Chaque ligne de la matrice de transition doit être une loi de probabilité")
+
+        self.transition_matrix = matrix
+        self.cumulative = np.cumsum(matrix, axis=1)
+        self.stationary = self._stationary_distribution(matrix)
+
+    @staticmethod
+    def _stationary_distribution(matrix):
+        eigenvalues, eigenvectors = np.linalg.eig(matrix.T)
+        vector = np.real(eigenvectors[:, np.argmin(np.abs(eigenvalues - 1))])
+        return vector / vector.sum()
+
+    def simulate(self, uniforms):
+        """
+        Trajectoires de régimes pour toutes les trajectoires à la fois
+
+        La première année suit la distribution stationnaire, les suivantes la
+        ligne de la matrice correspondant au régime de l'année précédente
+        (inversion de la fonction de répartition avec les uniformes fournis).
+
+        Args:
+            uniforms: Uniformes (n, years)
+
+        Returns:
+            np.ndarray: Régimes int8 (n, years)
+        """
+        num_paths, years = uniforms.shape
+        regimes = np.empty((num_paths, years), dtype=np.int8)
+        if years == 0:
+            return regimes
+        regimes[:, 0] = (uniforms[:, 0, None] >= np.cumsum(self.stationary)[:-1]).sum(axis=1)
+        thresholds = self.cumulative[:, :-1]
+        for year in range(1, years):
+            regimes[:, year] = (uniforms[:, year, None] >= thresholds[regimes[:, year - 1]]).sum(axis=1)
+        return regimes
@@ -0,0 +1,92 @@
+"""
+Flux aléatoires reproductibles pour les simulations Monte Carlo
+
+Chaque bloc (chunk) de trajectoires reçoit son propre générateur PCG64,
+dérivé d'une SeedSequence commune par `spawn`. Le découpage ne dépend que
+de `num_simulations` et `chunk_size` : le résultat est donc identique bit à
+bit, que les blocs soient calculés en série ou répartis sur plusieurs workers.
+"""
+import numpy as np
+
+from .config import SIMULATION_PARAMS
+
+
+def make_seed_sequence(seed=None):
+    """
+    Construit la SeedSequence racine d'une simulation
+
+    Args:
+        seed: None (entropie du système), entier, np.random.SeedSequence
+            ou np.random.Generator (dont on consomme quelques tirages)
+
+    Returns:
+        np.random.SeedSequence: Séquence racine
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(seed.integers(0, 2 ** 32, size=4).tolist())
+    return np.random.SeedSequence(seed)
+
+
+def split_paths(num_simulations, chunk_size=None):
+    """
+    Découpe le nombre de trajectoires en blocs de taille fixe
+
+    Returns:
+        list: Taille de chaque bloc (le dernier peut être plus petit)
+    """
+    if chunk_size is None:
+        chunk_size = SIMULATION_PARAMS['chunk_size']
+    if chunk_size <= 0:
+        raise ValueError(f"La taille de bloc doit être positive, reçue: {chunk_size}")
+
+    full, rest = divmod(num_simulations, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def default_chunk_size(num_simulations, power_of_two=False, max_size=None):
+    """
+    Taille de bloc par défaut pour une simulation
+
+    Plafonnée par SIMULATION_PARAMS['chunk_size'] mais assez petite pour
+    produire au moins SIMULATION_PARAMS['min_chunks'] blocs indépendants
+    (nécessaires à l'estimation de l'erreur standard des percentiles).
+
+    Args:
+        num_simulations: Nombre total de trajectoires
+        power_of_two: Arrondir à une puissance de 2 (suites de Sobol)
+        max_size: Plafond supplémentaire (ex: mode adaptatif)
+
+    Returns:
+        int: Taille de bloc
+    """
+    size = min(SIMULATION_PARAMS['chunk_size'], -(-num_simulations // SIMULATION_PARAMS['min_chunks']))
+    if max_size is not None:
+        size = min(size, max_size)
+    size = max(size, 1)
+    if power_of_two:
+        size = 1 << (size.bit_length() - 1)
+    return size
+
+
+def spawn_chunk_seeds(seed, num_simulations, chunk_size=None):
+    """
+    Associe à chaque bloc de trajectoires une SeedSequence indépendante
+
+    Args:
+        seed: Graine (voir make_seed_sequence)
+        num_simulations: Nombre total de trajectoires
+        chunk_size: Taille des blocs (SIMULATION_PARAMS['chunk_size'] par défaut)
+
+    Returns:
+        tuple: (SeedSequence racine, liste de (taille_du_bloc, SeedSequence))
+    """
+    root = make_seed_sequence(seed)
+    sizes = split_paths(num_simulations, chunk_size)
+    return root, list(zip(sizes, root.spawn(len(sizes))))
+
+
+def make_generator(seed_sequence):
+    """Crée un générateur PCG64 à partir d'une SeedSequence"""
+    return np.random.Generator(np.random.PCG64(seed_sequence))
@@ -0,0 +1,174 @@
+"""
+Agrégation en flux des trajectoires Monte Carlo
+
+Au lieu de conserver les matrices (num_simulations, years + 1), chaque bloc de
+trajectoires est résumé par un sketch de quantiles par année (t-digest à
+fusion, échelle k1) et une moyenne courante. La mémoire reste constante quel
+que soit le nombre de trajectoires, et les sketches de plusieurs blocs (ou de
+plusieurs workers) se fusionnent sans perte de précision notable.
+"""
+import numpy as np
+
+from .config import SIMULATION_PARAMS
+
+PERCENTILE_LEVELS = {'p10': 10, 'p25': 25, 'p50': 50, 'p75': 75, 'p90': 90}
+
+
+class TDigest:
+    """
+    Sketch de quantiles t-digest (variante à fusion, vectorisée)
+
+    Les centroïdes sont regroupés par tranches d'une unité sur l'échelle
+    k1 = compression / (2π) · arcsin(2q - 1), ce qui donne une résolution
+    fine dans les queues de distribution (P10, P90) et au plus
+    ~compression / 2 centroïdes.
+    """
+
+    def __init__(self, compression=None):
+        self.compression = compression or SIMULATION_PARAMS['sketch_compression']
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """Ajoute un tableau d'observations"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other):
+        """Fusionne un autre sketch dans celui-ci"""
+        if other.weights.size == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+
+        total = weights.sum()
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        group = np.floor(k)
+
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def _positions(self):
+        """
+        Rangs (base 0) et valeurs des centroïdes pour l'interpolation
+
+        Un centroïde de poids 1 est placé au rang de son observation : tant
+        que les données tiennent dans le sketch, les quantiles coïncident
+        avec np.percentile (interpolation linéaire).
+        """
+        centers = np.cumsum(self.weights) - self.weights / 2 - 0.5
+        ranks = np.r_[0.0, centers, self.count - 1]
+        values = np.r_[self.min, self.means, self.max]
+        return ranks, values
+
+    def quantile(self, q):
+        """Quantile(s) estimé(s), q dans [0, 1]"""
+        if self.weights.size == 0:
+            return np.full(np.shape(q), np.nan)
+        ranks, values = self._positions()
+        return np.interp(np.asarray(q) * (self.count - 1), ranks, values)
+
+    def cdf(self, x):
+        """Proportion estimée des observations inférieures à x"""
+        if self.weights.size == 0:
+            return np.full(np.shape(x), np.nan)
+        ranks, values = self._positions()
+        below = np.where(np.asarray(x) > self.max, self.count, np.interp(x, values, ranks + 0.5))
+        return np.where(np.asarray(x) <= self.min, 0.0, below) / self.count
+
+
+class StreamingPercentiles:
+    """
+    Percentiles et moyenne par année, calculés en flux
+
+    Un TDigest par colonne (année) et des sommes courantes pour la moyenne.
+    Remplace les matrices de trajectoires lorsque keep_paths=False.
+    """
+
+    def __init__(self, n_columns, compression=None):
+        self.digests = [TDigest(compression) for _ in range(n_columns)]
+        self.sums = np.zeros(n_columns)
+        self.count = 0
+
+    @classmethod
+    def from_block(cls, block, compression=None):
+        """Crée un sketch à partir d'un bloc de trajectoires (n, n_columns)"""
+        sketch = cls(block.shape[1], compression)
+        sketch.update(block)
+        return sketch
+
+    def update(self, block):
+        """Ajoute un bloc de trajectoires de forme (n, n_columns)"""
+        for column, digest in enumerate(self.digests):
+            digest.update(block[:, column])
+        self.sums += block.sum(axis=0, dtype=np.float64)
+        self.count += block.shape[0]
+
+    def merge(self, other):
+        """Fusionne le sketch d'un autre bloc"""
+        for digest, other_digest in zip(self.digests, other.digests):
+            digest.merge(other_digest)
+        self.sums += other.sums
+        self.count += other.count
+
+    def percentiles(self):
+        """
+        Returns:
+            dict: Même structure que les percentiles exacts ('p10' ... 'p90', 'mean')
+        """
+        levels = np.array(list(PERCENTILE_LEVELS.values())) / 100
+        values = np.array([digest.quantile(levels) for digest in self.digests])
+        result = {key: values[:, i] for i, key in enumerate(PERCENTILE_LEVELS)}
+        result['mean'] = self.sums / self.count
+        return result
+
+    def cdf(self, x, column=-1):
+        """Proportion estimée des trajectoires sous x pour une année (dernière par défaut)"""
+        return self.digests[column].cdf(x)
+
+    def to_arrays(self):
+        """Sérialise le sketch en tableaux NumPy (cache disque .npz)"""
+        return {
+            'means': np.concatenate([d.means for d in self.digests]),
+            'weights': np.concatenate([d.weights for d in self.digests]),
+            'sizes': np.array([d.means.size for d in self.digests]),
+            'bounds': np.array([[d.min, d.max] for d in self.digests]).reshape(-1, 2),
+            'sums': self.sums,
+            'count': np.array(self.count),
+            'compression': np.array(self.digests[0].compression if self.digests else 0),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Reconstruit un sketch sérialisé par to_arrays()"""
+        sizes = arrays['sizes']
+        sketch = cls(sizes.size, float(arrays['compression']) or None)
+        offsets = np.r_[0, np.cumsum(sizes)]
+        for i, digest in enumerate(sketch.digests):
+            digest.means = np.array(arrays['means'][offsets[i]:offsets[i + 1]])
+            digest.weights = np.array(arrays['weights'][offsets[i]:offsets[i + 1]])
+            digest.min, digest.max = (float(v) for v in arrays['bounds'][i])
+        sketch.sums = np.array(arrays['sums'])
+        sketch.count = int(arrays['count'])
+        return sketch
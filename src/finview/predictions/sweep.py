@@ -0,0 +1,138 @@
+"""
+Analyses de sensibilité : grille de scénarios en un seul jeu de tirages
+
+Toutes les combinaisons (horizon, inflation, frais, probabilité de crise)
+sont évaluées sur les mêmes tirages aléatoires (nombres aléatoires communs) :
+les écarts entre scénarios reflètent les paramètres, pas le bruit Monte Carlo.
+
+La grille ne coûte pas une simulation par scénario :
+- les horizons sont des préfixes des trajectoires de l'horizon maximal,
+- l'inflation on/off ne change que le déflateur appliqué aux mêmes valeurs,
+- seuls les couples (frais, probabilité de crise) refont le produit cumulé,
+  à partir des mêmes rendements de base.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .config import CRISIS_PARAMS
+from .monte_carlo import (
+    _collect_composition,
+    _composition_arrays,
+    _draw_random_inputs,
+    _base_returns,
+    _asset_growth,
+    _cumulative_inflation,
+    _remaining_debt_schedule,
+)
+from .correlation import CorrelationModel
+from .rng import spawn_chunk_seeds, make_generator, default_chunk_size
+from .streaming import PERCENTILE_LEVELS
+
+
+def _validate_grid(horizons, crisis_probabilities):
+    if not horizons or any(int(h) != h or h <= 0 for h in horizons):
+        raise ValueError(f"Les horizons doivent être des entiers positifs, reçus: {horizons}")
+    correction = CRISIS_PARAMS['mild_correction_probability']
+    for p in crisis_probabilities:
+        if not 0 <= p <= 1 - correction:
+            raise ValueError(
+                f"Probabilité de crise invalide: {p} (attendu entre 0 et {1 - correction:.2f}, "
+                f"la probabilité de correction étant de {correction})"
+            )
+
+
+def sweep_portfolio_scenarios(portfolio, horizons=(5, 10, 20, 30), inflation=(True, False),
+                              fees=(True, False), crisis_probabilities=(0.02, 0.05, 0.10, 0.15),
+                              num_simulations=1000, seed=None, chunk_size=None, correlated=False):
+    """
+    Évalue une grille de scénarios avec des nombres aléatoires communs
+
+    Chaque scénario est statistiquement équivalent à un appel de
+    simulate_portfolio_future avec les mêmes paramètres (mais pas identique
+    bit à bit : les tirages couvrent l'horizon maximal de la grille).
+
+    Args:
+        portfolio: Objet Portfolio à simuler
+        horizons: Horizons de projection en années
+        inflation: Valeurs de include_inflation à évaluer
+        fees: Valeurs de include_fees à évaluer
+        crisis_probabilities: Probabilités annuelles de crise (la probabilité
+            de correction reste CRISIS_PARAMS['mild_correction_probability'])
+        num_simulations: Trajectoires partagées par tous les scénarios
+        seed: Graine pour des résultats reproductibles
+        chunk_size: Trajectoires par bloc (mémoire de travail bornée)
+        correlated: Rendements corrélés entre actifs (voir correlation.py)
+
+    Returns:
+        pd.DataFrame: Une ligne par scénario : 'horizon', 'include_inflation',
+            'include_fees', 'crisis_probability', 'initial_value', les
+            percentiles de la valeur finale ('p10' ... 'p90'), 'mean' et
+            'probability_of_loss' (valeur finale sous la valeur initiale)
+    """
+    horizons = sorted(set(horizons))
+    inflation = list(dict.fromkeys(inflation))
+    fees = list(dict.fromkeys(fees))
+    crisis_probabilities = list(dict.fromkeys(crisis_probabilities))
+    _validate_grid(horizons, crisis_probabilities)
+
+    portfolio_composition = _collect_composition(portfolio)
+    assets = _composition_arrays(portfolio_composition)
+    total_debt = portfolio.get_total_credits_balance() if hasattr(portfolio, 'get_total_credits_balance') else 0
+    initial_value = assets['values'].sum() - total_debt
+    correlation = CorrelationModel.from_composition(portfolio_composition) if correlated else None
+
+    max_years = horizons[-1]
+    year_index = np.array(horizons) - 1
+    combos = list(itertools.product(fees, crisis_probabilities))
+
+    # Valeur des actifs aux horizons demandés, par couple (frais, crise)
+    growth = {combo: np.empty((num_simulations, len(horizons))) for combo in combos}
+    deflator = np.empty((num_simulations, len(horizons)))
+
+    if chunk_size is None:
+        chunk_size = default_chunk_size(num_simulations)
+    _, chunks = spawn_chunk_seeds(seed, num_simulations, chunk_size)
+    start = 0
+    for chunk_paths, chunk_seed in chunks:
+        rows = slice(start, start + chunk_paths)
+        # L'inflation est toujours tirée pour que tous les scénarios voient les mêmes aléas
+        draws = _draw_random_inputs(make_generator(chunk_seed), chunk_paths, max_years,
+                                    len(portfolio_composition), True, correlation)
+        base_returns = _base_returns(assets, draws)
+        for include_fees, crisis_probability in combos:
+            totals = _asset_growth(assets, base_returns, draws, include_fees, crisis_probability)
+            growth[include_fees, crisis_probability][rows] = totals[:, year_index]
+        deflator[rows] = _cumulative_inflation(draws)[:, year_index]
+        start += chunk_paths
+
+    final_debt = np.array([_remaining_debt_schedule(total_debt, h)[-1] for h in horizons])
+    levels = list(PERCENTILE_LEVELS.values())
+
+    records = []
+    for (include_fees, crisis_probability), include_inflation in itertools.product(combos, inflation):
+        final = growth[include_fees, crisis_probability] - final_debt
+        if include_inflation:
+            final = final / deflator
+        percentiles = np.percentile(final, levels, axis=0)
+        means = final.mean(axis=0)
+        loss = (final < initial_value).mean(axis=0)
+
+        for i, horizon in enumerate(horizons):
+            record = {
+                'horizon': horizon,
+                'include_inflation': include_inflation,
+                'include_fees': include_fees,
+                'crisis_probability': crisis_probability,
+                'initial_value': initial_value,
+            }
+            record.update({key: percentiles[j, i] for j, key in enumerate(PERCENTILE_LEVELS)})
+            record['mean'] = means[i]
+            record['probability_of_loss'] = loss[i]
+            records.append(record)
+
+    return (pd.DataFrame.from_records(records)
+            .sort_values(['horizon', 'include_inflation', 'include_fees', 'crisis_probability'],
+                         ascending=[True, False, False, True])
+            .reset_index(drop=True))
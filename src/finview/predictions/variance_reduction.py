@@ -0,0 +1,173 @@
+"""
+Techniques de réduction de variance pour les simulations Monte Carlo
+
+- 'antithetic' : chaque trajectoire est appariée à sa trajectoire miroir
+  (normales opposées, uniformes u → 1 - u)
+- 'sobol' : suites de Sobol brouillées (scipy.stats.qmc) pour l'événement de
+  marché, les rendements de base et l'inflation (quasi-Monte Carlo randomisé)
+- 'stratified' : tirage stratifié de l'événement de marché, pour que la
+  proportion de crises et de corrections de chaque année colle aux probabilités
+
+Le brouillage de Sobol et les flux aléatoires étant indépendants d'un bloc à
+l'autre, l'erreur standard des percentiles est estimée à partir de la
+dispersion des estimations par bloc (moyennes par lots).
+"""
+import warnings
+
+import numpy as np
+
+VARIANCE_REDUCTION_METHODS = ('antithetic', 'sobol', 'stratified')
+
+
+def normalize_methods(variance_reduction):
+    """
+    Normalise l'option variance_reduction en tuple de méthodes
+
+    Args:
+        variance_reduction: None, une méthode ou une liste de méthodes
+
+    Returns:
+        tuple: Méthodes retenues
+
+    Raises:
+        ValueError: Méthode inconnue ou combinaison incompatible
+    """
+    if not variance_reduction:
+        return ()
+    if isinstance(variance_reduction, str):
+        variance_reduction = (variance_reduction,)
+    methods = tuple(dict.fromkeys(variance_reduction))
+
+    unknown = [m for m in methods if m not in VARIANCE_REDUCTION_METHODS]
+    if unknown:
+        raise ValueError(
+            f"Méthode de réduction de variance inconnue: {', '.join(unknown)} "
+            f"(attendu: {', '.join(VARIANCE_REDUCTION_METHODS)})"
+        )
+    if 'antithetic' in methods and 'sobol' in methods:
+        raise ValueError("Les méthodes 'antithetic' et 'sobol' ne sont pas combinables")
+    return methods
+
+
+def stratified_uniforms(rng, num_paths, years):
+    """
+    Uniformes stratifiées par année : une par strate [i/n, (i+1)/n), permutée
+
+    Returns:
+        np.ndarray: Tableau (num_paths, years)
+    """
+    strata = rng.permuted(np.tile(np.arange(num_paths), (years, 1)), axis=1).T
+    return (strata + rng.random((num_paths, years))) / num_paths
+
+
+def _sobol_inputs(rng, num_paths, years, n_base, include_inflation, dtype=np.float64):
+    """Événement de marché, rendements de base et inflation issus d'une suite de Sobol"""
+    try:
+        from scipy.special import ndtri
+        from scipy.stats import qmc
+    except ImportError as e:
+        raise ImportError("La méthode 'sobol' nécessite scipy (pip install scipy)") from e
+
+    dims_per_year = 1 + n_base + (1 if include_inflation else 0)
+    dimension = years * dims_per_year
+    if dimension > qmc.Sobol.MAXDIM:
+        raise ValueError(
+            f"Trop de dimensions pour Sobol ({dimension} > {qmc.Sobol.MAXDIM}) : "
+            f"réduire l'horizon ou utiliser 'antithetic'"
+        )
+
+    with warnings.catch_warnings():
+        # L'équilibre des points de Sobol est optimal pour n = 2^m (voir sobol_chunk_size)
+        warnings.simplefilter('ignore', UserWarning)
+        points = qmc.Sobol(dimension, scramble=True, seed=rng).random(num_paths)
+
+    points = points.reshape(num_paths, years, dims_per_year)
+    normals = ndtri(np.clip(points[..., 1:], 1e-12, 1 - 1e-12)).astype(dtype, copy=False)
+    points = points.astype(dtype, copy=False)
+    return {
+        'market_event': points[..., 0],
+        'base': normals[..., :n_base],
+        'inflation': normals[..., n_base] if include_inflation else None,
+    }
+
+
+def draw_standard_inputs(rng, num_paths, years, n_base, n_assets, include_inflation, methods=(),
+                         dtype=np.float64):
+    """
+    Tire les aléas standards d'un bloc de trajectoires
+
+    Args:
+        rng: np.random.Generator du bloc
+        num_paths: Nombre de trajectoires
+        years: Nombre d'années
+        n_base: Normales par année pour les rendements de base
+        n_assets: Nombre d'actifs (chocs de crise)
+        include_inflation: Tirer l'inflation
+        methods: Méthodes de réduction de variance (voir normalize_methods)
+        dtype: np.float64 ou np.float32 (tirages directement en simple précision)
+
+    Returns:
+        dict: 'market_event' uniformes (n, years), 'base' (n, years, n_base),
+              'shock' (n, years, n_assets), 'inflation' (n, years) ou None
+    """
+    if 'antithetic' in methods:
+        half = (num_paths + 1) // 2
+        inner = tuple(m for m in methods if m != 'antithetic')
+        inputs = draw_standard_inputs(rng, half, years, n_base, n_assets, include_inflation, inner, dtype)
+        mirrored = {
+            'market_event': 1 - inputs['market_event'],
+            'base': -inputs['base'],
+            'shock': -inputs['shock'],
+            'inflation': -inputs['inflation'] if include_inflation else None,
+        }
+        return {
+            key: (np.concatenate([inputs[key], mirrored[key]])[:num_paths]
+                  if inputs[key] is not None else None)
+            for key in inputs
+        }
+
+    if 'sobol' in methods:
+        inputs = _sobol_inputs(rng, num_paths, years, n_base, include_inflation, dtype)
+    else:
+        inputs = {
+            'market_event': rng.random((num_paths, years), dtype=dtype),
+            'base': rng.standard_normal((num_paths, years, n_base), dtype=dtype),
+            'inflation': rng.standard_normal((num_paths, years), dtype=dtype) if include_inflation else None,
+        }
+    inputs['shock'] = rng.standard_normal((num_paths, years, n_assets), dtype=dtype)
+
+    if 'stratified' in methods:
+        inputs['market_event'] = stratified_uniforms(rng, num_paths, years).astype(dtype, copy=False)
+    return inputs
+
+
+def percentile_standard_errors(chunk_percentiles, chunk_sizes):
+    """
+    Erreur standard des percentiles par moyennes par lots
+
+    Chaque bloc ayant un flux aléatoire (ou un brouillage de Sobol)
+    indépendant, ses percentiles sont des estimations indépendantes ; leur
+    dispersion pondérée par la taille des blocs mesure la précision de
+    l'estimation globale, méthode de réduction de variance comprise.
+
+    Args:
+        chunk_percentiles: Liste de dicts de percentiles (un par bloc)
+        chunk_sizes: Nombre de trajectoires de chaque bloc
+
+    Returns:
+        dict: Erreur standard par clé ('p10' ... 'mean'), None si moins de 2 blocs
+    """
+    if len(chunk_percentiles) < 2:
+        return None
+
+    weights = np.asarray(chunk_sizes, dtype=float)
+    weights /= weights.sum()
+    k = len(chunk_percentiles)
+
+    errors = {}
+    for key in chunk_percentiles[0]:
+        estimates = np.array([p[key] for p in chunk_percentiles])
+        center = weights @ estimates
+        variance = (weights ** 2) @ (estimates - center) ** 2 * k / (k - 1)
+        errors[key] = np.sqrt(variance)
+    return errors
@@ -128,11 +128,12 @@ def save_portfolio(portfolio, filename: str = DEFAULT_FILEPATH) -> Tuple[bool, O
         return False, error_msg
 
 
-def load_portfolio(filename: str = DEFAULT_FILEPATH) -> Tuple[Optional[Portfolio], Optional[str]]:
+def load_portfolio(filename: str = DEFAULT_FILEPATH, compact: bool = False) -> Tuple[Optional[Portfolio], Optional[str]]:
     """Load portfolio from a JSON file.
     
     Args:
         filename: Path to the file to load
+        compact: Use the slotted position classes (see Portfolio.from_dict)
         
     Returns:
         Tuple of (portfolio, error_message)
@@ -163,7 +164,7 @@ def load_portfolio(filename: str = DEFAULT_FILEPATH) -> Tuple[Optional[Portfolio
             return None, error_msg
         
         # Convert to Portfolio
-        portfolio = Portfolio.from_dict(data)
+        portfolio = Portfolio.from_dict(data, compact=compact)
         logger.info(f"Portfolio loaded successfully from {filename}")
         return portfolio, None
         
@@ -180,7 +180,7 @@ def create_sidebar_actions(portfolio, save_portfolio_func, Portfolio, create_dem
     st.sidebar.metric("💰 Cash", f"{format_currency(portfolio.cash)}")
 
     if portfolio.investments:
-        total_inv = sum(inv.current_value * inv.quantity for inv in portfolio.investments.values())
+        total_inv = portfolio.get_total_investments_value()
         st.sidebar.metric("📈 Investments", f"{format_currency(total_inv)}")
 
     if portfolio.credits: